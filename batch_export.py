@@ -0,0 +1,191 @@
+"""
+Batch Exporter for Visual Novel Node Editor
+Command-line export of one or many projects without opening the editor window.
+
+Usage:
+    python batch_export.py story.json other.vnproj --format text pdf --output-dir exports --jobs 4
+    python batch_export.py story.json --format text --routes 50   # one file per playthrough
+"""
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import export_renderers
+from graph_model import GraphModel
+from log_config import configure_logging
+from project_store import ProjectStore, is_store_project
+from story_routes import RouteAnalyzer
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('text', 'json', 'csv', 'pdf')
+
+
+def load_graph(project_file):
+    """Load a project file (JSON, binary .vnproj or database .vndb) into a GraphModel"""
+    if is_store_project(project_file):
+        with ProjectStore(project_file) as store:
+            return store.load_graph()
+    return GraphModel.load(project_file)
+
+
+def export_path(project_file, export_format, output_dir=None, route=None):
+    """Output file for a project: story.json -> story.txt / story.sequence.json / story.route7.pdf ..."""
+    root = os.path.splitext(os.path.basename(project_file))[0]
+    if route is not None:
+        root += f'.route{route}'
+    if export_format == 'json':
+        # Keep the sequence export from overwriting a JSON project of the same name
+        root += '.sequence'
+    directory = output_dir or os.path.dirname(os.path.abspath(project_file))
+    return os.path.join(directory, root + export_renderers.EXPORT_EXTENSIONS[export_format])
+
+
+def _write_exports(sequence, project_file, export_formats, output_dir, route=None, pdf_jobs=1):
+    """Render one sequence (the whole story or a numbered route) in each format"""
+    title = os.path.splitext(os.path.basename(project_file))[0]
+    written = []
+    for export_format in export_formats:
+        out_file = export_path(project_file, export_format, output_dir, route)
+        with export_renderers.open_export(out_file, export_format) as out:
+            export_renderers.render(export_format, sequence, out, title, pdf_jobs)
+        written.append((export_format if route is None else f"{export_format} route {route}", out_file))
+    return written
+
+
+def export_project(project_file, export_formats, output_dir=None, route_limit=None, pdf_jobs=1):
+    """Export one project in each format; returns [(label, output file), ...].
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    With a route_limit each playthrough (up to the limit) is exported to its
+    own files instead of the whole story. A long PDF is laid out on up to
+    pdf_jobs processes (None: one per CPU).
+    """
+    graph = load_graph(project_file)
+    if not graph.start_nodes():
+        raise ValueError("No Start Node found. Please add a Start Node to begin the sequence.")
+
+    if route_limit is None:
+        return _write_exports(export_renderers.story_sequence(graph), project_file,
+                              export_formats, output_dir, pdf_jobs=pdf_jobs)
+
+    analyzer = RouteAnalyzer(graph)
+    for back_edge in analyzer.back_edges:
+        cycle = analyzer.cycle(back_edge)
+        logger.warning("%s: routes stop where this cycle closes: %s", project_file,
+                       " -> ".join(record.name for record in cycle + cycle[:1]))
+    logger.info("%s: %s routes, exporting up to %s", project_file, analyzer.route_count, route_limit)
+
+    written = []
+    for index, route in enumerate(analyzer.iter_routes(route_limit), 1):
+        written.extend(_write_exports(route, project_file, export_formats, output_dir, index, pdf_jobs))
+    return written
+
+
+def find_collisions(project_files, export_formats, output_dir=None):
+    """project file -> the other projects whose exports would go to the same files.
+
+    Output names only keep the project's base name, so story.json and
+    story.vnproj, or a/story.json and b/story.json with one output directory,
+    would overwrite each other. Route files share the same base name, so
+    checking the whole-story paths covers them too.
+    """
+    writers = {}
+    for project_file in project_files:
+        for export_format in export_formats:
+            out_file = os.path.normcase(os.path.abspath(export_path(project_file, export_format, output_dir)))
+            writers.setdefault(out_file, set()).add(project_file)
+    collisions = {}
+    for projects in writers.values():
+        if len(projects) > 1:
+            for project_file in projects:
+                collisions.setdefault(project_file, set()).update(projects - {project_file})
+    return collisions
+
+
+def run_batch(project_files, export_formats, output_dir=None, jobs=None, route_limit=None):
+    """Export every project, one project per worker process; returns the number of failures.
+
+    A single project is exported in this process, with its PDF laid out on
+    `jobs` processes. Projects that would write
+    the same output files as another project are not exported and count as
+    failures.
+    """
+    failures = 0
+    # The same file named twice (however it is spelled) is exported once
+    unique = {}
+    for project_file in project_files:
+        unique.setdefault(os.path.normcase(os.path.abspath(project_file)), project_file)
+    project_files = list(unique.values())
+    collisions = find_collisions(project_files, export_formats, output_dir)
+    for project_file in project_files:
+        if project_file in collisions:
+            failures += 1
+            others = ", ".join(sorted(collisions[project_file]))
+            print(f"{project_file}: export failed: its output files would overwrite those of {others}; "
+                  f"rename the project or export it to another directory", file=sys.stderr)
+    project_files = [project_file for project_file in project_files if project_file not in collisions]
+    if not project_files:
+        return failures
+
+    if jobs == 1 or len(project_files) == 1:
+        results = []
+        for project_file in project_files:
+            try:
+                written = export_project(project_file, export_formats, output_dir, route_limit, jobs)
+                results.append((project_file, written, None))
+            except Exception as e:
+                results.append((project_file, None, e))
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(export_project, project_file, export_formats, output_dir, route_limit): project_file
+                       for project_file in project_files}
+            for future in as_completed(futures):
+                try:
+                    results.append((futures[future], future.result(), None))
+                except Exception as e:
+                    results.append((futures[future], None, e))
+
+    for project_file, written, error in results:
+        if error is not None:
+            failures += 1
+            print(f"{project_file}: export failed: {error}", file=sys.stderr)
+            continue
+        for label, out_file in written:
+            print(f"{project_file}: {label} -> {out_file}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Visual Novel Node Editor projects without the GUI.")
+    parser.add_argument('projects', nargs='+', help="project files (.json, .vnproj or .vndb)")
+    parser.add_argument('-f', '--format', dest='formats', nargs='+', choices=EXPORT_FORMATS, default=['text'],
+                        help="export formats (default: text)")
+    parser.add_argument('-o', '--output-dir', help="directory for exported files (default: beside each project)")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('-r', '--routes', type=int, metavar='LIMIT',
+                        help="export each playthrough separately, at most LIMIT per project")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+
+    if 'pdf' in args.formats and not export_renderers.PDF_AVAILABLE:
+        parser.error("PDF export requires the 'reportlab' library. Install it with: pip install reportlab")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.routes is not None and args.routes < 1:
+        parser.error("--routes must be at least 1")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = run_batch(args.projects, args.formats, args.output_dir, args.jobs, args.routes)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
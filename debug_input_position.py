@@ -26,7 +26,7 @@ def main():
     # Create test branch node
     test_node = BranchNode(100, 100)
     scene.addItem(test_node)
-    window.node_items.append(test_node)
+    window.register_node(test_node)
     
     print(f"Initial node height: {test_node.rect().height()}")
     print(f"Initial input circle position: {test_node.input_circle.rect()}")
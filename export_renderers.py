@@ -0,0 +1,741 @@
+"""
+Export Renderers for Visual Novel Node Editor
+Screenplay text, JSON, CSV and PDF output written to file-like objects.
+Works on graph_model NodeRecords, so exports run without any Qt widgets.
+"""
+
+import copy
+import csv
+import functools
+import json
+import io
+import logging
+import multiprocessing
+import os
+import time
+import unicodedata
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+
+from story_traversal import iter_story, TOPOLOGICAL
+
+logger = logging.getLogger(__name__)
+
+# PDF generation using ReportLab only
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Flowable
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase import pdfmetrics
+    import pdf_fonts
+    PDF_AVAILABLE = True
+except ImportError as reportlab_error:
+    PDF_AVAILABLE = False
+    logger.warning("ReportLab not available: %s", reportlab_error)
+
+# Optional: merging the chunks of a parallel PDF export
+try:
+    from pypdf import PdfReader, PdfWriter
+    PDF_MERGE_AVAILABLE = True
+except ImportError:
+    PDF_MERGE_AVAILABLE = False
+
+# Below this many scenes one process lays the PDF out faster than a pool can start
+PARALLEL_PDF_MIN_SCENES = 1000
+
+# File extension written by each export format
+EXPORT_EXTENSIONS = {
+    'text': '.txt',
+    'json': '.json',
+    'csv': '.csv',
+    'pdf': '.pdf',
+}
+
+
+def open_export(file_name, export_format):
+    """Open an export file for writing the way its renderer expects.
+
+    PDF is binary. Text formats use the platform's line endings, except CSV,
+    whose writer emits its own.
+    """
+    if export_format == 'pdf':
+        return open(file_name, 'wb')
+    return open(file_name, 'w', encoding='utf-8', newline='' if export_format == 'csv' else None)
+
+
+class ExportCancelled(Exception):
+    """Raised from a progress callback to abandon an export"""
+
+
+class ExportNode:
+    """Detached copy of a NodeRecord's export fields, safe to hand to another thread or process"""
+    __slots__ = ('name', 'kind', 'data', 'input_connected_node', 'output_connected_node')
+
+    def __init__(self, name, kind, data, input_connected_node=None, output_connected_node=None):
+        self.name = name
+        self.kind = kind
+        self.data = data
+        self.input_connected_node = input_connected_node
+        self.output_connected_node = output_connected_node
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(record.name, record.kind, copy.deepcopy(record.data),
+                   record.input_connected_node, record.output_connected_node)
+
+
+def snapshot_sequence(sequence):
+    """ExportNode copies of a record sequence, so rendering never touches live graph state"""
+    return [ExportNode.from_record(record) for record in sequence]
+
+
+def story_sequence(graph):
+    """Nodes of a GraphModel in story order: every branch output in turn, each scene after all routes into it"""
+    return list(iter_story(graph, TOPOLOGICAL))
+
+
+def normalize_thai_text(text):
+    """ปรับปรุงข้อความภาษาไทยเพื่อแสดงผลวรรณยุกต์ได้ถูกต้อง"""
+    if not text:
+        return text
+
+    # ใช้ Unicode normalization แบบ NFC
+    return unicodedata.normalize('NFC', text)
+
+
+def _wrap_words(text, width):
+    """Greedy word wrap used by the text screenplay"""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        if len(current_line + word) < width:
+            current_line += word + " "
+        else:
+            lines.append(current_line.strip())
+            current_line = word + " "
+    if current_line:
+        lines.append(current_line.strip())
+    return lines
+
+
+def render_text(sequence, out):
+    """Write the sequence as a plain-text screenplay"""
+    # Screenplay title page (optional header)
+    out.write("VISUAL NOVEL SCREENPLAY\n\n")
+    out.write(f"Generated: {time.strftime('%B %d, %Y')}\n")
+    out.write("\n" + "="*60 + "\n\n")
+
+    # Track scene continuity
+    last_scene_location = ""
+    scene_number = 1
+
+    for i, node in enumerate(sequence, 1):
+        data = node.data
+        if data:
+            # Scene header information
+            scene_type = data.get('scene_type', 'INT.')
+            name = data.get('name', '')
+            time_desc = data.get('time_description', '')
+            in_scene = data.get('in_scene', '')
+            out_scene = data.get('out_scene', '')
+            background = data.get('background', '')
+
+            # Format scene heading (only if location/time changes)
+            current_scene_location = f"{scene_type} {name}".strip()
+            if current_scene_location != last_scene_location and current_scene_location != "INT." and current_scene_location != "EXT.":
+                out.write(f"{scene_number}. {scene_type} {name}")
+                if time_desc:
+                    out.write(f" - {time_desc}")
+                out.write("\n\n")
+                last_scene_location = current_scene_location
+                scene_number += 1
+
+            # Scene transition IN
+            if in_scene and in_scene != "None":
+                if in_scene == "FADE IN":
+                    out.write("FADE IN:\n\n")
+                elif in_scene != "Other":
+                    out.write(f"{in_scene}:\n\n")
+
+            # Background/Setting description (as action)
+            if background:
+                out.write(f"{background}\n\n")
+
+            # Write screenplay content in order
+            for item in data.get('items') or []:
+                if item['type'] == 'dialog':
+                    character = item.get('character', '').upper()
+                    parentheticals = item.get('parentheticals', '')
+                    text = item.get('text', '')
+
+                    if character:
+                        # Character name (centered, uppercase)
+                        out.write(f"                    {character}\n")
+
+                        # Parentheticals (if any)
+                        if parentheticals:
+                            out.write(f"                 ({parentheticals})\n")
+
+                        # Dialog text (indented, wrapped for readability)
+                        if text:
+                            for line in _wrap_words(text, 50):
+                                out.write(f"              {line}\n")
+
+                        out.write("\n")
+
+                elif item['type'] == 'action':
+                    action_text = item.get('text', '')
+                    if action_text:
+                        # Action lines (full width)
+                        for line in _wrap_words(action_text, 65):
+                            out.write(f"{line}\n")
+
+                        out.write("\n")
+
+            # Scene transition OUT (custom "Other" transitions are handled in the form)
+            if out_scene and out_scene != "None":
+                if out_scene in ["CUT TO", "DISSOLVE TO", "FADE OUT"]:
+                    out.write(f"                              {out_scene}:\n\n")
+
+        # Add extra spacing between major scenes
+        if i < len(sequence):
+            out.write("\n")
+
+    # End screenplay
+    out.write("\n                              FADE OUT.\n\n")
+    out.write("                                END\n")
+
+
+_NODE_TYPES = {'start': 'Start Node', 'branch': 'Branch Node'}
+
+
+def _node_type(node):
+    return _NODE_TYPES.get(node.kind, 'Regular Node')
+
+
+def render_json(sequence, out):
+    """Write the sequence as structured JSON"""
+    export_data = {
+        'metadata': {
+            'title': 'Visual Novel Node Sequence',
+            'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_nodes': len(sequence),
+            'version': '1.0'
+        },
+        'sequence': []
+    }
+
+    for i, node in enumerate(sequence, 1):
+        data = node.data
+        export_data['sequence'].append({
+            'sequence_number': i,
+            'name': node.name,
+            'type': _node_type(node),
+            'scene_type': data.get('scene_type', '') if data else '',
+            'scene_name': data.get('name', '') if data else '',
+            'time_description': data.get('time_description', '') if data else '',
+            'in_scene': data.get('in_scene', '') if data else '',
+            'out_scene': data.get('out_scene', '') if data else '',
+            'background': data.get('background', '') if data else '',
+            'content': data.get('items', []) if data else [],
+            'connections': {
+                'input_from': node.input_connected_node,
+                'output_to': node.output_connected_node
+            }
+        })
+
+    json.dump(export_data, out, ensure_ascii=False, indent=2)
+
+
+def render_csv(sequence, out):
+    """Write the sequence as CSV, one row per dialog/action item (open out with newline='')"""
+    writer = csv.writer(out)
+
+    # Header
+    writer.writerow([
+        'Sequence', 'Node Name', 'Type', 'Scene Type', 'Scene Name', 'Time Description',
+        'In Scene', 'Out Scene', 'Background', 'Item Order', 'Item Type', 'Character', 'Parentheticals', 'Text', 'Input From', 'Output To'
+    ])
+
+    for i, node in enumerate(sequence, 1):
+        data = node.data
+        base_row = [
+            i, node.name,
+            _node_type(node),
+            data.get('scene_type', '') if data else '',
+            data.get('name', '') if data else '',
+            data.get('time_description', '') if data else '',
+            data.get('in_scene', '') if data else '',
+            data.get('out_scene', '') if data else '',
+            data.get('background', '') if data else '',
+        ]
+
+        if data and data.get('items'):
+            # Write each item as a separate row
+            for item in data['items']:
+                writer.writerow(base_row + [
+                    item.get('order', ''),
+                    item.get('type', ''),
+                    item.get('character', '') if item.get('type') == 'dialog' else '',
+                    item.get('parentheticals', '') if item.get('type') == 'dialog' else '',
+                    item.get('text', ''),
+                    node.input_connected_node or '',
+                    node.output_connected_node or ''
+                ])
+        else:
+            # Empty content row
+            writer.writerow(base_row + ['', '', '', '', '',
+                                        node.input_connected_node or '',
+                                        node.output_connected_node or ''])
+
+
+@functools.lru_cache(maxsize=None)
+def register_pdf_fonts():
+    """Register the Thai fonts with ReportLab once per process and return the body font family"""
+    try:
+        fonts_registered = pdf_fonts.register_thai_fonts()
+        if fonts_registered > 0:
+            logger.info("Successfully registered %s Thai font variants", fonts_registered)
+        else:
+            logger.warning("No Thai fonts found, using system fallback")
+        return pdf_fonts.primary_thai_font()
+    except Exception as e:
+        logger.warning("Font registration failed: %s", e)
+        return 'Helvetica'
+
+
+@functools.lru_cache(maxsize=None)
+def build_pdf_styles(font_family):
+    """Screenplay ParagraphStyles for A4 paper, keyed by element.
+
+    Built once per font family and shared by every export in the process; treat as read-only.
+    """
+    styles = getSampleStyleSheet()
+
+    return {
+        # Title page style
+        'title': ParagraphStyle(
+            'ScreenplayTitle',
+            parent=styles['Title'],
+            fontName='THSarabunNew-Bold',
+            fontSize=18,
+            textColor='black',
+            alignment=1,  # Center
+            spaceAfter=18,
+            leading=22,
+            bold=True
+        ),
+        'written_date': ParagraphStyle(
+            'WrittenDate',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            leading=14,
+            alignment=2,  # Right
+            spaceAfter=0
+        ),
+        # Scene heading style (SLUG LINE)
+        'scene_heading': ParagraphStyle(
+            'SceneHeading',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=0,  # Left
+            spaceBefore=12,
+            spaceAfter=0,
+            leading=14,
+            fontWeight='bold'
+        ),
+        # Character name style (centered above dialog)
+        'character': ParagraphStyle(
+            'Character',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=0,  # Left aligned but with specific indentation
+            leftIndent=2.2*inch,  # Standard character name position
+            spaceBefore=12,
+            spaceAfter=0,
+            leading=14
+        ),
+        # Parentheticals style
+        'parenthetical': ParagraphStyle(
+            'Parenthetical',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=11,
+            textColor='black',
+            alignment=0,
+            leftIndent=1.8*inch,
+            rightIndent=2*inch,
+            spaceBefore=0,
+            spaceAfter=0,
+            leading=13
+        ),
+        # Dialog style (indented from both sides)
+        'dialog': ParagraphStyle(
+            'Dialog',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=0,  # Left
+            leftIndent=1*inch,    # Dialog indentation
+            rightIndent=1.5*inch,  # Right margin for dialog
+            spaceBefore=0,
+            spaceAfter=0,
+            leading=16  # Line spacing for Thai text
+        ),
+        # Action/Description style (full width)
+        'action': ParagraphStyle(
+            'Action',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=0,  # Left
+            leftIndent=0,
+            rightIndent=0,
+            spaceBefore=12,
+            spaceAfter=0,
+            leading=15
+        ),
+        # Transition styles (left aligned for IN transitions, right aligned for OUT transitions)
+        'transition_in': ParagraphStyle(
+            'TransitionIn',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=0,  # Left aligned
+            spaceAfter=12,
+            leading=14
+        ),
+        'transition_out': ParagraphStyle(
+            'TransitionOut',
+            parent=styles['Normal'],
+            fontName=font_family,
+            fontSize=12,
+            textColor='black',
+            alignment=2,  # Right aligned
+            spaceBefore=12,
+            spaceAfter=6,
+            leading=14
+        ),
+    }
+
+
+def scene_flowables(node, sequence_number, styles):
+    """Flowables for one scene: IN transition, slug line, dialog/action items, OUT transition"""
+    flowables = []
+    data = node.data
+
+    # Handle IN scene transitions first (before scene heading)
+    if data:
+        in_scene = data.get('in_scene', '')
+        if in_scene and in_scene != "None" and in_scene != "Other":
+            if in_scene == "FADE IN":
+                flowables.append(Paragraph("FADE IN:", styles['transition_in']))
+            elif in_scene in ["CUT IN:", "DISSOLVE IN:", "FADE FROM BLACK:"]:
+                flowables.append(Paragraph(in_scene, styles['transition_in']))
+            else:
+                # Custom transition
+                flowables.append(Paragraph(f"{in_scene.upper()}:", styles['transition_in']))
+
+    # Scene heading (SLUG LINE) - always uppercase
+    if data:
+        scene_type = data.get('scene_type', 'INT.')
+        scene_name = data.get('name', node.name)
+        time_desc = data.get('time_description', '')
+
+        scene_heading = f"({sequence_number}) {scene_type.upper()} {scene_name.upper()}"
+        if time_desc:
+            scene_heading += f" - {time_desc.upper()}"
+        flowables.append(Paragraph(scene_heading, styles['scene_heading']))
+        # Background/setting description is excluded from the screenplay PDF
+    else:
+        # Fallback scene heading
+        flowables.append(Paragraph(f"SCENE {sequence_number}: {node.name.upper()}", styles['scene_heading']))
+
+    # Process scene content
+    if data and 'items' in data:
+        for item in data['items']:
+            item_type = item.get('type', '')
+            text = item.get('text', '')
+
+            if item_type == 'dialog':
+                character = item.get('character', '')
+                parentheticals = item.get('parentheticals', '')
+
+                # Character name (uppercase, specific indentation)
+                if character:
+                    flowables.append(Paragraph(normalize_thai_text(character.upper()), styles['character']))
+
+                # Parentheticals (if any)
+                if parentheticals:
+                    flowables.append(Paragraph(f"({normalize_thai_text(parentheticals)})", styles['parenthetical']))
+
+                # Dialog text
+                if text:
+                    flowables.append(Paragraph(normalize_thai_text(text), styles['dialog']))
+
+            elif item_type == 'action':
+                if text:
+                    flowables.append(Paragraph(normalize_thai_text(text), styles['action']))
+
+    # OUT transitions at end of scene
+    if data:
+        out_scene = data.get('out_scene', '')
+        if out_scene and out_scene != "None" and out_scene != "Other":
+            if out_scene in ["CUT TO:", "DISSOLVE TO:", "FADE OUT:", "FADE TO BLACK:"]:
+                flowables.append(Paragraph(out_scene, styles['transition_out']))
+            else:
+                # Custom OUT transition
+                flowables.append(Paragraph(f"{out_scene.upper()}:", styles['transition_out']))
+
+    return flowables
+
+
+if PDF_AVAILABLE:
+    class _SceneEnd(Flowable):
+        """Zero-size marker placed after each scene so layout progress can be reported"""
+
+        def __init__(self, scene_number):
+            super().__init__()
+            self.scene_number = scene_number
+
+        def wrap(self, available_width, available_height):
+            return 0, 0
+
+        def draw(self):
+            pass
+
+
+def render_pdf(sequence, out, title, progress=None, first_number=1, title_page=True, the_end=True,
+               font_chars=None):
+    """Write the sequence as an A4 screenplay PDF to a path or binary file object.
+
+    progress(scenes_done, total) is called as each scene is laid out; it may
+    raise ExportCancelled to stop. first_number, title_page and the_end let a
+    chunk of a longer screenplay be rendered on its own, and font_chars fixes
+    the embedded font subsets (see render_pdf_parallel). Returns the body font
+    family that was used.
+    """
+    font_family = register_pdf_fonts()
+    styles = build_pdf_styles(font_family)
+
+    # Create PDF document with screenplay-specific margins for A4
+    doc = SimpleDocTemplate(
+        out,
+        pagesize=A4,
+        topMargin=1*inch,
+        bottomMargin=1*inch,
+        leftMargin=1.5*inch,   # Standard screenplay left margin
+        rightMargin=1*inch
+    )
+
+    story = []
+    if title_page:
+        story.extend([
+            Paragraph(title.upper(), styles['title']),
+            Paragraph(f"Writed: {time.strftime('%B %d, %Y')}", styles['written_date']),
+            Spacer(1, 24),
+        ])
+
+    for i, node in enumerate(sequence):
+        story.extend(scene_flowables(node, first_number + i, styles))
+        if progress:
+            story.append(_SceneEnd(i + 1))
+
+        # Add spacing between scenes (except for last scene)
+        if i < len(sequence) - 1:
+            story.append(Spacer(1, 24))
+
+    # Final screenplay elements
+    if the_end:
+        story.append(Spacer(1, 24))
+        story.append(Paragraph("THE END", styles['title']))
+
+    if progress:
+        total = len(sequence)
+
+        def after_flowable(flowable):
+            if isinstance(flowable, _SceneEnd):
+                progress(flowable.scene_number, total)
+        doc.afterFlowable = after_flowable
+
+    if font_chars:
+        def before_document():
+            # Assign these characters their subset codes before any text is drawn
+            for font_name in pdf_fonts.registered_fonts:
+                pdfmetrics.getFont(font_name).splitString(font_chars, doc.canv._doc)
+        doc.beforeDocument = before_document
+
+    doc.build(story)
+    return font_family
+
+
+def _scene_weight(node):
+    """Rough layout cost of a scene: its heading plus one per dialog/action item"""
+    return 1 + len((node.data or {}).get('items') or [])
+
+
+def split_scenes(sequence, chunks):
+    """Split a sequence at scene boundaries into up to `chunks` runs of similar layout cost"""
+    total = sum(_scene_weight(node) for node in sequence)
+    target = total / max(chunks, 1)
+    runs, current, weight = [], [], 0
+    for node in sequence:
+        current.append(node)
+        weight += _scene_weight(node)
+        if weight >= target * (len(runs) + 1) and len(runs) < chunks - 1:
+            runs.append(current)
+            current = []
+    if current:
+        runs.append(current)
+    return runs
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def pdf_font_chars(sequence, title):
+    """Every character the screenplay can draw, in a fixed order.
+
+    Chunks that assign these to their font subsets up front embed identical
+    subsets, which the merge then stores once.
+    """
+    text = '\n'.join(_strings([title] + [[node.name, node.data] for node in sequence]))
+    chars = set(map(chr, range(32, 127)))
+    for variant in (text, text.upper()):
+        chars.update(variant)
+        chars.update(normalize_thai_text(variant))
+    return ''.join(sorted(chars))
+
+
+# Set in each pool worker by _init_pdf_worker
+_worker_scenes_done = None
+_worker_cancel = None
+
+
+def _init_pdf_worker(scenes_done, cancel):
+    """Pool initializer: register the fonts once per worker process and keep the shared state"""
+    global _worker_scenes_done, _worker_cancel
+    _worker_scenes_done = scenes_done
+    _worker_cancel = cancel
+    register_pdf_fonts()
+
+
+def _count_scene(done, total):
+    if _worker_cancel.is_set():
+        raise ExportCancelled()
+    with _worker_scenes_done.get_lock():
+        _worker_scenes_done.value += 1
+
+
+def _render_pdf_chunk(sequence, title, first_number, title_page, the_end, font_chars):
+    """Pool task: one chunk of the screenplay as PDF bytes"""
+    out = io.BytesIO()
+    render_pdf(sequence, out, title, _count_scene, first_number, title_page, the_end, font_chars)
+    return out.getvalue()
+
+
+def render_pdf_parallel(sequence, out, title, jobs=None, progress=None):
+    """Lay out the screenplay in chunks on several processes and concatenate the pages.
+
+    The sequence is split at scene boundaries into one chunk per process;
+    scene numbers run on across chunks, each chunk after the first starts on
+    a new page, and the font subsets every chunk embeds are stored once in
+    the merged file. progress(scenes_done, total) is called as scenes are laid
+    out in any chunk and may raise ExportCancelled, which stops every chunk
+    at its next scene. Screenplays under PARALLEL_PDF_MIN_SCENES, a single
+    job or a missing pypdf use render_pdf() in this process instead.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if not PDF_MERGE_AVAILABLE or jobs < 2 or len(sequence) < PARALLEL_PDF_MIN_SCENES:
+        return render_pdf(sequence, out, title, progress=progress)
+
+    font_family = register_pdf_fonts()
+    sequence = [node if isinstance(node, ExportNode) else ExportNode.from_record(node) for node in sequence]
+    runs = split_scenes(sequence, jobs)
+    font_chars = pdf_font_chars(sequence, title)
+    total = len(sequence)
+
+    # Spawn rather than fork: the caller may be a GUI process with running threads
+    context = multiprocessing.get_context('spawn')
+    scenes_done = context.Value('i', 0)
+    cancel = context.Event()
+    pool = ProcessPoolExecutor(max_workers=len(runs), mp_context=context,
+                               initializer=_init_pdf_worker, initargs=(scenes_done, cancel))
+    try:
+        futures = []
+        first_number = 1
+        for index, run in enumerate(runs):
+            futures.append(pool.submit(_render_pdf_chunk, run, title, first_number,
+                                       index == 0, index == len(runs) - 1, font_chars))
+            first_number += len(run)
+
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+            if progress:
+                progress(min(scenes_done.value, total), total)
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+    except BaseException:
+        cancel.set()
+        raise
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    writer = PdfWriter()
+    for future in futures:
+        writer.append(PdfReader(io.BytesIO(future.result())))
+    # The chunks' font subsets are byte-identical; keep one copy of each
+    writer.compress_identical_objects()
+    writer.write(out)
+    return font_family
+
+
+def route_file(directory, index, export_format):
+    """File for one exported route: route_001.txt, route_002.pdf ..."""
+    return os.path.join(directory, f"route_{index:03d}{EXPORT_EXTENSIONS[export_format]}")
+
+
+def write_routes(routes, directory, export_format):
+    """Render each route (e.g. from RouteAnalyzer.iter_routes) to its own file; returns the files written"""
+    written = []
+    for index, route in enumerate(routes, 1):
+        file_name = route_file(directory, index, export_format)
+        with open_export(file_name, export_format) as out:
+            render(export_format, route, out, f"Route {index}")
+        written.append(file_name)
+    return written
+
+
+def render(export_format, sequence, out, title='', jobs=1):
+    """Dispatch to the renderer for 'text', 'json', 'csv' or 'pdf' (laid out on `jobs` processes)"""
+    if export_format == 'text':
+        return render_text(sequence, out)
+    if export_format == 'json':
+        return render_json(sequence, out)
+    if export_format == 'csv':
+        return render_csv(sequence, out)
+    if export_format == 'pdf':
+        if not PDF_AVAILABLE:
+            raise RuntimeError("PDF export requires the 'reportlab' library.")
+        if jobs != 1:
+            return render_pdf_parallel(sequence, out, title, jobs)
+        return render_pdf(sequence, out, title)
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -0,0 +1,83 @@
+"""
+Export Worker for Visual Novel Node Editor
+QRunnable that lays out a screenplay PDF on a thread pool (long scripts in
+parallel processes), reporting progress to the GUI thread
+"""
+
+import io
+import logging
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+import export_renderers
+from project_writer import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExportSignals(QObject):
+    """Signals of a PdfExportTask; QRunnable itself cannot emit"""
+    progress = Signal(int, int)          # scenes laid out, total scenes
+    finished = Signal(str, int, str)     # (last) file name, bytes written, font family
+    failed = Signal(str)                 # error message
+    cancelled = Signal()
+
+
+class PdfExportTask(QRunnable):
+    """Render sequence snapshots to PDF files off the GUI thread.
+
+    Each sequence must be detached from the live graph (see
+    export_renderers.snapshot_sequence). Every PDF is built in memory and
+    written atomically, so a cancelled or failed export leaves no partial
+    file; files finished before a cancel are kept.
+    """
+
+    def __init__(self, sequence, file_name, title):
+        super().__init__()
+        self.documents = [(sequence, file_name, title)]  # (sequence, file name, title) to render in turn
+        self.signals = PdfExportSignals()
+        self._cancel = threading.Event()
+
+    @classmethod
+    def for_documents(cls, documents):
+        """Task writing several PDFs, e.g. one per route; progress counts the scenes of all of them"""
+        task = cls(*documents[0])
+        task.documents = list(documents)
+        return task
+
+    @property
+    def scene_count(self):
+        return sum(len(sequence) for sequence, _, _ in self.documents)
+
+    def cancel(self):
+        """Ask the worker to stop at the next scene; safe to call from any thread"""
+        self._cancel.set()
+
+    def _progress(self, done, total):
+        if self._cancel.is_set():
+            raise export_renderers.ExportCancelled()
+        self.signals.progress.emit(self._scenes_before + done, self.scene_count)
+
+    def run(self):
+        file_size = 0
+        font_family = None
+        self._scenes_before = 0
+        try:
+            for sequence, file_name, title in self.documents:
+                out = io.BytesIO()
+                font_family = export_renderers.render_pdf_parallel(sequence, out, title,
+                                                                   progress=self._progress)
+                if self._cancel.is_set():
+                    raise export_renderers.ExportCancelled()
+                write_atomic(file_name, out.getvalue())
+                file_size += len(out.getvalue())
+                self._scenes_before += len(sequence)
+        except export_renderers.ExportCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            logger.exception("PDF export to %s failed", file_name)
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(file_name, file_size, font_family)
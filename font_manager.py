@@ -4,17 +4,21 @@ Handles Thai font registration and management
 """
 
 import os
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
+import logging
 from PySide6.QtCore import QStandardPaths
 from PySide6.QtGui import QFontDatabase
 
+import pdf_fonts
+
+logger = logging.getLogger(__name__)
+
 
 class FontManager:
     """Manages font registration for the application"""
     
     def __init__(self):
-        self.registered_fonts = {}
+        # Shared with pdf_fonts, which does the ReportLab registration without Qt
+        self.registered_fonts = pdf_fonts.registered_fonts
         self.font_paths = []
         self._setup_font_paths()
     
@@ -38,43 +42,19 @@ class FontManager:
                 self.font_paths.append(path_list)
     
     def register_thai_fonts(self):
-        """Register Thai fonts for PDF generation"""
-        fonts_registered = 0
-        
-        # THSarabunNew fonts from font folder
-        thsarabun_fonts = {
-            'THSarabunNew': 'THSarabunNew.ttf',
-            'THSarabunNew-Bold': 'THSarabunNew Bold.ttf',
-            'THSarabunNew-Italic': 'THSarabunNew Italic.ttf',
-            'THSarabunNew-BoldItalic': 'THSarabunNew BoldItalic.ttf'
-        }
-        
-        for font_name, font_file in thsarabun_fonts.items():
-            font_path = self._find_font_file(font_file)
-            if font_path:
-                try:
-                    pdfmetrics.registerFont(TTFont(font_name, font_path))
-                    self.registered_fonts[font_name] = font_path
-                    fonts_registered += 1
-                    print(f"Registered font: {font_name} from {font_path}")
-                except Exception as e:
-                    print(f"Failed to register {font_name}: {e}")
-        
-        return fonts_registered
+        """Register Thai fonts for PDF generation; returns the number of variants available.
+
+        The TTF files are only parsed on the first call, later calls reuse the registration.
+        """
+        return pdf_fonts.register_thai_fonts(self.font_paths)
     
     def _find_font_file(self, font_filename):
         """Find font file in search paths"""
-        for font_path in self.font_paths:
-            full_path = os.path.join(font_path, font_filename)
-            if os.path.exists(full_path):
-                return full_path
-        return None
+        return pdf_fonts.find_font_file(font_filename, self.font_paths)
     
     def get_primary_thai_font(self):
         """Get the primary Thai font family name"""
-        if 'THSarabunNew' in self.registered_fonts:
-            return 'THSarabunNew'
-        return 'Helvetica'  # Fallback
+        return pdf_fonts.primary_thai_font()
     
     def register_qt_fonts(self):
         """Register fonts with Qt for GUI display"""
@@ -91,7 +71,7 @@ class FontManager:
                     if font_id != -1:
                         families = font_db.applicationFontFamilies(font_id)
                         fonts_added += 1
-                        print(f"Added Qt font: {', '.join(families)} from {font_file}")
+                        logger.info("Added Qt font: %s from %s", ', '.join(families), font_file)
         
         return fonts_added
     
@@ -0,0 +1,60 @@
+"""
+Form Cache for Visual Novel Node Editor
+Bounded LRU cache of node form_data paged in from a binary project file, so huge
+projects keep only node headings and a few recently used forms in memory
+"""
+
+from collections import OrderedDict
+
+from project_binary import ProjectBinaryReader
+
+# Forms kept decoded at once; exports walk every node but only hold this many
+FORM_CACHE_SIZE = 256
+
+
+class BinaryFormSource:
+    """Reads node form_data from a .vnproj file by position, behind an LRU cache.
+
+    NodeRecords bound with record.bind_form(source, position) call get() when
+    their data is needed. Used from the GUI thread only.
+    """
+
+    def __init__(self, file_name, capacity=FORM_CACHE_SIZE):
+        self.file_name = file_name
+        self.capacity = capacity
+        self._file = open(file_name, 'rb')
+        self._reader = ProjectBinaryReader(self._file)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, position):
+        """Return the form_data of the node at this position, reading it if not cached"""
+        data = self._cache.get(position)
+        if data is not None:
+            self._cache.move_to_end(position)
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        data = self._reader.form_data_at(position)
+        self._cache[position] = data
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return data
+
+    def clear(self):
+        """Drop every cached form"""
+        self._cache.clear()
+
+    def close(self):
+        self._cache.clear()
+        self._file.close()
+
+    def reopen(self):
+        """Open the file again after close(), e.g. when replacing it failed"""
+        self._file = open(self.file_name, 'rb')
+        self._reader = ProjectBinaryReader(self._file)
+
+    def __len__(self):
+        return len(self._cache)
@@ -0,0 +1,313 @@
+"""
+Graph Model for Visual Novel Node Editor
+Pure-Python story graph (nodes, ports and edges) that works without PySide6.
+The Qt items in graphics_items.py are views bound to these records.
+"""
+
+import json
+import time
+
+from node_registry import NodeRegistry
+import project_binary
+import project_writer
+
+# Version of the project schema written to JSON, .vnproj and .vndb files
+# 1.1: node ids are integers, no longer the node names
+# 1.2: branch nodes keep their kind and output count, edges their output port
+PROJECT_VERSION = '1.2'
+
+
+class PortRecord:
+    """Input or output connection point of a node"""
+    __slots__ = ('node', 'direction', 'index', 'edges')
+
+    def __init__(self, node, direction, index=0):
+        self.node = node            # Owning NodeRecord
+        self.direction = direction  # 'input' or 'output'
+        self.index = index          # Position among the node's outputs
+        self.edges = []             # EdgeRecords attached to this port
+
+
+class EdgeRecord:
+    """Directed connection from an output port to an input port"""
+    __slots__ = ('source', 'target')
+
+    def __init__(self, source, target):
+        self.source = source  # Output PortRecord
+        self.target = target  # Input PortRecord
+
+    @classmethod
+    def link(cls, port_a, port_b):
+        """Connect two ports (in either order) and return the new edge"""
+        if port_a.direction == 'input':
+            port_a, port_b = port_b, port_a
+        edge = cls(port_a, port_b)
+        port_a.edges.append(edge)
+        port_b.edges.append(edge)
+        return edge
+
+    def unlink(self):
+        """Detach this edge from both of its ports"""
+        for port in (self.source, self.target):
+            if self in port.edges:
+                port.edges.remove(self)
+
+    @property
+    def source_node(self):
+        return self.source.node
+
+    @property
+    def target_node(self):
+        return self.target.node
+
+    def other_node(self, port):
+        """Node at the opposite end of this edge from the given port"""
+        return self.target.node if port is self.source else self.source.node
+
+
+class NodeRecord:
+    """Story data of one node: heading, form data and port adjacency"""
+    __slots__ = ('_node_id', 'name', 'kind', 'x', 'y', '_data', 'form_source', 'form_key',
+                 'input_port', 'output_ports', 'view')
+
+    def __init__(self, kind, name, x=0.0, y=0.0, data=None, outputs=1):
+        self._node_id = None  # Assigned once by the GraphModel's NodeRegistry
+        self.name = name
+        self.kind = kind     # 'start', 'normal' or 'branch'
+        self.x = x
+        self.y = y
+        self._data = data if data is not None else {}  # Form data (items, dialogs, actions)
+        self.form_source = None  # Pages form data in on demand (see bind_form)
+        self.form_key = None
+        self.input_port = None if kind == 'start' else PortRecord(self, 'input')
+        self.output_ports = []
+        self.set_output_count(outputs if kind == 'branch' else 1)
+        self.view = None     # Graphics item showing this node in the editor, if any
+
+    @property
+    def node_id(self):
+        """Stable id keying this node in edges, project files and lookups; never changes once set"""
+        return self._node_id
+
+    @node_id.setter
+    def node_id(self, value):
+        if self._node_id is not None and value != self._node_id:
+            raise AttributeError(f"node id {self._node_id} cannot be changed")
+        self._node_id = value
+
+    @property
+    def data(self):
+        """Form data; paged in through the form source when the node is lazily loaded.
+
+        Paged-in dicts live in the source's LRU cache and may be dropped at any
+        time, so edits must assign a new dict rather than mutate this one.
+        """
+        if self._data is None:
+            return self.form_source.get(self.form_key)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        # Edited data stays in memory until the project is saved again
+        self._data = value
+        self.form_source = None
+        self.form_key = None
+
+    def bind_form(self, source, key):
+        """Drop the in-memory form data and read it from source.get(key) when needed"""
+        self._data = None
+        self.form_source = source
+        self.form_key = key
+
+    def set_output_count(self, count):
+        """Grow or shrink the output ports (edges on dropped ports must be unlinked first)"""
+        count = max(1, count)
+        del self.output_ports[count:]
+        while len(self.output_ports) < count:
+            self.output_ports.append(PortRecord(self, 'output', len(self.output_ports)))
+
+    def ports(self):
+        """All ports of this node, input first"""
+        if self.input_port is not None:
+            return [self.input_port] + self.output_ports
+        return list(self.output_ports)
+
+    def edges(self):
+        """All edges touching this node"""
+        return [edge for port in self.ports() for edge in port.edges]
+
+    # Connection tracking is read straight from the port adjacency lists, which
+    # EdgeRecord.link/unlink keep current, so it never needs a rescan.
+
+    @property
+    def input_connected_node(self):
+        """Name of the node connected to the input, or None"""
+        if self.input_port is not None and self.input_port.edges:
+            return self.input_port.edges[0].other_node(self.input_port).name
+        return None
+
+    @property
+    def output_connected_node(self):
+        """Name of the first node connected to an output, or None"""
+        for port in self.output_ports:
+            if port.edges:
+                return port.edges[0].other_node(port).name
+        return None
+
+    @property
+    def output_connected_nodes(self):
+        """Names of all nodes connected to the outputs, in port order"""
+        names = []
+        for port in self.output_ports:
+            for edge in port.edges:
+                name = edge.other_node(port).name
+                if name not in names:
+                    names.append(name)
+        return names
+
+
+class GraphModel:
+    """Headless story graph: a registry of NodeRecords and the edges between their ports"""
+
+    def __init__(self):
+        self.nodes = NodeRegistry()
+
+    def add_node(self, record, node_id=None):
+        """Add a node record and return it; node_id is the saved id to keep if it is free"""
+        self.nodes.add(record, node_id)
+        return record
+
+    def remove_node(self, record):
+        """Remove a node record together with all of its edges"""
+        for edge in record.edges():
+            edge.unlink()
+        self.nodes.remove(record)
+
+    def rename_node(self, record, new_name):
+        """Rename a node record and keep the name index in sync"""
+        old_name = record.name
+        record.name = new_name
+        self.nodes.rename(record, old_name)
+
+    def connect(self, port_a, port_b):
+        """Create an edge between two ports"""
+        return EdgeRecord.link(port_a, port_b)
+
+    def disconnect(self, edge):
+        """Remove an edge"""
+        edge.unlink()
+
+    def clear(self):
+        """Remove all nodes and edges"""
+        self.nodes.clear()
+
+    def edges(self):
+        """All edges in the graph, each reported once from its source port"""
+        return [edge for record in self.nodes for port in record.output_ports for edge in port.edges]
+
+    def start_nodes(self):
+        """All start node records"""
+        return [record for record in self.nodes if record.kind == 'start']
+
+    def to_dict(self, paged_forms=False):
+        """Serialize the graph into the project JSON schema.
+
+        With paged_forms, nodes whose form data is still in their form source
+        get 'form_index' (the position to read it from) instead of
+        'form_data', so the snapshot never pages forms in; the writer copies
+        them from the source file (see project_writer.write_project_temp).
+        """
+        data = {
+            'version': PROJECT_VERSION,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'nodes': [],
+            'edges': []
+        }
+
+        for record in self.nodes:
+            node_data = {
+                'id': record.node_id,
+                'name': record.name,
+                'x': record.x,
+                'y': record.y,
+                'type': record.kind,
+                'input_connected_node': record.input_connected_node,
+                'output_connected_node': record.output_connected_node,
+            }
+            if paged_forms and record.form_source is not None:
+                node_data['form_index'] = record.form_key
+            else:
+                node_data['form_data'] = record.data
+            if record.kind == 'branch':
+                node_data['outputs'] = len(record.output_ports)
+            data['nodes'].append(node_data)
+
+        for edge_id, edge in enumerate(self.edges(), 1):
+            data['edges'].append({
+                'id': f"edge_{edge_id}",
+                'start_node': edge.source_node.node_id,
+                'end_node': edge.target_node.node_id,
+                'start_point': 'output',  # Always from output to input
+                'end_point': 'input',
+                'start_port': edge.source.index
+            })
+
+        return data
+
+    @staticmethod
+    def record_from_dict(node_data):
+        """Build a NodeRecord from one entry of the project JSON 'nodes' list"""
+        kind = node_data.get('type', 'normal')
+        if kind not in ('start', 'branch'):
+            kind = 'normal'
+        return NodeRecord(kind, node_data['name'], node_data['x'], node_data['y'],
+                          node_data.get('form_data', {}), node_data.get('outputs', 1))
+
+    def connect_dict(self, records, edge_data):
+        """Connect one entry of the project JSON 'edges' list.
+
+        records maps saved node ids (names in 1.0 projects) to NodeRecords. Returns the new EdgeRecord,
+        or None when either end or the output port is unknown. Projects before 1.2 have no
+        'start_port' and connect from the first output.
+        """
+        start = records.get(edge_data['start_node'])
+        end = records.get(edge_data['end_node'])
+        if not (start and end):
+            return None
+        port_index = edge_data.get('start_port', 0)
+        if not 0 <= port_index < len(start.output_ports):
+            return None
+        target_port = end.input_port if end.input_port is not None else end.output_ports[0]
+        return self.connect(start.output_ports[port_index], target_port)
+
+    def load_dict(self, data):
+        """Replace the graph with the contents of a project JSON dict"""
+        if 'nodes' not in data:
+            raise ValueError("Invalid file format: No 'nodes' data found.")
+
+        self.clear()
+        records = {}
+        for node_data in data['nodes']:
+            records[node_data['id']] = self.add_node(self.record_from_dict(node_data), node_data['id'])
+
+        for edge_data in data.get('edges', []):
+            self.connect_dict(records, edge_data)
+
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a new graph from a project JSON dict"""
+        return cls().load_dict(data)
+
+    @classmethod
+    def load(cls, file_name):
+        """Build a new graph from a project JSON or binary (.vnproj) file"""
+        if project_binary.is_binary_project(file_name):
+            return cls.from_dict(project_binary.load_project(file_name))
+        with open(file_name, 'r', encoding='utf-8') as json_file:
+            return cls.from_dict(json.load(json_file))
+
+    def save(self, file_name):
+        """Write the graph to a project JSON or binary (.vnproj) file, replacing it atomically"""
+        project_writer.save_project(self.to_dict(), file_name)
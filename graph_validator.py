@@ -0,0 +1,143 @@
+"""
+Graph Validator for Visual Novel Node Editor
+Finds duplicate node names, nodes unreachable from a start node, branch
+outputs with no target, missing or multiple start nodes and cycles
+"""
+
+from story_routes import RouteAnalyzer
+from story_traversal import reachable
+
+DUPLICATE_NAME = 'duplicate_name'
+OPEN_BRANCH_OUTPUT = 'open_branch_output'
+UNREACHABLE = 'unreachable'
+NO_START = 'no_start'
+MULTIPLE_STARTS = 'multiple_starts'
+CYCLE = 'cycle'
+
+
+class ValidationIssue:
+    """One problem in the graph and the node records it concerns"""
+    __slots__ = ('code', 'message', 'records')
+
+    def __init__(self, code, message, records):
+        self.code = code
+        self.message = message
+        self.records = records
+
+    def __repr__(self):
+        return f"ValidationIssue({self.code!r}, {self.message!r})"
+
+
+class GraphValidator:
+    """Validation state of a GraphModel, kept up to date as the graph is edited.
+
+    Checks that only depend on one node (duplicate names, open branch
+    outputs) are redone for just that node in node_changed()/edges_changed().
+    Checks over the whole graph (start nodes, reachability, cycles) are one
+    O(V + E) pass, run by refresh() only when an edit has made them stale.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._local = {}         # record -> [ValidationIssue] about that node alone
+        self._names = {}         # record -> name its duplicate check was made for
+        self._global = []        # issues from the last whole-graph pass
+        self._global_stale = True
+
+    def validate(self):
+        """Check the whole graph from scratch and return all issues"""
+        self._local = {}
+        self._names = {}
+        for record in self.graph.nodes:
+            self._check_node(record)
+        self._global_stale = True
+        return self.refresh()
+
+    def node_changed(self, record):
+        """Recheck a node that was added, renamed or had its outputs changed"""
+        old_name = self._names.get(record)
+        self._check_node(record)
+        if old_name is not None and old_name != record.name:
+            # Nodes left behind under the old name may no longer be duplicates
+            for other in self.graph.nodes.named(old_name):
+                self._check_node(other)
+        for other in self.graph.nodes.named(record.name):
+            if other is not record:
+                self._check_node(other)
+        self._global_stale = True
+
+    def node_removed(self, record):
+        """Forget a deleted node and recheck the nodes that shared its name"""
+        self._local.pop(record, None)
+        name = self._names.pop(record, record.name)
+        for other in self.graph.nodes.named(name):
+            self._check_node(other)
+        self._global_stale = True
+
+    def edges_changed(self, record):
+        """Recheck after the outgoing edges of a node changed"""
+        if record in self._names:
+            self._check_node(record)
+        self._global_stale = True
+
+    def refresh(self):
+        """Redo the whole-graph checks if an edit made them stale; returns all issues"""
+        if self._global_stale:
+            self._global = self._check_graph()
+            self._global_stale = False
+        return self.issues()
+
+    def issues(self):
+        """All issues found so far"""
+        issues = [issue for node_issues in self._local.values() for issue in node_issues]
+        return issues + self._global
+
+    def issues_by_record(self):
+        """record -> [message, ...] for every node involved in at least one issue"""
+        messages = {}
+        for issue in self.issues():
+            for record in issue.records:
+                messages.setdefault(record, []).append(issue.message)
+        return messages
+
+    def _check_node(self, record):
+        issues = []
+        self._names[record] = record.name
+
+        sharing = len(self.graph.nodes.named(record.name))
+        if sharing > 1:
+            issues.append(ValidationIssue(DUPLICATE_NAME,
+                f"Name '{record.name}' is used by {sharing} nodes", [record]))
+
+        if record.kind == 'branch':
+            for port in record.output_ports:
+                if not port.edges:
+                    issues.append(ValidationIssue(OPEN_BRANCH_OUTPUT,
+                        f"Branch output {port.index + 1} of '{record.name}' has no target", [record]))
+
+        if issues:
+            self._local[record] = issues
+        else:
+            self._local.pop(record, None)
+
+    def _check_graph(self):
+        issues = []
+        starts = self.graph.start_nodes()
+        if not starts and len(self.graph.nodes):
+            issues.append(ValidationIssue(NO_START, "The graph has no start node", []))
+        elif len(starts) > 1:
+            issues.append(ValidationIssue(MULTIPLE_STARTS,
+                f"The graph has {len(starts)} start nodes", starts))
+
+        if starts:
+            reached = reachable(self.graph, starts)
+            for record in self.graph.nodes:
+                if record not in reached:
+                    issues.append(ValidationIssue(UNREACHABLE,
+                        f"'{record.name}' cannot be reached from a start node", [record]))
+
+        # Each cycle is flagged on the edge that closes it; RouteAnalyzer.cycle() lists the whole loop
+        for source, target in RouteAnalyzer(self.graph, starts, whole_graph=True).back_edges:
+            issues.append(ValidationIssue(CYCLE,
+                f"Cycle: '{source.name}' leads back to '{target.name}'", [source, target]))
+        return issues
@@ -5,12 +5,47 @@ Plus helper classes for interactive buttons
 """
 
 import time
-from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsPathItem, QDialog, QMenu, QGraphicsTextItem
-from PySide6.QtGui import QBrush, QColor, QPainterPath, QPen, QCursor, QFont
-from PySide6.QtCore import Qt, QPointF
+import logging
+from PySide6.QtWidgets import (QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsPathItem, QDialog, QMenu,
+                               QGraphicsTextItem, QStyleOptionGraphicsItem)
+from PySide6.QtGui import QBrush, QColor, QPainterPath, QPen, QCursor, QFont, QFontMetricsF, QStaticText, QTransform
+from PySide6.QtCore import Qt, QPointF, QRectF
 
 # Import form from local module
 from form import MyForm
+from graph_model import NodeRecord, EdgeRecord
+
+# Level of detail: below this zoom, edges are drawn straight, circles are hidden
+# and labels become solid blocks so very large zoomed-out graphs pan smoothly
+LOD_DETAIL_THRESHOLD = 0.5
+LOD_EDGE_CULL_PIXELS = 4  # Zoomed-out edges shorter than this on screen are skipped
+
+
+logger = logging.getLogger(__name__)
+
+
+def log_saved_form_data(node, data):
+    """Dump the form data just stored on a node (debug level only)"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
+    logger.debug("Saved complete form data to %s '%s': name=%s, in_scene=%s, out_scene=%s, background=%s, "
+                 "items=%d, dialogs=%d, actions=%d, input=%s, outputs=%s, data size=%d characters",
+                 type(node).__name__, node.name, data.get('name'), data.get('in_scene'), data.get('out_scene'),
+                 data.get('background'), len(data.get('items', [])), len(data.get('dialogs', [])),
+                 len(data.get('actions', [])), node.input_connected_node, node.output_connected_nodes,
+                 len(str(node.node_data)))
+    for item in data.get('items', []):
+        if item['type'] == 'dialog':
+            logger.debug("    %s. Dialog - %s%s: %s", item['order'], item['character'],
+                         f" {item['parentheticals']}" if item.get('parentheticals') else "", item['text'])
+        else:
+            logger.debug("    %s. Action - %s", item['order'], item['text'])
+
+
+def level_of_detail(painter):
+    """Current zoom factor of the view being painted"""
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
 
 
 class BranchButton(QGraphicsEllipseItem):
@@ -59,8 +94,131 @@ class BranchButton(QGraphicsEllipseItem):
         event.accept()
 
 
+class NodeRecordView:
+    """Mixin for node items whose story data lives on a graph_model.NodeRecord"""
+    label_color = QColor(0, 0, 0)  # Black for regular nodes
+    validation_messages = ()  # Problems reported by the graph validator
+    _issue_pen = None
+    _label_font = None
+    _label_name = None   # Name the cached label was laid out for
+    _label_text = None   # Cached QStaticText of the node name
+
+    def paint(self, painter, option, widget=None):
+        super().paint(painter, option, widget)
+        
+        # Red dashed outline, inside the node's bounds, while the validator flags it
+        if self.validation_messages:
+            if NodeRecordView._issue_pen is None:
+                NodeRecordView._issue_pen = QPen(QColor(220, 0, 0), 3, Qt.DashLine)
+            painter.setPen(NodeRecordView._issue_pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.rect().adjusted(2, 2, -2, -2))
+        
+        label = self.label_static_text()
+        center = self.rect().center()
+        size = label.size()
+        
+        # Zoomed out - a solid block in place of the text
+        if level_of_detail(painter) < LOD_DETAIL_THRESHOLD:
+            block = QRectF(0, 0, size.width(), size.height() / 2)
+            block.moveCenter(center)
+            painter.fillRect(block, self.label_color)
+            return
+        
+        # Draw node name centered on the node from the cached layout
+        painter.setFont(NodeRecordView._label_font)
+        painter.setPen(self.label_color)
+        painter.drawStaticText(QPointF(center.x() - size.width() / 2, center.y() - size.height() / 2), label)
+
+    def label_static_text(self):
+        """Return the node name laid out once; rebuilt only when the name changes"""
+        if self._label_name != self.name:
+            if NodeRecordView._label_font is None:
+                NodeRecordView._label_font = QFont("Arial", 10)
+            
+            # Elide to the node width so the label stays inside the item's bounds
+            text_width = self.rect().adjusted(5, 5, -5, -5).width()
+            metrics = QFontMetricsF(NodeRecordView._label_font)
+            text = metrics.elidedText(self.name, Qt.ElideRight, text_width)
+            
+            label = QStaticText(text)
+            label.setTextFormat(Qt.PlainText)
+            label.prepare(QTransform(), NodeRecordView._label_font)
+            self._label_text = label
+            self._label_name = self.name
+        return self._label_text
+
+    def set_validation_messages(self, messages):
+        """Highlight the node with the validator's messages as its tooltip; empty clears it"""
+        self.validation_messages = tuple(messages)
+        self.setToolTip("\n".join(self.validation_messages))
+        self.update()
+
+    @property
+    def node_id(self):
+        return self.record.node_id
+
+    @node_id.setter
+    def node_id(self, value):
+        self.record.node_id = value
+
+    @property
+    def name(self):
+        return self.record.name
+
+    @name.setter
+    def name(self, value):
+        self.record.name = value
+
+    @property
+    def node_data(self):
+        return self.record.data
+
+    @node_data.setter
+    def node_data(self, value):
+        self.record.data = value
+
+    # Connection tracking is derived from the record's port adjacency, which is
+    # updated incrementally whenever an edge is attached or removed
+
+    @property
+    def input_connected_node(self):
+        return self.record.input_connected_node
+
+    @property
+    def output_connected_node(self):
+        return self.record.output_connected_node
+
+    @property
+    def output_connected_nodes(self):
+        return self.record.output_connected_nodes
+
+    def schedule_edge_updates(self, edges):
+        """Queue edge path rebuilds on the scene, coalesced to once per frame"""
+        scene = self.scene()
+        if hasattr(scene, 'mark_edges_dirty'):
+            scene.mark_edges_dirty(edges)
+        else:
+            for edge in edges:
+                edge.updateFromNodes()
+
+    def sync_record_position(self):
+        """Copy the item's scene position into its record; True if it moved"""
+        if self.record.x == self.x() and self.record.y == self.y():
+            return False
+        self.record.x = self.x()
+        self.record.y = self.y()
+        return True
+
+    def notify_modified(self, aspect):
+        """Tell the scene this node's 'data', 'position' or 'ports' changed"""
+        scene = self.scene()
+        if hasattr(scene, 'node_modified'):
+            scene.node_modified(self, aspect)
+
+
 class InputOutputCircle(QGraphicsEllipseItem):
-    def __init__(self, x, y, w, h, parent, point_type):
+    def __init__(self, x, y, w, h, parent, point_type, port=None):
         super().__init__(x, y, w, h, parent)
         # Set different colors for input and output
         if point_type == 'input':
@@ -73,9 +231,16 @@ class InputOutputCircle(QGraphicsEllipseItem):
         self.setFlag(QGraphicsEllipseItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsEllipseItem.ItemIsFocusable, True)
         self.point_type = point_type  # 'input' or 'output'
+        self.port = port  # graph_model.PortRecord this circle displays
         self._drag_edge = None
         self.connected_edges = []  # Initialize connected edges list
 
+    def paint(self, painter, option, widget=None):
+        # Circles are too small to see or hit when zoomed out
+        if level_of_detail(painter) < LOD_DETAIL_THRESHOLD:
+            return
+        super().paint(painter, option, widget)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             scene = self.scene()
@@ -134,21 +299,9 @@ class InputOutputCircle(QGraphicsEllipseItem):
                     edge = EdgeGraphicsItem(start_pos, end_pos, color, None, self, target_circle)
                     scene.addItem(edge)
                     
-                    # Store edge references in both circles for tracking
-                    if not hasattr(self, 'connected_edges'):
-                        self.connected_edges = []
-                    if not hasattr(target_circle, 'connected_edges'):
-                        target_circle.connected_edges = []
-                    self.connected_edges.append(edge)
-                    target_circle.connected_edges.append(edge)
-                    
-                    # Update connection tracking for both nodes
-                    self_node = self.parentItem()
-                    target_node = target_circle.parentItem()
-                    if isinstance(self_node, (NodeScene, StartNode, BranchNode)):
-                        self_node.updateConnectionTracking()
-                    if isinstance(target_node, (NodeScene, StartNode, BranchNode)):
-                        target_node.updateConnectionTracking()
+                    # Store edge references in both circles and the graph model
+                    # (this also updates connection tracking for both nodes)
+                    edge.attach()
                 else:
                     # No target circle found - create new node at drop position
                     self.create_connected_node(mouse_scene_pos)
@@ -164,17 +317,17 @@ class InputOutputCircle(QGraphicsEllipseItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
             break
         
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Create new node at drop position
             new_node = NodeScene(position.x() - 60, position.y() - 30)  # Center node at position
             scene.addItem(new_node)
-            main_window.node_items.append(new_node)
+            main_window.register_node(new_node)
             
             # Connect based on the type of circle we dragged from
             if self.point_type == 'output':
@@ -196,20 +349,9 @@ class InputOutputCircle(QGraphicsEllipseItem):
                                   target_circle if self.point_type == 'output' else self)
             scene.addItem(edge)
             
-            # Store edge references in both circles
-            if not hasattr(self, 'connected_edges'):
-                self.connected_edges = []
-            if not hasattr(target_circle, 'connected_edges'):
-                target_circle.connected_edges = []
-            self.connected_edges.append(edge)
-            target_circle.connected_edges.append(edge)
-            
-            # Update connection tracking for both nodes
-            self_node = self.parentItem()
-            if isinstance(self_node, (NodeScene, StartNode, BranchNode)):
-                self_node.updateConnectionTracking()
-            if isinstance(new_node, (NodeScene, StartNode, BranchNode)):
-                new_node.updateConnectionTracking()
+            # Store edge references in both circles and the graph model
+            # (this also updates connection tracking for both nodes)
+            edge.attach()
             
             # Update scene rect to include new node
             node_rect = new_node.sceneBoundingRect()
@@ -223,7 +365,7 @@ class InputOutputCircle(QGraphicsEllipseItem):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Created and connected new node '{new_node.name}'", 3000)
             
-            print(f"Auto-created node '{new_node.name}' and connected via {self.point_type} circle")
+            logger.debug("Auto-created node '%s' and connected via %s circle", new_node.name, self.point_type)
 
 
 class EdgeGraphicsItem(QGraphicsPathItem):
@@ -233,13 +375,17 @@ class EdgeGraphicsItem(QGraphicsPathItem):
         self.end_pos = end_pos
         self.start_circle = start_circle  # Reference to start InputOutputCircle
         self.end_circle = end_circle      # Reference to end InputOutputCircle
+        self.record = None                # graph_model.EdgeRecord once attached
+        self.attached = False             # True while registered with its circles
         self.setZValue(-2)  # Make sure edge is below nodes and input/output circles
         # If color is not specified, use blue for output, red for input
         if color is None:
             color = QColor(255, 0, 0)  # Red fiber
         self.pen = QPen(color, 3)
         self.setPen(self.pen)
-        self.updatePath()
+        # Bulk loads pass no positions; the path is built later by updateFromNodes
+        if start_pos is not None and end_pos is not None:
+            self.updatePath()
         
         # Make edge selectable
         self.setFlag(QGraphicsPathItem.ItemIsSelectable, True)
@@ -292,30 +438,59 @@ class EdgeGraphicsItem(QGraphicsPathItem):
             painter.setPen(selected_pen)
         else:
             painter.setPen(self.pen)
+        
+        # Zoomed out - straight line, or nothing if it would be only a few pixels long
+        lod = level_of_detail(painter)
+        if lod < LOD_DETAIL_THRESHOLD:
+            delta = self.end_pos - self.start_pos
+            if delta.manhattanLength() * lod >= LOD_EDGE_CULL_PIXELS:
+                painter.drawLine(self.start_pos, self.end_pos)
+            return
+        
         painter.drawPath(self.path())
 
+    def attach(self, record=None):
+        """Register this edge with its circles and link their ports in the graph model"""
+        for circle in (self.start_circle, self.end_circle):
+            if not hasattr(circle, 'connected_edges'):
+                circle.connected_edges = []
+            circle.connected_edges.append(self)
+        
+        if record is None and self.start_circle.port and self.end_circle.port:
+            record = EdgeRecord.link(self.start_circle.port, self.end_circle.port)
+        self.record = record
+        
+        # Keep the scene's edge counter current for the status bar
+        self.attached = True
+        scene = self.scene()
+        if hasattr(scene, 'edge_attached'):
+            scene.edge_attached(record.source_node if record else None)
+
     def removeFromConnections(self):
-        """Remove this edge from connected circles' edge lists"""
+        """Remove this edge from connected circles' edge lists and the graph model"""
+        # Unlinking the ports updates connection tracking for both nodes
+        source_record = None
+        if self.record:
+            source_record = self.record.source_node
+            self.record.unlink()
+            self.record = None
+        
+        if self.attached:
+            self.attached = False
+            scene = self.scene()
+            if hasattr(scene, 'edge_detached'):
+                scene.edge_detached(source_record)
+        
         if self.start_circle and hasattr(self.start_circle, 'connected_edges'):
             if self in self.start_circle.connected_edges:
                 self.start_circle.connected_edges.remove(self)
         if self.end_circle and hasattr(self.end_circle, 'connected_edges'):
             if self in self.end_circle.connected_edges:
                 self.end_circle.connected_edges.remove(self)
-        
-        # Update connection tracking for both nodes
-        if self.start_circle:
-            start_node = self.start_circle.parentItem()
-            if isinstance(start_node, (NodeScene, StartNode, BranchNode)):
-                start_node.updateConnectionTracking()
-        if self.end_circle:
-            end_node = self.end_circle.parentItem()
-            if isinstance(end_node, (NodeScene, StartNode, BranchNode)):
-                end_node.updateConnectionTracking()
 
 
-class NodeScene(QGraphicsRectItem):
-    def __init__(self, x, y, w=120, h=60, name=None):
+class NodeScene(NodeRecordView, QGraphicsRectItem):
+    def __init__(self, x, y, w=120, h=60, name=None, record=None):
         super().__init__(0, 0, w, h)
         self.setPos(x, y)
         self.setBrush(QBrush(QColor(200, 200, 200)))
@@ -324,12 +499,10 @@ class NodeScene(QGraphicsRectItem):
         self.setFlag(QGraphicsRectItem.ItemIsFocusable, True)
         self.setAcceptHoverEvents(True)
         self.setZValue(0)  # Node at middle layer
-        self.name = name if name else f"Node {int(time.time())}"
-        self.node_data = {}  # Store form data
         
-        # Connection tracking - store name of connected nodes
-        self.input_connected_node = None   # Name of node connected to input, or None
-        self.output_connected_node = None  # Name of node connected to output, or None
+        # Story data (name, form data, connection tracking) lives on the graph record
+        self.record = record if record else NodeRecord('normal', name if name else f"Node {int(time.time())}", x, y)
+        self.record.view = self
         
         # Double click detection
         self.last_click_time = 0
@@ -342,7 +515,8 @@ class NodeScene(QGraphicsRectItem):
                                              self.circle_radius*2,
                                              self.circle_radius*2,
                                              self,
-                                             'input')
+                                             'input',
+                                             self.record.input_port)
         self.input_circle.setZValue(2)  # Input/output circles on top
 
         self.output_circle = InputOutputCircle(w - self.circle_radius + self.circle_radius,
@@ -350,7 +524,8 @@ class NodeScene(QGraphicsRectItem):
                                               self.circle_radius*2,
                                               self.circle_radius*2,
                                               self,
-                                              'output')
+                                              'output',
+                                              self.record.output_ports[0])
         self.output_circle.setZValue(2)  # Input/output circles on top
 
     def mousePressEvent(self, event):
@@ -390,12 +565,10 @@ class NodeScene(QGraphicsRectItem):
             delta = event.pos() - self._drag_start
             self.setPos(self.pos() + delta)
             
-            # Update connected edges
+            # Only geometry changes during a drag - moving a node never changes
+            # its connections, so no topology bookkeeping happens here
             self.updateConnectedEdges()
             
-            # Update connection tracking to ensure data is current
-            self.updateConnectionTracking()
-            
             # --- Expand scene rect if node dragged out of bounds ---
             scene = self.scene()
             if scene:
@@ -414,58 +587,19 @@ class NodeScene(QGraphicsRectItem):
         if event.button() == Qt.LeftButton:
             self._drag_start = None
             self.setCursor(Qt.ArrowCursor)
+            if self.sync_record_position():
+                self.notify_modified('position')
             event.accept()
         else:
             event.ignore()
 
     def updateConnectedEdges(self):
         """Update all edges connected to this node's input/output circles"""
+        edges = []
         for circle in [self.input_circle, self.output_circle]:
             if hasattr(circle, 'connected_edges'):
-                for edge in circle.connected_edges:
-                    edge.updateFromNodes()
-
-    def updateConnectionTracking(self):
-        """Update input_connected_node and output_connected_node based on current edges"""
-        # Reset connections
-        self.input_connected_node = None
-        self.output_connected_node = None
-        
-        # Check input circle connections
-        if hasattr(self.input_circle, 'connected_edges'):
-            for edge in self.input_circle.connected_edges:
-                if edge.start_circle == self.input_circle:
-                    # This input is the start of the edge, find the end node
-                    if edge.end_circle and hasattr(edge.end_circle, 'parentItem'):
-                        parent_node = edge.end_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.input_connected_node = parent_node.name
-                            break
-                elif edge.end_circle == self.input_circle:
-                    # This input is the end of the edge, find the start node
-                    if edge.start_circle and hasattr(edge.start_circle, 'parentItem'):
-                        parent_node = edge.start_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.input_connected_node = parent_node.name
-                            break
-        
-        # Check output circle connections
-        if hasattr(self.output_circle, 'connected_edges'):
-            for edge in self.output_circle.connected_edges:
-                if edge.start_circle == self.output_circle:
-                    # This output is the start of the edge, find the end node
-                    if edge.end_circle and hasattr(edge.end_circle, 'parentItem'):
-                        parent_node = edge.end_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.output_connected_node = parent_node.name
-                            break
-                elif edge.end_circle == self.output_circle:
-                    # This output is the end of the edge, find the start node
-                    if edge.start_circle and hasattr(edge.start_circle, 'parentItem'):
-                        parent_node = edge.start_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.output_connected_node = parent_node.name
-                            break
+                edges.extend(circle.connected_edges)
+        self.schedule_edge_updates(edges)
 
     def show_context_menu(self, screen_pos):
         """Show context menu with Delete and Duplicate options"""
@@ -493,13 +627,13 @@ class NodeScene(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
             break
         
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Create new node at offset position
             offset = 150
             new_x = self.pos().x() + offset
@@ -517,7 +651,7 @@ class NodeScene(QGraphicsRectItem):
             
             # Add to scene and node list
             scene.addItem(new_node)
-            main_window.node_items.append(new_node)
+            main_window.register_node(new_node)
             
             # Update scene rect to include new node
             node_rect = new_node.sceneBoundingRect()
@@ -531,7 +665,7 @@ class NodeScene(QGraphicsRectItem):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Duplicated node '{self.name}' as '{new_node.name}'", 3000)
             
-            print(f"Duplicated node '{self.name}' as '{new_node.name}' at position ({new_x}, {new_y})")
+            logger.debug("Duplicated node '%s' as '%s' at position (%s, %s)", self.name, new_node.name, new_x, new_y)
 
     def delete_node(self):
         """Delete this node and clean up all connections"""
@@ -539,7 +673,7 @@ class NodeScene(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
@@ -562,9 +696,8 @@ class NodeScene(QGraphicsRectItem):
             scene.removeItem(edge)
         
         # Remove node from main window's node list
-        if main_window and hasattr(main_window, 'node_items'):
-            if self in main_window.node_items:
-                main_window.node_items.remove(self)
+        if main_window and hasattr(main_window, 'register_node'):
+            main_window.unregister_node(self)
         
         # Remove node from scene
         scene.removeItem(self)
@@ -573,7 +706,7 @@ class NodeScene(QGraphicsRectItem):
         if main_window and hasattr(main_window, 'status_bar'):
             main_window.status_bar.showMessage(f"Deleted node '{self.name}'", 3000)
         
-        print(f"Deleted node '{self.name}' and cleaned up all connections")
+        logger.debug("Deleted node '%s' and cleaned up all connections", self.name)
 
     def open_form(self):
         """Open form dialog to edit node data"""
@@ -655,7 +788,7 @@ class NodeScene(QGraphicsRectItem):
                         new_height = min(new_height, max_height)
                         
                         form.resize(form.width(), new_height)
-                        print(f"Restored {total_rows} rows and resized form to: {form.width()}x{new_height}")
+                        logger.debug("Restored %s rows and resized form to: %sx%s", total_rows, form.width(), new_height)
                 else:
                     # No existing data - start with empty form (NodeScene)
                     form.name_input.setText(self.name)
@@ -669,40 +802,22 @@ class NodeScene(QGraphicsRectItem):
                     # Store ALL form data in node
                     self.node_data = data
                     
-                    # Update node name
+                    # Update node name (through the main window so the registry stays in sync)
                     if data['name']:
-                        self.name = data['name']
-                    
-                    print(f"Saved complete form data to node '{self.name}':")
-                    print(f"  Name: {data.get('name', 'None')}")
-                    print(f"  In Scene: {data.get('in_scene', 'None')}")
-                    print(f"  Out Scene: {data.get('out_scene', 'None')}")
-                    print(f"  Background: {data.get('background', 'None')}")
-                    print(f"  Total Items: {len(data.get('items', []))}")
-                    print(f"  Dialogs: {len(data.get('dialogs', []))}")
-                    print(f"  Actions: {len(data.get('actions', []))}")
-                    
-                    # Print connection information
-                    print(f"  Input Connected to: {self.input_connected_node if self.input_connected_node else 'None'}")
-                    print(f"  Output Connected to: {self.output_connected_node if self.output_connected_node else 'None'}")
+                        main_window.rename_node(self, data['name'])
                     
-                    # Print detailed items
-                    for item in data.get('items', []):
-                        if item['type'] == 'dialog':
-                            parentheticals = f" {item['parentheticals']}" if item.get('parentheticals') else ""
-                            print(f"    {item['order']}. Dialog - {item['character']}{parentheticals}: {item['text']}")
-                        else:
-                            print(f"    {item['order']}. Action - {item['text']}")
+                    log_saved_form_data(self, data)
+                    self.notify_modified('data')
                     
                     # Force redraw to show updated name
                     scene.update()
-                    
-                    print(f"Node data successfully stored. Total data size: {len(str(self.node_data))} characters")
 
 
-class StartNode(QGraphicsRectItem):
+class StartNode(NodeRecordView, QGraphicsRectItem):
     """Special start node that has no input circle - only output"""
-    def __init__(self, x, y, w=120, h=60, name=None):
+    label_color = QColor(0, 100, 0)  # Dark green for start node
+
+    def __init__(self, x, y, w=120, h=60, name=None, record=None):
         # Initialize as QGraphicsRectItem
         super().__init__(0, 0, w, h)
         self.setPos(x, y)
@@ -712,12 +827,10 @@ class StartNode(QGraphicsRectItem):
         self.setFlag(QGraphicsRectItem.ItemIsFocusable, True)
         self.setAcceptHoverEvents(True)
         self.setZValue(0)  # Node at middle layer
-        self.name = name if name else "Start"
-        self.node_data = {}  # Store form data
         
-        # Connection tracking - start node only has output
-        self.input_connected_node = None   # Always None for start node
-        self.output_connected_node = None  # Name of node connected to output, or None
+        # Story data lives on the graph record - start node only has output
+        self.record = record if record else NodeRecord('start', name if name else "Start", x, y)
+        self.record.view = self
         
         # Double click detection
         self.last_click_time = 0
@@ -735,7 +848,8 @@ class StartNode(QGraphicsRectItem):
                                               self.circle_radius*2,
                                               self.circle_radius*2,
                                               self,
-                                              'output')
+                                              'output',
+                                              self.record.output_ports[0])
         self.output_circle.setZValue(2)  # Output circle on top
 
     def mousePressEvent(self, event):
@@ -774,12 +888,10 @@ class StartNode(QGraphicsRectItem):
             delta = event.pos() - self._drag_start
             self.setPos(self.pos() + delta)
             
-            # Update connected edges
+            # Only geometry changes during a drag - moving a node never changes
+            # its connections, so no topology bookkeeping happens here
             self.updateConnectedEdges()
             
-            # Update connection tracking to ensure data is current
-            self.updateConnectionTracking()
-            
             # --- Expand scene rect if node dragged out of bounds ---
             scene = self.scene()
             if scene:
@@ -798,6 +910,8 @@ class StartNode(QGraphicsRectItem):
         if event.button() == Qt.LeftButton:
             self._drag_start = None
             self.setCursor(Qt.ArrowCursor)
+            if self.sync_record_position():
+                self.notify_modified('position')
             event.accept()
         else:
             event.ignore()
@@ -805,32 +919,7 @@ class StartNode(QGraphicsRectItem):
     def updateConnectedEdges(self):
         """Update all edges connected to this node's output circle only"""
         if self.output_circle and hasattr(self.output_circle, 'connected_edges'):
-            for edge in self.output_circle.connected_edges:
-                edge.updateFromNodes()
-
-    def updateConnectionTracking(self):
-        """Update output_connected_node based on current edges (no input for start node)"""
-        # Reset connections
-        self.input_connected_node = None  # Always None for start node
-        self.output_connected_node = None
-        
-        # Check output circle connections only
-        if self.output_circle and hasattr(self.output_circle, 'connected_edges'):
-            for edge in self.output_circle.connected_edges:
-                if edge.start_circle == self.output_circle:
-                    # This output is the start of the edge, find the end node
-                    if edge.end_circle and hasattr(edge.end_circle, 'parentItem'):
-                        parent_node = edge.end_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.output_connected_node = parent_node.name
-                            break
-                elif edge.end_circle == self.output_circle:
-                    # This output is the end of the edge, find the start node
-                    if edge.start_circle and hasattr(edge.start_circle, 'parentItem'):
-                        parent_node = edge.start_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.output_connected_node = parent_node.name
-                            break
+            self.schedule_edge_updates(self.output_circle.connected_edges)
 
     def show_context_menu(self, screen_pos):
         """Show context menu with Delete and Duplicate options"""
@@ -858,13 +947,13 @@ class StartNode(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
             break
         
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Create new start node at offset position
             offset = 150
             new_x = self.pos().x() + offset
@@ -882,7 +971,7 @@ class StartNode(QGraphicsRectItem):
             
             # Add to scene and node list
             scene.addItem(new_node)
-            main_window.node_items.append(new_node)
+            main_window.register_node(new_node)
             
             # Update scene rect to include new node
             node_rect = new_node.sceneBoundingRect()
@@ -896,7 +985,7 @@ class StartNode(QGraphicsRectItem):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Duplicated start node '{self.name}' as '{new_node.name}'", 3000)
             
-            print(f"Duplicated start node '{self.name}' as '{new_node.name}' at position ({new_x}, {new_y})")
+            logger.debug("Duplicated start node '%s' as '%s' at position (%s, %s)", self.name, new_node.name, new_x, new_y)
 
     def delete_node(self):
         """Delete this node and clean up all connections"""
@@ -904,7 +993,7 @@ class StartNode(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
@@ -923,9 +1012,8 @@ class StartNode(QGraphicsRectItem):
             scene.removeItem(edge)
         
         # Remove node from main window's node list
-        if main_window and hasattr(main_window, 'node_items'):
-            if self in main_window.node_items:
-                main_window.node_items.remove(self)
+        if main_window and hasattr(main_window, 'register_node'):
+            main_window.unregister_node(self)
         
         # Remove node from scene
         scene.removeItem(self)
@@ -934,7 +1022,7 @@ class StartNode(QGraphicsRectItem):
         if main_window and hasattr(main_window, 'status_bar'):
             main_window.status_bar.showMessage(f"Deleted start node '{self.name}'", 3000)
         
-        print(f"Deleted start node '{self.name}' and cleaned up all connections")
+        logger.debug("Deleted start node '%s' and cleaned up all connections", self.name)
 
     def open_form(self):
         """Open form dialog to edit node data (same as NodeScene but for StartNode)"""
@@ -1016,7 +1104,7 @@ class StartNode(QGraphicsRectItem):
                         new_height = min(new_height, max_height)
                         
                         form.resize(form.width(), new_height)
-                        print(f"Restored {total_rows} rows and resized form to: {form.width()}x{new_height}")
+                        logger.debug("Restored %s rows and resized form to: %sx%s", total_rows, form.width(), new_height)
                 else:
                     # No existing data - start with empty form for StartNode
                     form.name_input.setText(self.name)
@@ -1030,47 +1118,29 @@ class StartNode(QGraphicsRectItem):
                     # Store ALL form data in node
                     self.node_data = data
                     
-                    # Update node name
+                    # Update node name (through the main window so the registry stays in sync)
                     if data['name']:
-                        self.name = data['name']
-                    
-                    print(f"Saved complete form data to StartNode '{self.name}':")
-                    print(f"  Name: {data.get('name', 'None')}")
-                    print(f"  In Scene: {data.get('in_scene', 'None')}")
-                    print(f"  Out Scene: {data.get('out_scene', 'None')}")
-                    print(f"  Background: {data.get('background', 'None')}")
-                    print(f"  Total Items: {len(data.get('items', []))}")
-                    print(f"  Dialogs: {len(data.get('dialogs', []))}")
-                    print(f"  Actions: {len(data.get('actions', []))}")
+                        main_window.rename_node(self, data['name'])
                     
-                    # Print connection information (StartNode has no input)
-                    print(f"  Input Connected to: None (Start node has no input)")
-                    print(f"  Output Connected to: {self.output_connected_node if self.output_connected_node else 'None'}")
-                    
-                    # Print detailed items
-                    for item in data.get('items', []):
-                        if item['type'] == 'dialog':
-                            parentheticals = f" {item['parentheticals']}" if item.get('parentheticals') else ""
-                            print(f"    {item['order']}. Dialog - {item['character']}{parentheticals}: {item['text']}")
-                        else:
-                            print(f"    {item['order']}. Action - {item['text']}")
+                    log_saved_form_data(self, data)
+                    self.notify_modified('data')
                     
                     # Force redraw to show updated name
                     scene.update()
-                    
-                    print(f"StartNode data successfully stored. Total data size: {len(str(self.node_data))} characters")
 
 
-class BranchNode(QGraphicsRectItem):
+class BranchNode(NodeRecordView, QGraphicsRectItem):
     """Special branch node that has one input and multiple outputs for branching storylines"""
-    def __init__(self, x, y, w=140, h=None, name=None):
+    label_color = QColor(100, 0, 100)  # Purple for branch node
+
+    def __init__(self, x, y, w=140, h=None, name=None, record=None):
         # Calculate initial height based on default output count
         self.circle_radius = 6
         self.output_spacing = 25  # Fixed spacing between outputs
         self.top_bottom_margin = 20  # Margin from top and bottom
         
-        # Calculate height for 1 output
-        initial_outputs = 1
+        # Calculate height for the record's outputs (1 for a new branch)
+        initial_outputs = len(record.output_ports) if record else 1
         calculated_h = self.calculate_height_for_outputs(initial_outputs)
         h = h if h else calculated_h
         
@@ -1083,12 +1153,10 @@ class BranchNode(QGraphicsRectItem):
         self.setFlag(QGraphicsRectItem.ItemIsFocusable, True)
         self.setAcceptHoverEvents(True)
         self.setZValue(0)  # Node at middle layer
-        self.name = name if name else f"Branch {int(time.time())}"
-        self.node_data = {}  # Store form data
         
-        # Connection tracking - branch node has one input and multiple outputs
-        self.input_connected_node = None   # Name of node connected to input, or None
-        self.output_connected_nodes = []   # List of node names connected to outputs
+        # Story data lives on the graph record - branch node has one input and multiple outputs
+        self.record = record if record else NodeRecord('branch', name if name else f"Branch {int(time.time())}", x, y)
+        self.record.view = self
         
         # Double click detection
         self.last_click_time = 0
@@ -1104,7 +1172,8 @@ class BranchNode(QGraphicsRectItem):
                                              self.circle_radius*2,
                                              self.circle_radius*2,
                                              self,
-                                             'input')
+                                             'input',
+                                             self.record.input_port)
         self.input_circle.setZValue(2)  # Input circle on top
 
         # Create initial output circles
@@ -1124,12 +1193,16 @@ class BranchNode(QGraphicsRectItem):
         h = self.rect().height()
         center_y = h / 2
         
-        # Clear existing circles
-        for circle in self.output_circles:
+        # Clear existing circles, keeping their edges to hand over to the new ones
+        old_circles = self.output_circles
+        for circle in old_circles:
             if circle.scene():
                 circle.scene().removeItem(circle)
         self.output_circles = []
         
+        # Output ports on the record are kept, so model edges survive the rebuild
+        self.record.set_output_count(num_outputs)
+        
         # Calculate starting position (center for odd numbers, between center for even)
         if num_outputs == 1:
             # Single output at center
@@ -1147,8 +1220,18 @@ class BranchNode(QGraphicsRectItem):
                                             self.circle_radius*2,
                                             self.circle_radius*2,
                                             self,
-                                            'output')
+                                            'output',
+                                            self.record.output_ports[i])
             output_circle.setZValue(2)
+            if i < len(old_circles):
+                # Edges stay on the same output, now ending at the new circle
+                old_circle = old_circles[i]
+                output_circle.connected_edges = old_circle.connected_edges
+                for edge in output_circle.connected_edges:
+                    if edge.start_circle is old_circle:
+                        edge.start_circle = output_circle
+                    if edge.end_circle is old_circle:
+                        edge.end_circle = output_circle
             self.output_circles.append(output_circle)
 
     def resize_node_for_outputs(self, num_outputs):
@@ -1229,12 +1312,10 @@ class BranchNode(QGraphicsRectItem):
             delta = event.pos() - self._drag_start
             self.setPos(self.pos() + delta)
             
-            # Update connected edges
+            # Only geometry changes during a drag - moving a node never changes
+            # its connections, so no topology bookkeeping happens here
             self.updateConnectedEdges()
             
-            # Update connection tracking to ensure data is current
-            self.updateConnectionTracking()
-            
             # --- Expand scene rect if node dragged out of bounds ---
             scene = self.scene()
             if scene:
@@ -1253,65 +1334,26 @@ class BranchNode(QGraphicsRectItem):
         if event.button() == Qt.LeftButton:
             self._drag_start = None
             self.setCursor(Qt.ArrowCursor)
+            if self.sync_record_position():
+                self.notify_modified('position')
             event.accept()
         else:
             event.ignore()
 
     def updateConnectedEdges(self):
         """Update all edges connected to this node's input/output circles"""
-        # Update input circle
-        if self.input_circle and hasattr(self.input_circle, 'connected_edges'):
-            for edge in self.input_circle.connected_edges:
-                edge.updateFromNodes()
+        edges = []
         
-        # Update all output circles
-        for circle in self.output_circles:
-            if hasattr(circle, 'connected_edges'):
-                for edge in circle.connected_edges:
-                    edge.updateFromNodes()
-
-    def updateConnectionTracking(self):
-        """Update input_connected_node and output_connected_nodes based on current edges"""
-        # Reset connections
-        self.input_connected_node = None
-        self.output_connected_nodes = []
-        
-        # Check input circle connections
+        # Input circle
         if self.input_circle and hasattr(self.input_circle, 'connected_edges'):
-            for edge in self.input_circle.connected_edges:
-                if edge.start_circle == self.input_circle:
-                    # This input is the start of the edge, find the end node
-                    if edge.end_circle and hasattr(edge.end_circle, 'parentItem'):
-                        parent_node = edge.end_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.input_connected_node = parent_node.name
-                            break
-                elif edge.end_circle == self.input_circle:
-                    # This input is the end of the edge, find the start node
-                    if edge.start_circle and hasattr(edge.start_circle, 'parentItem'):
-                        parent_node = edge.start_circle.parentItem()
-                        if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                            self.input_connected_node = parent_node.name
-                            break
+            edges.extend(self.input_circle.connected_edges)
         
-        # Check all output circles connections
+        # All output circles
         for circle in self.output_circles:
             if hasattr(circle, 'connected_edges'):
-                for edge in circle.connected_edges:
-                    if edge.start_circle == circle:
-                        # This output is the start of the edge, find the end node
-                        if edge.end_circle and hasattr(edge.end_circle, 'parentItem'):
-                            parent_node = edge.end_circle.parentItem()
-                            if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                                if parent_node.name not in self.output_connected_nodes:
-                                    self.output_connected_nodes.append(parent_node.name)
-                    elif edge.end_circle == circle:
-                        # This output is the end of the edge, find the start node
-                        if edge.start_circle and hasattr(edge.start_circle, 'parentItem'):
-                            parent_node = edge.start_circle.parentItem()
-                            if isinstance(parent_node, (NodeScene, StartNode, BranchNode)):
-                                if parent_node.name not in self.output_connected_nodes:
-                                    self.output_connected_nodes.append(parent_node.name)
+                edges.extend(circle.connected_edges)
+        
+        self.schedule_edge_updates(edges)
 
     def show_context_menu(self, screen_pos):
         """Show context menu with Edit, Add/Remove Output, and Delete options"""
@@ -1359,45 +1401,11 @@ class BranchNode(QGraphicsRectItem):
         current_count = len(self.output_circles)
         new_count = current_count + 1
         
-        # Store connections before resizing
-        connections = []
-        for i, circle in enumerate(self.output_circles):
-            if hasattr(circle, 'connected_edges'):
-                for edge in circle.connected_edges:
-                    connections.append((i, edge))
-        
-        # Store input connections separately
-        input_connections = []
-        if hasattr(self.input_circle, 'connected_edges'):
-            input_connections = self.input_circle.connected_edges[:]
-        
-        # Resize node and recreate circles
+        # Resize node and recreate circles; edges move to the new circles
         self.resize_node_for_outputs(new_count)
         
-        # Restore input connections
-        if input_connections:
-            if not hasattr(self.input_circle, 'connected_edges'):
-                self.input_circle.connected_edges = []
-            self.input_circle.connected_edges = input_connections
-            
-            # Update input edges
-            for edge in input_connections:
-                if hasattr(edge, 'updateFromNodes'):
-                    edge.updateFromNodes()
-        
-        # Restore output connections
-        for original_index, edge in connections:
-            if original_index < len(self.output_circles):
-                circle = self.output_circles[original_index]
-                if not hasattr(circle, 'connected_edges'):
-                    circle.connected_edges = []
-                circle.connected_edges.append(edge)
-                
-                # Update edge references
-                if edge.start_circle in self.output_circles or edge.end_circle in self.output_circles:
-                    edge.updateFromNodes()
-        
-        print(f"Added output. Total: {len(self.output_circles)}")
+        logger.debug("Added output. Total: %s", len(self.output_circles))
+        self.notify_modified('ports')
         
         # Update scene
         if self.scene():
@@ -1420,19 +1428,6 @@ class BranchNode(QGraphicsRectItem):
         current_count = len(self.output_circles)
         new_count = current_count - 1
         
-        # Store connections from remaining circles (excluding the last one)
-        connections = []
-        for i in range(new_count):  # Only save connections for remaining circles
-            circle = self.output_circles[i]
-            if hasattr(circle, 'connected_edges'):
-                for edge in circle.connected_edges:
-                    connections.append((i, edge))
-        
-        # Store input connections separately
-        input_connections = []
-        if hasattr(self.input_circle, 'connected_edges'):
-            input_connections = self.input_circle.connected_edges[:]
-        
         # Remove connections from the last circle
         last_circle = self.output_circles[-1]
         if hasattr(last_circle, 'connected_edges'):
@@ -1441,33 +1436,11 @@ class BranchNode(QGraphicsRectItem):
                 if edge.scene():
                     edge.scene().removeItem(edge)
         
-        # Resize node and recreate circles
+        # Resize node and recreate circles; edges of the remaining outputs move to the new circles
         self.resize_node_for_outputs(new_count)
         
-        # Restore input connections
-        if input_connections:
-            if not hasattr(self.input_circle, 'connected_edges'):
-                self.input_circle.connected_edges = []
-            self.input_circle.connected_edges = input_connections
-            
-            # Update input edges
-            for edge in input_connections:
-                if hasattr(edge, 'updateFromNodes'):
-                    edge.updateFromNodes()
-        
-        # Restore connections for remaining circles
-        for original_index, edge in connections:
-            if original_index < len(self.output_circles):
-                circle = self.output_circles[original_index]
-                if not hasattr(circle, 'connected_edges'):
-                    circle.connected_edges = []
-                circle.connected_edges.append(edge)
-                
-                # Update edge references
-                if edge.start_circle in self.output_circles or edge.end_circle in self.output_circles:
-                    edge.updateFromNodes()
-        
-        print(f"Removed output. Total: {len(self.output_circles)}")
+        logger.debug("Removed output. Total: %s", len(self.output_circles))
+        self.notify_modified('ports')
         
         # Update scene
         if self.scene():
@@ -1488,13 +1461,13 @@ class BranchNode(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
             break
         
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Create new branch node at offset position
             offset = 150
             new_x = self.pos().x() + offset
@@ -1518,7 +1491,7 @@ class BranchNode(QGraphicsRectItem):
             
             # Add to scene and node list
             scene.addItem(new_node)
-            main_window.node_items.append(new_node)
+            main_window.register_node(new_node)
             
             # Update scene rect to include new node
             node_rect = new_node.sceneBoundingRect()
@@ -1532,7 +1505,7 @@ class BranchNode(QGraphicsRectItem):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Duplicated branch node '{self.name}' as '{new_node.name}'", 3000)
             
-            print(f"Duplicated branch node '{self.name}' as '{new_node.name}' at position ({new_x}, {new_y})")
+            logger.debug("Duplicated branch node '%s' as '%s' at position (%s, %s)", self.name, new_node.name, new_x, new_y)
 
     def delete_node(self):
         """Delete this node and clean up all connections"""
@@ -1540,7 +1513,7 @@ class BranchNode(QGraphicsRectItem):
         if not scene:
             return
         
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = None
         for view in scene.views():
             main_window = view.window()
@@ -1564,9 +1537,8 @@ class BranchNode(QGraphicsRectItem):
             scene.removeItem(edge)
         
         # Remove node from main window's node list
-        if main_window and hasattr(main_window, 'node_items'):
-            if self in main_window.node_items:
-                main_window.node_items.remove(self)
+        if main_window and hasattr(main_window, 'register_node'):
+            main_window.unregister_node(self)
         
         # Remove node from scene
         scene.removeItem(self)
@@ -1575,7 +1547,7 @@ class BranchNode(QGraphicsRectItem):
         if main_window and hasattr(main_window, 'status_bar'):
             main_window.status_bar.showMessage(f"Deleted branch node '{self.name}'", 3000)
         
-        print(f"Deleted branch node '{self.name}' and cleaned up all connections")
+        logger.debug("Deleted branch node '%s' and cleaned up all connections", self.name)
 
     def open_form(self):
         """Open form dialog to edit branch node data (same as NodeScene but for BranchNode)"""
@@ -1657,7 +1629,7 @@ class BranchNode(QGraphicsRectItem):
                         new_height = min(new_height, max_height)
                         
                         form.resize(form.width(), new_height)
-                        print(f"Restored {total_rows} rows and resized form to: {form.width()}x{new_height}")
+                        logger.debug("Restored %s rows and resized form to: %sx%s", total_rows, form.width(), new_height)
                 else:
                     # No existing data - start with empty form for BranchNode
                     form.name_input.setText(self.name)
@@ -1671,33 +1643,12 @@ class BranchNode(QGraphicsRectItem):
                     # Store ALL form data in node
                     self.node_data = data
                     
-                    # Update node name
+                    # Update node name (through the main window so the registry stays in sync)
                     if data['name']:
-                        self.name = data['name']
+                        main_window.rename_node(self, data['name'])
                     
-                    print(f"Saved complete form data to BranchNode '{self.name}':")
-                    print(f"  Name: {data.get('name', 'None')}")
-                    print(f"  In Scene: {data.get('in_scene', 'None')}")
-                    print(f"  Out Scene: {data.get('out_scene', 'None')}")
-                    print(f"  Background: {data.get('background', 'None')}")
-                    print(f"  Total Items: {len(data.get('items', []))}")
-                    print(f"  Dialogs: {len(data.get('dialogs', []))}")
-                    print(f"  Actions: {len(data.get('actions', []))}")
-                    
-                    # Print connection information for BranchNode
-                    print(f"  Input Connected to: {self.input_connected_node if self.input_connected_node else 'None'}")
-                    print(f"  Outputs Connected to: {', '.join(self.output_connected_nodes) if self.output_connected_nodes else 'None'}")
-                    print(f"  Total Output Connections: {len(self.output_connected_nodes)}")
-                    
-                    # Print detailed items
-                    for item in data.get('items', []):
-                        if item['type'] == 'dialog':
-                            parentheticals = f" {item['parentheticals']}" if item.get('parentheticals') else ""
-                            print(f"    {item['order']}. Dialog - {item['character']}{parentheticals}: {item['text']}")
-                        else:
-                            print(f"    {item['order']}. Action - {item['text']}")
+                    log_saved_form_data(self, data)
+                    self.notify_modified('data')
                     
                     # Force redraw to show updated name
                     scene.update()
-                    
-                    print(f"BranchNode data successfully stored. Total data size: {len(str(self.node_data))} characters")
@@ -0,0 +1,30 @@
+"""
+Logging setup for Visual Novel Node Editor
+Modules log through logging.getLogger(__name__); the level is configured once at startup
+"""
+
+import logging
+import os
+
+LOG_LEVEL_ENV = 'VN_EDITOR_LOG_LEVEL'
+DEFAULT_LOG_LEVEL = logging.WARNING
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def configure_logging(level=None):
+    """Configure the root logger.
+
+    level may be a logging constant or a name such as "DEBUG". When omitted the
+    VN_EDITOR_LOG_LEVEL environment variable is used, falling back to WARNING so
+    production runs skip formatting of debug/info messages entirely.
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.strip().upper())
+        if not isinstance(level, int):
+            level = DEFAULT_LOG_LEVEL
+
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    logging.getLogger().setLevel(level)
+    return level
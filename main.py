@@ -9,6 +9,11 @@ import time
 import json
 import os
 import csv
+import logging
+
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
 
 # PDF generation imports
 try:
@@ -200,7 +205,7 @@ class InputOutputCircle(QGraphicsEllipseItem):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Created and connected new node '{new_node.name}'", 3000)
             
-            print(f"Auto-created node '{new_node.name}' and connected via {self.point_type} circle")
+            logger.debug("Auto-created node '%s' and connected via %s circle", new_node.name, self.point_type)
 
 
 class EdgeGraphicsItem(QGraphicsPathItem):
@@ -511,7 +516,7 @@ class NodeScene(QGraphicsRectItem):
                         new_height = min(new_height, max_height)
                         
                         form.resize(form.width(), new_height)
-                        print(f"Restored {total_rows} rows and resized form to: {form.width()}x{new_height}")
+                        logger.debug("Restored %s rows and resized form to: %sx%s", total_rows, form.width(), new_height)
                 else:
                     # No existing data - start with empty form (NodeScene)
                     form.name_input.setText(self.name)
@@ -529,31 +534,32 @@ class NodeScene(QGraphicsRectItem):
                     if data['name']:
                         self.name = data['name']
                     
-                    print(f"Saved complete form data to node '{self.name}':")
-                    print(f"  Name: {data.get('name', 'None')}")
-                    print(f"  In Scene: {data.get('in_scene', 'None')}")
-                    print(f"  Out Scene: {data.get('out_scene', 'None')}")
-                    print(f"  Background: {data.get('background', 'None')}")
-                    print(f"  Total Items: {len(data.get('items', []))}")
-                    print(f"  Dialogs: {len(data.get('dialogs', []))}")
-                    print(f"  Actions: {len(data.get('actions', []))}")
+                    logger.debug("Saved complete form data to node '%s':", self.name)
+                    logger.debug("  Name: %s", data.get('name', 'None'))
+                    logger.debug("  In Scene: %s", data.get('in_scene', 'None'))
+                    logger.debug("  Out Scene: %s", data.get('out_scene', 'None'))
+                    logger.debug("  Background: %s", data.get('background', 'None'))
+                    logger.debug("  Total Items: %s", len(data.get('items', [])))
+                    logger.debug("  Dialogs: %s", len(data.get('dialogs', [])))
+                    logger.debug("  Actions: %s", len(data.get('actions', [])))
                     
                     # Print connection information
-                    print(f"  Input Connected to: {self.input_connected_node if self.input_connected_node else 'None'}")
-                    print(f"  Output Connected to: {self.output_connected_node if self.output_connected_node else 'None'}")
+                    logger.debug("  Input Connected to: %s", self.input_connected_node if self.input_connected_node else 'None')
+                    logger.debug("  Output Connected to: %s", self.output_connected_node if self.output_connected_node else 'None')
                     
-                    # Print detailed items
-                    for item in data.get('items', []):
-                        if item['type'] == 'dialog':
-                            parentheticals = f" {item['parentheticals']}" if item.get('parentheticals') else ""
-                            print(f"    {item['order']}. Dialog - {item['character']}{parentheticals}: {item['text']}")
-                        else:
-                            print(f"    {item['order']}. Action - {item['text']}")
+                    # Log detailed items only when DEBUG is on
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for item in data.get('items', []):
+                            if item['type'] == 'dialog':
+                                parentheticals = f" {item['parentheticals']}" if item.get('parentheticals') else ""
+                                logger.debug("    %s. Dialog - %s%s: %s", item['order'], item['character'], parentheticals, item['text'])
+                            else:
+                                logger.debug("    %s. Action - %s", item['order'], item['text'])
                     
                     # Force redraw to show updated name
                     scene.update()
                     
-                    print(f"Node data successfully stored. Total data size: {len(str(self.node_data))} characters")
+                    logger.debug("Node data successfully stored. Total data size: %s characters", len(str(self.node_data)))
 
     def mouseMoveEvent(self, event):
         if hasattr(self, '_drag_start') and self._drag_start is not None:
@@ -885,7 +891,7 @@ class StartNode(QGraphicsRectItem):
                         new_height = min(new_height, max_height)
                         
                         form.resize(form.width(), new_height)
-                        print(f"Restored {total_rows} rows and resized form to: {form.width()}x{new_height}")
+                        logger.debug("Restored %s rows and resized form to: %sx%s", total_rows, form.width(), new_height)
                 else:
                     # No existing data - start with empty form for StartNode
                     form.name_input.setText(self.name)
@@ -903,30 +909,31 @@ class StartNode(QGraphicsRectItem):
                     if data['name']:
                         self.name = data['name']
                     
-                    print(f"Saved complete form data to StartNode '{self.name}':")
-                    print(f"  Name: {data.get('name', 'None')}")
-                    print(f"  In Scene: {data.get('in_scene', 'None')}")
-                    print(f"  Out Scene: {data.get('out_scene', 'None')}")
-                    print(f"  Background: {data.get('background', 'None')}")
-                    print(f"  Total Items: {len(data.get('items', []))}")
-                    print(f"  Dialogs: {len(data.get('dialogs', []))}")
-                    print(f"  Actions: {len(data.get('actions', []))}")
+                    logger.debug("Saved complete form data to StartNode '%s':", self.name)
+                    logger.debug("  Name: %s", data.get('name', 'None'))
+                    logger.debug("  In Scene: %s", data.get('in_scene', 'None'))
+                    logger.debug("  Out Scene: %s", data.get('out_scene', 'None'))
+                    logger.debug("  Background: %s", data.get('background', 'None'))
+                    logger.debug("  Total Items: %s", len(data.get('items', [])))
+                    logger.debug("  Dialogs: %s", len(data.get('dialogs', [])))
+                    logger.debug("  Actions: %s", len(data.get('actions', [])))
                     
                     # Print connection information (StartNode has no input)
-                    print(f"  Input Connected to: None (Start node has no input)")
-                    print(f"  Output Connected to: {self.output_connected_node if self.output_connected_node else 'None'}")
+                    logger.debug("  Input Connected to: None (Start node has no input)")
+                    logger.debug("  Output Connected to: %s", self.output_connected_node if self.output_connected_node else 'None')
                     
-                    # Print detailed items
-                    for item in data.get('items', []):
-                        if item['type'] == 'dialog':
-                            print(f"    {item['order']}. Dialog - {item['character']}: {item['text']}")
-                        else:
-                            print(f"    {item['order']}. Action - {item['text']}")
+                    # Log detailed items only when DEBUG is on
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for item in data.get('items', []):
+                            if item['type'] == 'dialog':
+                                logger.debug("    %s. Dialog - %s: %s", item['order'], item['character'], item['text'])
+                            else:
+                                logger.debug("    %s. Action - %s", item['order'], item['text'])
                     
                     # Force redraw to show updated name
                     scene.update()
                     
-                    print(f"StartNode data successfully stored. Total data size: {len(str(self.node_data))} characters")
+                    logger.debug("StartNode data successfully stored. Total data size: %s characters", len(str(self.node_data)))
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -1340,22 +1347,23 @@ class MainWindow(QMainWindow):
                 start_node = node
                 break
         
-        print(f"Found StartNode: {start_node.name if start_node else 'None'}")
+        logger.debug("Found StartNode: %s", start_node.name if start_node else 'None')
         
         if not start_node:
             return sequence
         
-        # Debug: Print all nodes and their connections
-        print("=== ALL NODES DEBUG ===")
-        for i, node in enumerate(self.node_items):
-            print(f"Node {i}: {node.name} (type: {type(node).__name__})")
-            print(f"  Input connected to: {getattr(node, 'input_connected_node', 'N/A')}")
-            print(f"  Output connected to: {getattr(node, 'output_connected_node', 'N/A')}")
-            print(f"  Has node_data: {bool(getattr(node, 'node_data', None))}")
-            if hasattr(node, 'node_data') and node.node_data:
-                items_count = len(node.node_data.get('items', []))
-                print(f"  Node data items: {items_count}")
-        print("=== END DEBUG ===")
+        # Debug: Log all nodes and their connections (skipped entirely unless DEBUG is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== ALL NODES DEBUG ===")
+            for i, node in enumerate(self.node_items):
+                logger.debug("Node %s: %s (type: %s)", i, node.name, type(node).__name__)
+                logger.debug("  Input connected to: %s", getattr(node, 'input_connected_node', 'N/A'))
+                logger.debug("  Output connected to: %s", getattr(node, 'output_connected_node', 'N/A'))
+                logger.debug("  Has node_data: %s", bool(getattr(node, 'node_data', None)))
+                if hasattr(node, 'node_data') and node.node_data:
+                    items_count = len(node.node_data.get('items', []))
+                    logger.debug("  Node data items: %s", items_count)
+            logger.debug("=== END DEBUG ===")
         
         # Traverse from start node following connections
         visited = set()
@@ -1364,7 +1372,7 @@ class MainWindow(QMainWindow):
         while current and current not in visited:
             visited.add(current)
             sequence.append(current)
-            print(f"Added to sequence: {current.name} (output_connected_node: {current.output_connected_node})")
+            logger.debug("Added to sequence: %s (output_connected_node: %s)", current.name, current.output_connected_node)
             
             # Find next connected node through output
             next_node = None
@@ -1372,25 +1380,25 @@ class MainWindow(QMainWindow):
                 for node in self.node_items:
                     if node.name == current.output_connected_node:
                         next_node = node
-                        print(f"Found next node: {next_node.name}")
+                        logger.debug("Found next node: %s", next_node.name)
                         break
                 if not next_node:
-                    print(f"Could not find node with name: {current.output_connected_node}")
+                    logger.warning("Could not find node with name: %s", current.output_connected_node)
             else:
-                print(f"Node {current.name} has no output connection")
+                logger.debug("Node %s has no output connection", current.name)
             
             current = next_node
         
-        print(f"Final sequence length: {len(sequence)}")
+        logger.debug("Final sequence length: %s", len(sequence))
         return sequence
     
     def update_all_connections(self):
         """Update connection tracking for all nodes to ensure current data"""
         updated_count = 0
-        print("=== UPDATING CONNECTIONS ===")
+        logger.debug("=== UPDATING CONNECTIONS ===")
         for node in self.node_items:
             if isinstance(node, (NodeScene, StartNode)):
-                print(f"Updating connections for: {node.name}")
+                logger.debug("Updating connections for: %s", node.name)
                 old_input = getattr(node, 'input_connected_node', None)
                 old_output = getattr(node, 'output_connected_node', None)
                 
@@ -1400,13 +1408,13 @@ class MainWindow(QMainWindow):
                 new_input = getattr(node, 'input_connected_node', None)
                 new_output = getattr(node, 'output_connected_node', None)
                 
-                print(f"  Input: {old_input} -> {new_input}")
-                print(f"  Output: {old_output} -> {new_output}")
+                logger.debug("  Input: %s -> %s", old_input, new_input)
+                logger.debug("  Output: %s -> %s", old_output, new_output)
         
-        print("=== CONNECTION UPDATE COMPLETE ===")
+        logger.debug("=== CONNECTION UPDATE COMPLETE ===")
         # Show status message
         self.status_bar.showMessage(f"Updated connection data for {updated_count} nodes", 2000)
-        print(f"Updated connection tracking for {updated_count} nodes before export")
+        logger.debug("Updated connection tracking for %s nodes before export", updated_count)
     
     def export_connected_nodes_text(self):
         """Export connected nodes data as screenplay format"""
@@ -1718,10 +1726,10 @@ class MainWindow(QMainWindow):
                     
                     thai_font = 'Sarabun'
                     thai_font_bold = 'Sarabun-Bold'
-                    print("Thai fonts (Sarabun) registered successfully")
+                    logger.info("Thai fonts (Sarabun) registered successfully")
                 except Exception as e:
-                    print(f"Could not register Thai fonts: {e}")
-                    print("Using default fonts instead")
+                    logger.warning("Could not register Thai fonts: %s", e)
+                    logger.info("Using default fonts instead")
                     thai_font = 'Helvetica'
                     thai_font_bold = 'Helvetica-Bold'
                 
@@ -1961,10 +1969,11 @@ class MainWindow(QMainWindow):
         # Show status message
         self.status_bar.showMessage("Default Start node created - Right-click to add more nodes", 3000)
         
-        print(f"Created default Start node at position ({start_x}, {start_y})")
+        logger.debug("Created default Start node at position (%s, %s)", start_x, start_y)
 
 
 if __name__ == "__main__":
+    configure_logging()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
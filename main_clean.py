@@ -4,13 +4,20 @@ Clean and organized main application file
 """
 
 import sys
+import logging
 from PySide6.QtWidgets import QApplication
 from main_window import MainWindow
 from font_manager import font_manager
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
 
 
 def main():
     """Main application entry point"""
+    # WARNING by default; set VN_EDITOR_LOG_LEVEL=DEBUG for verbose traces
+    configure_logging()
+    
     app = QApplication(sys.argv)
     app.setApplicationName("Visual Novel Node Editor")
     app.setApplicationVersion("2.0")
@@ -19,17 +26,17 @@ def main():
     # Initialize font manager and register fonts for GUI
     try:
         fonts_added = font_manager.register_qt_fonts()
-        print(f"Initialized font manager - {fonts_added} fonts added to Qt")
+        logger.info("Initialized font manager - %s fonts added to Qt", fonts_added)
         
         # Show available Thai fonts
         thai_fonts = font_manager.get_available_thai_fonts()
         if thai_fonts:
-            print(f"Available Thai fonts: {', '.join(thai_fonts)}")
+            logger.info("Available Thai fonts: %s", ', '.join(thai_fonts))
         else:
-            print("No Thai fonts detected in system")
+            logger.warning("No Thai fonts detected in system")
             
     except Exception as e:
-        print(f"Font initialization warning: {e}")
+        logger.warning("Font initialization warning: %s", e)
     
     # Create and show main window
     window = MainWindow()
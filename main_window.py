@@ -4,31 +4,49 @@ Contains MainWindow class with all UI functionality and scene management
 """
 
 import sys
-import time
-import json
 import os
+import time
+import logging
 from PySide6.QtWidgets import (QMainWindow, QMenuBar, QMenu, QFileDialog, QMessageBox, 
-                               QGraphicsScene, QStatusBar, QApplication)
-from PySide6.QtCore import Qt, QTimer, QEvent
+                               QStatusBar, QApplication, QLabel, QProgressDialog)
+from PySide6.QtCore import Qt, QTimer, QEvent, QStandardPaths
 from PySide6.QtGui import QAction, QColor
 
 # Import our custom modules
-from views import NodeGraphicsView
-from graphics_items import NodeScene, StartNode, EdgeGraphicsItem
+from views import NodeGraphicsView, GraphScene
+from graphics_items import NodeScene, StartNode, BranchNode, EdgeGraphicsItem
 from export_manager import ExportManager
+from graph_model import GraphModel
+from project_loader import ProjectLoadThread
+from project_binary import PROJECT_BINARY_EXT, is_binary_project
+from form_cache import BinaryFormSource
+from project_writer import autosave_path, commit_temp
+from project_saver import ProjectSaveThread
+from project_store import ProjectStore, PROJECT_STORE_EXT, is_store_project
+from graph_validator import GraphValidator
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+AUTOSAVE_INTERVAL_MS = 60 * 1000
+# Quiet time after an edit before the whole-graph validation checks rerun
+VALIDATION_DELAY_MS = 250
+
+PROJECT_FILE_FILTER = (f"JSON Files (*.json);;Binary Project (*{PROJECT_BINARY_EXT});;"
+                       f"Project Database (*{PROJECT_STORE_EXT});;All Files (*)")
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("Visual Novel Node Editor")
+        self.setWindowTitle("Visual Novel Node Editor[*]")
         self.showMaximized()
         self.setMinimumSize(800, 600)
         self.setWindowState(Qt.WindowMaximized)
         self.setWindowFlags(Qt.Window | Qt.CustomizeWindowHint | Qt.WindowMinMaxButtonsHint | Qt.WindowCloseButtonHint)
 
         # Scene and view setup
-        self.scene = QGraphicsScene()
+        self.scene = GraphScene()
         self.view = NodeGraphicsView(self.scene)
         self.setCentralWidget(self.view)
         self.scene.setSceneRect(0, 0, self.width(), self.height())
@@ -36,8 +54,18 @@ class MainWindow(QMainWindow):
         # Enable focus for key events
         self.view.setFocusPolicy(Qt.StrongFocus)
 
-        # Node tracking
-        self.node_items = []
+        # Headless story graph; node items are views bound to its records, and
+        # its id/name indexed registry is the one place nodes are tracked
+        self.graph = GraphModel()
+
+        # Open project database, if any; edits are written to it as they happen
+        self.project_store = None
+        self.scene.node_changed.connect(self.on_node_changed)
+        self.scene.edges_changed.connect(self.on_edges_changed)
+
+        # Binary projects keep only node headings in memory; forms are paged in
+        # from the file through this LRU-bounded source
+        self.form_source = None
 
         # Mouse handling setup
         self.view.setMouseTracking(True)
@@ -49,19 +77,237 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_bar.showMessage("Ready - Right-click to show context menu, double-click to edit nodes")
         
-        # Update status bar periodically
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(2000)  # Update every 2 seconds
+        # Graph counters live in a permanent label, refreshed only when they change
+        self.status_label = QLabel()
+        self.status_bar.addPermanentWidget(self.status_label)
+        self._status_update_pending = False
+        self.scene.edge_count_changed.connect(self.request_status_update)
+        self.view.zoom_changed.connect(self.request_status_update)
 
         # Export manager
         self.export_manager = ExportManager(self)
 
+        # Background project loading (see load_project)
+        self._project_loader = None
+        self._load_progress = None
+        self._load_records = {}   # saved node id -> NodeRecord
+        self._pending_edges = []  # edges whose nodes have not arrived yet
+
         # Menu bar actions
         self.initMenuBar()
         
+        # Dirty tracking: every graph edit bumps a change counter; saves and
+        # autosaves remember the counter value they wrote
+        self.project_file = None
+        self._change_count = 0
+        self._saved_change_count = 0
+        self._autosaved_change_count = 0
+        self._save_thread = None
+        self._autosave_thread = None
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setInterval(AUTOSAVE_INTERVAL_MS)
+        self._autosave_timer.timeout.connect(self.autosave)
+        self._autosave_timer.start()
+
+        # Validation: node-local checks run on each edit, whole-graph checks once edits settle
+        self.graph_validator = GraphValidator(self.graph)
+        self._flagged_records = set()   # records whose nodes are currently highlighted
+        self._validation_issue_count = 0
+        self._validation_timer = QTimer(self)
+        self._validation_timer.setSingleShot(True)
+        self._validation_timer.setInterval(VALIDATION_DELAY_MS)
+        self._validation_timer.timeout.connect(self.run_validation)
+
         # Create default start node
         self.create_default_start_node()
+        self.reset_change_tracking()
+        
+        # Offer to restore an untitled session that ended without being saved
+        QTimer.singleShot(0, self.offer_autosave_recovery)
+
+    def register_node(self, node):
+        """Add a node that was placed in the scene to the graph model"""
+        if node.record not in self.graph.nodes:
+            self.graph.add_node(node.record)
+        if self._project_loader is None:
+            self.mark_dirty()
+            if self.project_store:
+                self.project_store.save_node(node.record)
+            self.graph_validator.node_changed(node.record)
+            self.schedule_validation()
+        self.request_status_update()
+
+    def unregister_node(self, node):
+        """Remove a node from the graph model"""
+        self.graph.remove_node(node.record)
+        self.mark_dirty()
+        if self.project_store:
+            self.project_store.delete_node(node.record)
+        self.graph_validator.node_removed(node.record)
+        self._flagged_records.discard(node.record)
+        self.schedule_validation()
+        self.request_status_update()
+
+    def on_node_changed(self, node, aspect):
+        """Track a node's form edit, move or output change and write it to the open project database"""
+        if node.record not in self.graph.nodes:
+            return
+        self.mark_dirty()
+        if self.project_store:
+            if aspect == 'position':
+                self.project_store.save_position(node.record)
+            else:
+                self.project_store.save_node(node.record)
+        if aspect != 'position':
+            self.graph_validator.node_changed(node.record)
+            self.schedule_validation()
+
+    def on_edges_changed(self, source_record):
+        """Track a change to a node's outgoing edges and write them to the open project database"""
+        if self._project_loader is not None or source_record not in self.graph.nodes:
+            return
+        self.mark_dirty()
+        if self.project_store:
+            self.project_store.save_edges(source_record)
+        self.graph_validator.edges_changed(source_record)
+        self.schedule_validation()
+
+    def schedule_validation(self):
+        """Rerun the whole-graph validation checks once the current burst of edits settles"""
+        if self._project_loader is None:
+            self._validation_timer.start()
+
+    def revalidate_graph(self):
+        """Validate the whole graph from scratch (after it was cleared, replaced or loaded)"""
+        self._flagged_records = set()
+        self.graph_validator.validate()
+        self.run_validation()
+
+    def run_validation(self):
+        """Bring validation results up to date and move the highlights to the affected nodes"""
+        if self._project_loader is not None:
+            return
+        self._validation_timer.stop()
+        self._validation_issue_count = len(self.graph_validator.refresh())
+        messages = self.graph_validator.issues_by_record()
+
+        for record in self._flagged_records - messages.keys():
+            if record.view is not None:
+                record.view.set_validation_messages(())
+        for record, record_messages in messages.items():
+            node = record.view
+            if node is not None and node.validation_messages != tuple(record_messages):
+                node.set_validation_messages(record_messages)
+        self._flagged_records = set(messages)
+        self.request_status_update()
+
+    def mark_dirty(self):
+        """Record one graph edit since the last save"""
+        self._change_count += 1
+        if self.project_store:
+            # The project database commits every edit as it is made
+            self._saved_change_count = self._change_count
+            self._autosaved_change_count = self._change_count
+        self.setWindowModified(self._change_count != self._saved_change_count)
+
+    def reset_change_tracking(self):
+        """Treat the current graph as saved (after load, new graph or save)"""
+        self._saved_change_count = self._change_count
+        self._autosaved_change_count = self._change_count
+        self.setWindowModified(False)
+
+    def untitled_autosave_file(self):
+        """Autosave of a graph that was never saved, in the app data folder"""
+        folder = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        return autosave_path(os.path.join(folder, 'untitled.json'))
+
+    def autosave_file(self):
+        """Autosave target: beside the project file, or in the app data folder when untitled"""
+        if self.project_file:
+            return autosave_path(self.project_file)
+        file_name = self.untitled_autosave_file()
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        return file_name
+
+    def offer_autosave_recovery(self, project_file=None):
+        """Offer to restore unsaved work from an autosave; returns True when it is being loaded.
+
+        The autosave of project_file counts only when it is newer than the
+        project; without project_file the untitled autosave is checked. A
+        declined autosave is deleted.
+        """
+        autosave_file = autosave_path(project_file) if project_file else self.untitled_autosave_file()
+        if not os.path.exists(autosave_file):
+            return False
+        if project_file and os.path.exists(project_file) and os.path.getmtime(autosave_file) <= os.path.getmtime(project_file):
+            return False
+        
+        saved_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(os.path.getmtime(autosave_file)))
+        name = os.path.basename(project_file) if project_file else "an untitled graph"
+        reply = QMessageBox.question(self, "Recover Autosave",
+                                   f"Unsaved changes to {name} were autosaved at {saved_at}.\n\nRecover them?",
+                                   QMessageBox.Yes | QMessageBox.No,
+                                   QMessageBox.Yes)
+        if reply == QMessageBox.Yes:
+            self.load_project(project_file, autosave_file)
+            return True
+        try:
+            os.remove(autosave_file)
+        except OSError as e:
+            logger.warning("Could not remove autosave %s: %s", autosave_file, e)
+        return False
+
+    def autosave(self):
+        """Write a snapshot on a worker thread, only if something changed since the last autosave"""
+        if (self._change_count == self._autosaved_change_count or self.project_store
+                or self._project_loader is not None or self._autosave_thread is not None):
+            return
+        
+        # Snapshot on the GUI thread (cheap dict building, forms left in the project file);
+        # encoding and writing run on the worker
+        thread = ProjectSaveThread(self.graph.to_dict(paged_forms=True), self.autosave_file(), self,
+                                   form_file=self.form_file())
+        thread.change_count = self._change_count
+        thread.saved.connect(self._on_autosaved)
+        thread.failed.connect(self._on_autosave_failed)
+        thread.finished.connect(thread.deleteLater)
+        self._autosave_thread = thread
+        thread.start()
+
+    def _on_autosaved(self, file_name, size):
+        change_count = self.sender().change_count
+        self._autosaved_change_count = max(self._autosaved_change_count, change_count)
+        self._autosave_thread = None
+        if file_name != self.autosave_file() or change_count <= self._saved_change_count:
+            # A manual save or another project took over while this autosave was written
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            return
+        self.status_bar.showMessage(f"Autosaved to {os.path.basename(file_name)}", 3000)
+
+    def _on_autosave_failed(self, message):
+        self._autosave_thread = None
+        self.status_bar.showMessage(f"Autosave failed: {message}", 5000)
+
+    def form_file(self):
+        """Binary project that paged-in forms are read from, or None"""
+        return self.form_source.file_name if self.form_source is not None else None
+
+    def close_form_source(self):
+        """Release the project file used for on-demand form data"""
+        if self.form_source is not None:
+            self.form_source.close()
+            self.form_source = None
+
+    def close_project_store(self):
+        """Stop writing edits to the project database"""
+        if self.project_store:
+            self.project_store.close()
+            self.project_store = None
+
+    def rename_node(self, node, new_name):
+        """Rename a node and keep the graph's name index in sync"""
+        self.graph.rename_node(node.record, new_name)
 
     def initMenuBar(self):
         """Initialize menu bar with all actions"""
@@ -119,6 +365,15 @@ class MainWindow(QMainWindow):
         export_pdf_action.triggered.connect(self.export_manager.export_as_pdf)
         export_menu.addAction(export_pdf_action)
         
+        # Export every playthrough separately
+        export_routes_action = QAction("Export Routes as Text...", self)
+        export_routes_action.triggered.connect(self.export_manager.export_routes_as_text)
+        export_menu.addAction(export_routes_action)
+
+        export_routes_pdf_action = QAction("Export Routes as PDF...", self)
+        export_routes_pdf_action.triggered.connect(self.export_manager.export_routes_as_pdf)
+        export_menu.addAction(export_routes_pdf_action)
+        
         file_menu.addSeparator()
         
         # Exit action
@@ -169,8 +424,14 @@ class MainWindow(QMainWindow):
                                    QMessageBox.No)
         
         if reply == QMessageBox.Yes:
+            self.close_project_store()
             self.scene.clear()
-            self.node_items.clear()
+            self.graph.clear()
+            self.revalidate_graph()
+            self.close_form_source()
+            self.project_file = None
+            self.reset_change_tracking()
+            self.request_status_update()
             # Reset scene to default size
             self.scene.setSceneRect(0, 0, self.width(), self.height())
             # Create new default start node
@@ -182,6 +443,7 @@ class MainWindow(QMainWindow):
             factor = self.view._zoom_step
             self.view._zoom *= factor
             self.view.scale(factor, factor)
+            self.request_status_update()
 
     def zoom_out(self):
         """Zoom out the view"""
@@ -189,6 +451,7 @@ class MainWindow(QMainWindow):
             factor = 1 / self.view._zoom_step
             self.view._zoom *= factor
             self.view.scale(factor, factor)
+            self.request_status_update()
 
     def zoom_reset(self):
         """Reset zoom to 100%"""
@@ -197,6 +460,7 @@ class MainWindow(QMainWindow):
             factor = 1 / current_zoom
             self.view._zoom = 1.0
             self.view.scale(factor, factor)
+            self.request_status_update()
 
     def show_controls(self):
         """Show controls help dialog"""
@@ -267,164 +531,355 @@ class MainWindow(QMainWindow):
     def import_json(self):
         """Import complete node graph from JSON file"""
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getOpenFileName(self, "Load Node Graph", "", "JSON Files (*.json);;All Files (*)", options=options)
-        if file_name:
-            try:
-                with open(file_name, 'r', encoding='utf-8') as json_file:
-                    data = json.load(json_file)
-                    
-                    # Validate data format
-                    if 'nodes' not in data:
-                        QMessageBox.warning(self, "Import Error", "Invalid file format: No 'nodes' data found.")
-                        return
-                    
-                    # Clear existing nodes and edges
-                    self.scene.clear()
-                    self.node_items.clear()
-                    
-                    # Create nodes with complete data restoration
-                    nodes = {}
-                    for node_data in data['nodes']:
-                        # Create appropriate node type based on saved type
-                        node_type = node_data.get('type', 'normal')
-                        if node_type == 'start':
-                            node = StartNode(node_data['x'], node_data['y'], name=node_data['name'])
-                        else:
-                            node = NodeScene(node_data['x'], node_data['y'], name=node_data['name'])
-                        
-                        # Restore form data if available
-                        if 'form_data' in node_data:
-                            node.node_data = node_data['form_data']
-                        
-                        # Restore connection tracking
-                        node.input_connected_node = node_data.get('input_connected_node', None)
-                        node.output_connected_node = node_data.get('output_connected_node', None)
-                        
-                        # Add to scene and tracking
-                        nodes[node_data['id']] = node
-                        self.scene.addItem(node)
-                        self.node_items.append(node)
-                    
-                    # Create edges with proper connections
-                    if 'edges' in data:
-                        for edge_data in data['edges']:
-                            start_node = nodes.get(edge_data['start_node'])
-                            end_node = nodes.get(edge_data['end_node'])
-                            
-                            if start_node and end_node:
-                                # Create edge from output of start node to input of end node
-                                start_pos = start_node.output_circle.mapToScene(start_node.output_circle.rect().center())
-                                end_pos = end_node.input_circle.mapToScene(end_node.input_circle.rect().center()) if end_node.input_circle else end_node.output_circle.mapToScene(end_node.output_circle.rect().center())
-                                
-                                edge = EdgeGraphicsItem(start_pos, end_pos, QColor(0, 150, 255))
-                                edge.start_circle = start_node.output_circle
-                                edge.end_circle = end_node.input_circle if end_node.input_circle else end_node.output_circle
-                                edge.updateFromNodes()
-                                
-                                # Add to scene
-                                self.scene.addItem(edge)
-                                
-                                # Connect to circles
-                                if not hasattr(start_node.output_circle, 'connected_edges'):
-                                    start_node.output_circle.connected_edges = []
-                                target_circle = end_node.input_circle if end_node.input_circle else end_node.output_circle
-                                if not hasattr(target_circle, 'connected_edges'):
-                                    target_circle.connected_edges = []
-                                
-                                start_node.output_circle.connected_edges.append(edge)
-                                target_circle.connected_edges.append(edge)
-                                
-                                # Update connection tracking
-                                start_node.output_connected_node = end_node.name
-                                end_node.input_connected_node = start_node.name
-                    
-                    # Update scene rect to fit all nodes
-                    if nodes:
-                        all_rects = [node.sceneBoundingRect() for node in nodes.values()]
-                        if all_rects:
-                            union_rect = all_rects[0]
-                            for rect in all_rects[1:]:
-                                union_rect = union_rect.united(rect)
-                            
-                            # Add padding
-                            padding = 100
-                            union_rect = union_rect.adjusted(-padding, -padding, padding, padding)
-                            self.scene.setSceneRect(union_rect)
-                    
-                    QMessageBox.information(self, "Import Successful", 
-                                          f"Node graph loaded successfully!\n\nNodes: {len(nodes)}\nEdges: {len(data.get('edges', []))}")
-                    
-            except json.JSONDecodeError as e:
-                QMessageBox.critical(self, "Import Error", f"Invalid JSON file format:\n{str(e)}")
-            except Exception as e:
-                QMessageBox.critical(self, "Import Error", f"Failed to load node graph:\n{str(e)}")
+        file_name, _ = QFileDialog.getOpenFileName(self, "Load Node Graph", "", PROJECT_FILE_FILTER, options=options)
+        if file_name and not self.offer_autosave_recovery(file_name):
+            self.load_project(file_name)
+
+    def load_project(self, file_name, autosave_file=None):
+        """Stream a project file into the scene without blocking the UI.
+
+        A ProjectLoadThread parses the file and delivers node and edge batches,
+        which are turned into items here on the GUI thread as they arrive.
+        With autosave_file the graph is read from that autosave instead and
+        left marked unsaved; file_name is then the project it belongs to, or
+        None for an untitled graph.
+        """
+        source_file = autosave_file or file_name
+        if self._project_loader is not None:
+            self.cancel_project_load()
+        # A running PDF export works on its own snapshot and carries on
+        self.close_project_store()
+        
+        # Clear existing nodes and edges
+        self.scene.clear()
+        self.graph.clear()
+        self.close_form_source()
+        if is_binary_project(source_file) and not autosave_file:
+            # An autosave is read in full, so it can be removed once the project is saved
+            self.form_source = BinaryFormSource(source_file)
+        self._load_records = {}
+        self._pending_edges = []
+        
+        # Items arrive in batches; index and draw them once the whole file is in
+        self.scene.begin_bulk_load()
+        
+        loader = ProjectLoadThread(source_file, self, form_source=self.form_source)
+        loader.project_file = file_name
+        loader.recovered = autosave_file is not None
+        loader.nodes_loaded.connect(self._on_nodes_loaded)
+        loader.edges_loaded.connect(self._on_edges_loaded)
+        loader.progress.connect(self._on_load_progress)
+        loader.loaded.connect(self._on_project_loaded)
+        loader.failed.connect(self._on_project_load_failed)
+        loader.finished.connect(loader.deleteLater)
+        self._project_loader = loader
+        
+        # The dialog stays non-modal: a modal QProgressDialog pumps the event loop in
+        # setValue(), which would deliver later batches re-entrantly. Editing is
+        # locked by disabling the view and menus instead.
+        self._load_progress = QProgressDialog("Loading node graph...", "Cancel", 0, 100, self)
+        self._load_progress.setWindowTitle("Load Node Graph")
+        self._load_progress.setWindowModality(Qt.NonModal)
+        self._load_progress.setMinimumDuration(500)
+        self._load_progress.setAutoClose(False)
+        self._load_progress.setAutoReset(False)
+        self._load_progress.canceled.connect(self.cancel_project_load)
+        
+        self.view.setEnabled(False)
+        self.menuBar().setEnabled(False)
+        self.status_bar.showMessage(f"Loading {os.path.basename(source_file)}...")
+        loader.start()
+
+    def cancel_project_load(self):
+        """Stop a running load and discard the partially loaded graph"""
+        loader = self._project_loader
+        if loader is None:
+            return
+        loader.requestInterruption()
+        loader.wait()
+        self.scene.clear()
+        self.graph.clear()
+        self.close_form_source()
+        self._finish_project_load()
+        self.project_file = None
+        self.reset_change_tracking()
+        self.request_status_update()
+        self.status_bar.showMessage("Loading cancelled")
+
+    def _finish_project_load(self):
+        """Detach from the loader so batches still queued for the GUI are ignored"""
+        self._project_loader = None
+        self._load_records = {}
+        self._pending_edges = []
+        self.scene.end_bulk_load()
+        self.revalidate_graph()
+        self.view.setEnabled(True)
+        self.menuBar().setEnabled(True)
+        if self._load_progress is not None:
+            progress = self._load_progress
+            self._load_progress = None
+            progress.canceled.disconnect(self.cancel_project_load)
+            progress.close()
+            progress.deleteLater()
+
+    def _on_nodes_loaded(self, batch):
+        if self.sender() is not self._project_loader:
+            return
+        for saved_id, record in batch:
+            # Create appropriate node type based on saved type
+            if record.kind == 'start':
+                node = StartNode(record.x, record.y, record=record)
+            elif record.kind == 'branch':
+                node = BranchNode(record.x, record.y, record=record)
+            else:
+                node = NodeScene(record.x, record.y, record=record)
+            
+            # Add to scene and tracking; the node keeps its saved id when it is free
+            self.graph.add_node(record, saved_id)
+            self._load_records[saved_id] = record
+            self.scene.addItem(node)
+            self.register_node(node)
+        self._project_loader.batch_done()
+
+    def _on_edges_loaded(self, batch):
+        if self.sender() is not self._project_loader:
+            return
+        for edge_data in batch:
+            edge_record = self.graph.connect_dict(self._load_records, edge_data)
+            if edge_record is None:
+                self._pending_edges.append(edge_data)
+            else:
+                self._add_edge_view(edge_record)
+        self._project_loader.batch_done()
+
+    def _add_edge_view(self, edge_record):
+        """Create the edge item for a connected EdgeRecord"""
+        start_node = edge_record.source_node.view
+        end_node = edge_record.target_node.view
+        
+        # Create edge from the record's output (one circle per branch output) to input of end node
+        if hasattr(start_node, 'output_circles'):
+            start_circle = start_node.output_circles[edge_record.source.index]
+        else:
+            start_circle = start_node.output_circle
+        end_circle = end_node.input_circle if end_node.input_circle else end_node.output_circle
+        
+        edge = EdgeGraphicsItem(None, None, QColor(0, 150, 255), None, start_circle, end_circle)
+        self.scene.addItem(edge)
+        
+        # Connect to circles, reusing the loaded edge record
+        edge.attach(edge_record)
+        
+        # The path is built with all other edges when the bulk load ends
+        self.scene.mark_edges_dirty((edge,))
+
+    def _on_load_progress(self, bytes_read, total_bytes):
+        if self.sender() is not self._project_loader or self._load_progress is None:
+            return
+        if total_bytes:
+            self._load_progress.setValue(min(99, bytes_read * 100 // total_bytes))
+
+    def _on_project_loaded(self, meta):
+        if self.sender() is not self._project_loader:
+            return
+        
+        # Edges listed before their nodes can be connected now that every node exists
+        pending, self._pending_edges = self._pending_edges, []
+        for edge_data in pending:
+            edge_record = self.graph.connect_dict(self._load_records, edge_data)
+            if edge_record is not None:
+                self._add_edge_view(edge_record)
+        
+        nodes = [record.view for record in self.graph.nodes]
+        
+        # A project database stays open so later edits are saved incrementally
+        loader = self.sender()
+        file_name = loader.project_file
+        if is_store_project(loader.file_name):
+            self.project_store = ProjectStore(loader.file_name)
+            self.project_store.bind(self._load_records)
+        self._finish_project_load()
+        self.project_file = file_name
+        self.reset_change_tracking()
+        if loader.recovered:
+            # Restored from an autosave: still to be saved to the project
+            self.mark_dirty()
+        
+        # Update scene rect to fit all nodes
+        if nodes:
+            all_rects = [node.sceneBoundingRect() for node in nodes]
+            if all_rects:
+                union_rect = all_rects[0]
+                for rect in all_rects[1:]:
+                    union_rect = union_rect.united(rect)
+                
+                # Add padding
+                padding = 100
+                union_rect = union_rect.adjusted(-padding, -padding, padding, padding)
+                self.scene.setSceneRect(union_rect)
+        
+        self.status_bar.showMessage("Node graph loaded")
+        QMessageBox.information(self, "Import Successful", 
+                              f"Node graph loaded successfully!\n\nNodes: {len(nodes)}\nEdges: {self.scene.edge_count}")
+
+    def _on_project_load_failed(self, message):
+        if self.sender() is not self._project_loader:
+            return
+        self.scene.clear()
+        self.graph.clear()
+        self.close_form_source()
+        self._finish_project_load()
+        self.project_file = None
+        self.reset_change_tracking()
+        self.request_status_update()
+        self.status_bar.showMessage("Loading failed")
+        QMessageBox.critical(self, "Import Error", message)
 
     def export_json(self):
-        """Export complete node graph data to JSON file"""
-        # Update all connection data first
-        self.export_manager.update_all_connections()
+        """Export complete node graph data to a JSON or binary project file"""
+        if self._save_thread is not None:
+            QMessageBox.information(self, "Save in Progress", "The previous save has not finished yet.")
+            return
         
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getSaveFileName(self, "Save Node Graph", "untitled_graph.json", "JSON Files (*.json);;All Files (*)", options=options)
+        file_name, selected_filter = QFileDialog.getSaveFileName(self, "Save Node Graph", "untitled_graph.json", PROJECT_FILE_FILTER, options=options)
         if file_name:
             try:
-                # Ensure .json extension
-                if not file_name.lower().endswith('.json'):
-                    file_name += '.json'
-                
-                data = {
-                    'version': '1.0',
-                    'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'nodes': [],
-                    'edges': []
-                }
+                # Ensure .json, .vnproj or .vndb extension
+                if not file_name.lower().endswith(('.json', PROJECT_BINARY_EXT, PROJECT_STORE_EXT)):
+                    if PROJECT_BINARY_EXT in selected_filter:
+                        file_name += PROJECT_BINARY_EXT
+                    elif PROJECT_STORE_EXT in selected_filter:
+                        file_name += PROJECT_STORE_EXT
+                    else:
+                        file_name += '.json'
                 
-                # Collect complete node data including form data and connections
-                for node in self.node_items:
-                    node_data = {
-                        'id': node.name,
-                        'name': node.name,
-                        'x': node.x(),
-                        'y': node.y(),
-                        'type': 'start' if isinstance(node, StartNode) else 'normal',
-                        'input_connected_node': node.input_connected_node,
-                        'output_connected_node': node.output_connected_node,
-                        'form_data': node.node_data  # Complete form data including items, dialogs, actions
-                    }
-                    data['nodes'].append(node_data)
+                # Serialize complete node data (form data and connections) from the graph model
+                for record in self.graph.nodes:
+                    record.view.sync_record_position()
                 
-                # Collect edge data with unique IDs
-                edge_id = 1
-                for item in self.scene.items():
-                    if isinstance(item, EdgeGraphicsItem):
-                        if hasattr(item, 'start_circle') and hasattr(item, 'end_circle'):
-                            start_node = item.start_circle.parentItem()
-                            end_node = item.end_circle.parentItem()
-                            if start_node and end_node:
-                                edge_data = {
-                                    'id': f"edge_{edge_id}",
-                                    'start_node': start_node.name,
-                                    'end_node': end_node.name,
-                                    'start_point': 'output',  # Always from output to input
-                                    'end_point': 'input'
-                                }
-                                data['edges'].append(edge_data)
-                                edge_id += 1
+                if is_store_project(file_name):
+                    # Project database: written in full once, then kept current edit by edit
+                    self.close_project_store()
+                    self.project_store = ProjectStore(file_name)
+                    self.project_store.save_graph(self.graph)
+                    self._finish_project_save(file_name, os.path.getsize(file_name))
+                    return
                 
-                # Write to JSON file with pretty formatting
-                with open(file_name, 'w', encoding='utf-8') as json_file:
-                    json.dump(data, json_file, ensure_ascii=False, indent=2)
-                
-                # Show success message with file path
-                file_size = os.path.getsize(file_name)
-                self.status_bar.showMessage(f"Graph saved to {os.path.basename(file_name)} ({file_size} bytes)", 5000)
-                
-                QMessageBox.information(self, "Export Successful", 
-                                      f"Node graph saved successfully!\n\nFile: {os.path.basename(file_name)}\nNodes: {len(data['nodes'])}\nEdges: {len(data['edges'])}")
+                # JSON or binary: snapshot now, encode and write on a worker thread; the
+                # file is moved into place here, once the form source can let go of it
+                thread = ProjectSaveThread(self.graph.to_dict(paged_forms=True), file_name, self,
+                                           form_file=self.form_file(), commit=False)
+                thread.change_count = self._change_count
+                thread.records = list(self.graph.nodes)
+                thread.saved.connect(self._on_project_saved)
+                thread.failed.connect(self._on_project_save_failed)
+                thread.finished.connect(thread.deleteLater)
+                self._save_thread = thread
+                self.status_bar.showMessage(f"Saving {os.path.basename(file_name)}...")
+                thread.start()
                 
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Failed to save node graph:\n{str(e)}")
 
+    def _on_project_saved(self, file_name, file_size):
+        thread = self.sender()
+        if thread is not self._save_thread:
+            return
+        self._save_thread = None
+        try:
+            self.commit_saved_file(thread)
+        except OSError as e:
+            logger.warning("Failed to replace %s: %s", file_name, e)
+            self.status_bar.showMessage("Save failed", 5000)
+            QMessageBox.critical(self, "Export Error", f"Failed to save node graph:\n{str(e)}")
+            return
+        self._finish_project_save(file_name, file_size, thread)
+
+    def commit_saved_file(self, thread):
+        """Move the temp file of a finished save into place.
+
+        When the project being paged from is replaced, the form source (and an
+        autosave copying from it) let go of the file first: Windows cannot
+        replace a file that is open.
+        """
+        source = self.form_source
+        releases = source is not None and os.path.normcase(os.path.abspath(source.file_name)) == \
+            os.path.normcase(os.path.abspath(thread.file_name))
+        if releases:
+            if self._autosave_thread is not None:
+                self._autosave_thread.wait()
+            source.close()
+        try:
+            commit_temp(thread.temp_name, thread.file_name)
+        except OSError:
+            if releases:
+                source.reopen()
+            raise
+
+    def _finish_project_save(self, file_name, file_size, thread=None):
+        """Record a completed save; thread is the ProjectSaveThread that wrote it, if any"""
+        # Edits made while the worker was writing keep the window marked modified
+        self._saved_change_count = thread.change_count if thread else self._change_count
+        self._autosaved_change_count = max(self._autosaved_change_count, self._saved_change_count)
+        self.setWindowModified(self._change_count != self._saved_change_count)
+        was_untitled = self.project_file is None
+        self.project_file = file_name
+        if not is_store_project(file_name):
+            # Saved as another format: edits belong to that file now, and autosave resumes
+            self.close_project_store()
+        
+        if thread and self.form_source is not None and is_binary_project(file_name):
+            self.rebind_form_source(file_name, thread.records)
+        
+        # The manual save supersedes any autosave of this project
+        stale_autosaves = [autosave_path(file_name)]
+        if was_untitled:
+            stale_autosaves.append(self.untitled_autosave_file())
+        for stale_autosave in stale_autosaves:
+            if os.path.exists(stale_autosave):
+                os.remove(stale_autosave)
+        
+        # Show success message with file path
+        self.status_bar.showMessage(f"Graph saved to {os.path.basename(file_name)} ({file_size} bytes)", 5000)
+        
+        QMessageBox.information(self, "Export Successful", 
+                              f"Node graph saved successfully!\n\nFile: {os.path.basename(file_name)}\nNodes: {len(self.graph.nodes)}\nEdges: {self.scene.edge_count}")
+
+    def rebind_form_source(self, file_name, records):
+        """Page forms from a freshly saved binary project; records are in its file order"""
+        old_source = self.form_source
+        self.form_source = BinaryFormSource(file_name)
+        for position, record in enumerate(records):
+            if record.form_source is old_source:
+                record.bind_form(self.form_source, position)
+        old_source.close()
+
+    def _on_project_save_failed(self, message):
+        if self.sender() is not self._save_thread:
+            return
+        self._save_thread = None
+        self.status_bar.showMessage("Save failed", 5000)
+        QMessageBox.critical(self, "Export Error", f"Failed to save node graph:\n{message}")
+
+    def closeEvent(self, event):
+        """Stop running loads and exports and close the project database before the window goes away"""
+        self.cancel_project_load()
+        self.export_manager.wait_for_pdf_export()
+        self.close_project_store()
+        for thread in (self._save_thread, self._autosave_thread):
+            if thread is not None:
+                thread.wait()
+        if self._save_thread is not None and self._save_thread.temp_name:
+            # Finished writing, but its saved signal will not be delivered any more
+            thread, self._save_thread = self._save_thread, None
+            try:
+                self.commit_saved_file(thread)
+            except OSError as e:
+                logger.warning("Failed to replace %s: %s", thread.file_name, e)
+        self.close_form_source()
+        super().closeEvent(event)
+
     def eventFilter(self, obj, event):
         """Handle mouse events for canvas interaction"""
         if obj == self.view.viewport():
@@ -449,7 +904,7 @@ class MainWindow(QMainWindow):
                         # scene_pos = self.view.mapToScene(pos)
                         # node = NodeScene(scene_pos.x(), scene_pos.y())
                         # self.scene.addItem(node)
-                        # self.node_items.append(node)
+                        # self.register_node(node)
                         # 
                         # # Show status message
                         # self.status_bar.showMessage(f"Created new node '{node.name}'", 3000)
@@ -484,13 +939,23 @@ class MainWindow(QMainWindow):
                     return True
         return super().eventFilter(obj, event)
 
+    def request_status_update(self):
+        """Schedule one status refresh after the current burst of graph changes"""
+        if not self._status_update_pending:
+            self._status_update_pending = True
+            QTimer.singleShot(0, self.update_status)
+
     def update_status(self):
         """Update status bar with current graph information"""
-        nodes_count = len(self.node_items)
-        edges_count = len([item for item in self.scene.items() if isinstance(item, EdgeGraphicsItem)])
+        self._status_update_pending = False
+        nodes_count = len(self.graph.nodes)
+        edges_count = self.scene.edge_count
         zoom_level = int(self.view._zoom * 100) if hasattr(self.view, '_zoom') else 100
         
-        self.status_bar.showMessage(f"Nodes: {nodes_count} | Edges: {edges_count} | Zoom: {zoom_level}%")
+        status = f"Nodes: {nodes_count} | Edges: {edges_count} | Zoom: {zoom_level}%"
+        if self._validation_issue_count:
+            status += f" | Issues: {self._validation_issue_count}"
+        self.status_label.setText(status)
 
     def create_default_start_node(self):
         """Create a default start node at the center-left of the canvas"""
@@ -502,15 +967,16 @@ class MainWindow(QMainWindow):
         # Create start node
         start_node = StartNode(start_x, start_y, name="Start")
         self.scene.addItem(start_node)
-        self.node_items.append(start_node)
+        self.register_node(start_node)
         
         # Show status message
         self.status_bar.showMessage("Default Start node created - Right-click to show context menu for more nodes", 3000)
         
-        print(f"Created default Start node at position ({start_x}, {start_y})")
+        logger.debug("Created default Start node at position (%s, %s)", start_x, start_y)
 
 
 if __name__ == "__main__":
+    configure_logging()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
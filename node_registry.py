@@ -0,0 +1,79 @@
+"""
+Node Registry for Visual Novel Node Editor
+Keeps constant-time lookup tables from node id and node name to the graph's node records
+"""
+
+
+class NodeRegistry:
+    """Index of graph nodes by stable id and by display name"""
+
+    def __init__(self):
+        self._by_id = {}     # node_id -> node (keeps creation order)
+        self._by_name = {}   # name -> list of nodes currently using that name
+        self._last_id = 0    # Highest id handed out or loaded; new ids count on from here
+
+    def add(self, node, node_id=None):
+        """Register a node, assigning it a stable id if it has none yet.
+
+        node_id is the id to prefer, e.g. the one a node was saved with; a
+        fresh id is used instead when it is missing, not an integer (older
+        projects keyed nodes by name) or already taken by another node.
+        """
+        if getattr(node, 'node_id', None) is None:
+            if type(node_id) is not int or node_id < 1 or node_id in self._by_id:
+                node_id = self._last_id + 1
+            node.node_id = node_id
+        self._last_id = max(self._last_id, node.node_id)
+        self._by_id[node.node_id] = node
+        self._by_name.setdefault(node.name, []).append(node)
+
+    def remove(self, node):
+        """Unregister a node; unknown nodes are ignored"""
+        if self._by_id.pop(getattr(node, 'node_id', None), None) is None:
+            return
+        self._unlink_name(node, node.name)
+
+    def rename(self, node, old_name):
+        """Move a node to its new name after node.name has been changed"""
+        if node.node_id not in self._by_id or old_name == node.name:
+            return
+        self._unlink_name(node, old_name)
+        self._by_name.setdefault(node.name, []).append(node)
+
+    def clear(self):
+        """Forget all nodes (ids keep counting so they are never reused)"""
+        self._by_id.clear()
+        self._by_name.clear()
+
+    def get(self, node_id):
+        """Return the node with the given id, or None"""
+        return self._by_id.get(node_id)
+
+    def get_by_name(self, name):
+        """Return the first registered node with the given name, or None"""
+        nodes = self._by_name.get(name)
+        return nodes[0] if nodes else None
+
+    def named(self, name):
+        """Return all registered nodes with the given name"""
+        return list(self._by_name.get(name, ()))
+
+    def nodes(self):
+        """Return all registered nodes in creation order"""
+        return list(self._by_id.values())
+
+    def _unlink_name(self, node, name):
+        nodes = self._by_name.get(name)
+        if nodes and node in nodes:
+            nodes.remove(node)
+            if not nodes:
+                del self._by_name[name]
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, node):
+        return self._by_id.get(getattr(node, 'node_id', None)) is node
@@ -0,0 +1,84 @@
+"""
+PDF Fonts for Visual Novel Node Editor
+Registers the Thai TTF fonts with ReportLab. Needs no Qt, so the batch
+exporter embeds the same fonts as the editor.
+"""
+
+import os
+import sys
+import logging
+import threading
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase import pdfmetrics
+
+logger = logging.getLogger(__name__)
+
+# THSarabunNew fonts from font folder
+THAI_FONT_FILES = {
+    'THSarabunNew': 'THSarabunNew.ttf',
+    'THSarabunNew-Bold': 'THSarabunNew Bold.ttf',
+    'THSarabunNew-Italic': 'THSarabunNew Italic.ttf',
+    'THSarabunNew-BoldItalic': 'THSarabunNew BoldItalic.ttf'
+}
+
+FALLBACK_FONT = 'Helvetica'
+
+registered_fonts = {}        # font name -> file it was registered from
+_registered = False
+_register_lock = threading.Lock()
+
+
+def font_search_paths():
+    """Folders searched for the font files: the application font folder, then the system font folders"""
+    home = os.path.expanduser('~')
+    paths = [
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'font'),
+        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+    ]
+    if sys.platform == 'win32':
+        paths.append(os.path.join(os.environ.get('LOCALAPPDATA', home), 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        paths.extend([os.path.join(home, 'Library', 'Fonts'), '/Library/Fonts', '/System/Library/Fonts'])
+    else:
+        paths.extend([os.path.join(home, '.local', 'share', 'fonts'), os.path.join(home, '.fonts'),
+                      '/usr/local/share/fonts', '/usr/share/fonts'])
+    return [path for path in paths if os.path.isdir(path)]
+
+
+def find_font_file(font_filename, search_paths):
+    """Find font file in search paths"""
+    for font_path in search_paths:
+        full_path = os.path.join(font_path, font_filename)
+        if os.path.exists(full_path):
+            return full_path
+    return None
+
+
+def register_thai_fonts(search_paths=None):
+    """Register Thai fonts with ReportLab; returns the number of variants available.
+
+    The TTF files are only parsed on the first call in a process, later calls
+    reuse the registration. search_paths defaults to font_search_paths().
+    """
+    global _registered
+    with _register_lock:
+        if not _registered:
+            paths = font_search_paths() if search_paths is None else search_paths
+            for font_name, font_file in THAI_FONT_FILES.items():
+                font_path = find_font_file(font_file, paths)
+                if font_path:
+                    try:
+                        pdfmetrics.registerFont(TTFont(font_name, font_path))
+                        registered_fonts[font_name] = font_path
+                        logger.info("Registered font: %s from %s", font_name, font_path)
+                    except Exception as e:
+                        logger.warning("Failed to register %s: %s", font_name, e)
+            _registered = True
+        return len(registered_fonts)
+
+
+def primary_thai_font():
+    """Get the primary Thai font family name"""
+    if 'THSarabunNew' in registered_fonts:
+        return 'THSarabunNew'
+    return FALLBACK_FONT
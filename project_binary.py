@@ -0,0 +1,231 @@
+"""
+Binary Project Format for Visual Novel Node Editor
+Compact container for the project JSON schema with an offset index, so a single
+node's form_data can be read without parsing the rest of the file
+
+Layout (all integers little-endian):
+    header   'VNEP' magic, u16 format version, u16 flags
+    records  u8 record type, u32 payload length, payload
+             META  - top-level keys other than nodes/edges (compact JSON)
+             NODE  - one node without its form_data (compact JSON)
+             FORM  - form_data of the preceding NODE (zlib-compressed compact JSON)
+             EDGES - the complete edges list (compact JSON)
+             INDEX - {"nodes": [[id, node_offset, form_offset], ...], "meta": offset, "edges": offset}
+    trailer  u64 offset of the INDEX record, 'VNEP' magic
+"""
+
+import json
+import os
+import struct
+import zlib
+
+PROJECT_BINARY_EXT = '.vnproj'
+MAGIC = b'VNEP'
+FORMAT_VERSION = 1
+
+RECORD_META = 1
+RECORD_NODE = 2
+RECORD_FORM = 3
+RECORD_EDGES = 4
+RECORD_INDEX = 5
+
+_HEADER = struct.Struct('<4sHH')
+_RECORD = struct.Struct('<BI')
+_TRAILER = struct.Struct('<Q4s')
+
+
+def is_binary_project(file_name):
+    """True when the file name uses the binary project extension"""
+    return file_name.lower().endswith(PROJECT_BINARY_EXT)
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode(payload):
+    return json.loads(payload.decode('utf-8'))
+
+
+def _write_record(out, record_type, payload):
+    """Write one record and return the offset it starts at"""
+    offset = out.tell()
+    out.write(_RECORD.pack(record_type, len(payload)))
+    out.write(payload)
+    return offset
+
+
+def write_project(data, out, form_reader=None):
+    """Write a project dict (the JSON schema) to a binary file object opened for writing.
+
+    A node dict may carry 'form_index' instead of 'form_data'; its compressed
+    form record is then copied from form_reader (a ProjectBinaryReader)
+    without being decoded.
+    """
+    out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+
+    meta = {key: value for key, value in data.items() if key not in ('nodes', 'edges')}
+    index = {'meta': _write_record(out, RECORD_META, _encode(meta)), 'nodes': []}
+
+    for node_data in data.get('nodes', []):
+        heading = {key: value for key, value in node_data.items() if key not in ('form_data', 'form_index')}
+        node_offset = _write_record(out, RECORD_NODE, _encode(heading))
+        if 'form_data' not in node_data and 'form_index' in node_data:
+            form_payload = form_reader.form_payload_at(node_data['form_index'])
+        else:
+            form_payload = zlib.compress(_encode(node_data.get('form_data', {})))
+        form_offset = _write_record(out, RECORD_FORM, form_payload)
+        index['nodes'].append([node_data['id'], node_offset, form_offset])
+
+    index['edges'] = _write_record(out, RECORD_EDGES, _encode(data.get('edges', [])))
+    index_offset = _write_record(out, RECORD_INDEX, _encode(index))
+    out.write(_TRAILER.pack(index_offset, MAGIC))
+
+
+def save_project(data, file_name):
+    """Write a project dict to a binary project file"""
+    with open(file_name, 'wb') as out:
+        write_project(data, out)
+
+
+class ProjectBinaryReader:
+    """Reader for binary project files.
+
+    Random access through the index: node_ids(), node_heading(id), form_data(id),
+    form_data_at(position), edges() and to_dict(). iter_items() streams the file front to back with the
+    same (kind, value) items, bytes_read/total_bytes and keys as
+    project_stream.ProjectStreamReader, so the background loader can use either.
+    """
+
+    def __init__(self, binary_file):
+        self._file = binary_file
+        self.bytes_read = 0
+        self.keys = []
+        self._file.seek(0, os.SEEK_END)
+        self.total_bytes = self._file.tell()
+
+        self._file.seek(0)
+        magic, version, _flags = _HEADER.unpack(self._read_exact(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("Invalid file format: not a binary node graph project.")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported project format version {version}.")
+        self._index = None
+
+    def _read_exact(self, size):
+        payload = self._file.read(size)
+        if len(payload) != size:
+            raise ValueError("Invalid file format: binary project is truncated.")
+        return payload
+
+    def _read_record(self, offset=None, expected_type=None):
+        if offset is not None:
+            self._file.seek(offset)
+        record_type, length = _RECORD.unpack(self._read_exact(_RECORD.size))
+        if expected_type is not None and record_type != expected_type:
+            raise ValueError("Invalid file format: binary project index is corrupt.")
+        return record_type, self._read_exact(length)
+
+    @property
+    def index(self):
+        """Offset index, read from the trailer on first use"""
+        if self._index is None:
+            if self.total_bytes < _HEADER.size + _TRAILER.size:
+                raise ValueError("Invalid file format: binary project is truncated.")
+            self._file.seek(self.total_bytes - _TRAILER.size)
+            index_offset, magic = _TRAILER.unpack(self._read_exact(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError("Invalid file format: binary project is truncated.")
+            _, payload = self._read_record(index_offset, RECORD_INDEX)
+            index = _decode(payload)
+            index['entries'] = [(node_offset, form_offset) for _, node_offset, form_offset in index['nodes']]
+            index['nodes'] = {node_id: (node_offset, form_offset)
+                              for node_id, node_offset, form_offset in index['nodes']}
+            self._index = index
+        return self._index
+
+    def meta(self):
+        """Top-level keys other than nodes and edges"""
+        return _decode(self._read_record(self.index['meta'], RECORD_META)[1])
+
+    def node_ids(self):
+        """Saved node ids in file order"""
+        return list(self.index['nodes'])
+
+    def node_heading(self, node_id):
+        """A node's dict without form_data"""
+        return _decode(self._read_record(self.index['nodes'][node_id][0], RECORD_NODE)[1])
+
+    def form_data(self, node_id):
+        """A single node's form_data, read without touching any other node"""
+        return self._read_form(self.index['nodes'][node_id][1])
+
+    def form_data_at(self, position):
+        """form_data of the node at the given position in file order"""
+        return self._read_form(self.index['entries'][position][1])
+
+    def form_payload_at(self, position):
+        """Compressed form record of the node at the given position, as stored"""
+        return self._read_record(self.index['entries'][position][1], RECORD_FORM)[1]
+
+    def _read_form(self, offset):
+        payload = self._read_record(offset, RECORD_FORM)[1]
+        return _decode(zlib.decompress(payload))
+
+    def edges(self):
+        """The complete edges list"""
+        return _decode(self._read_record(self.index['edges'], RECORD_EDGES)[1])
+
+    def to_dict(self):
+        """The whole project as the JSON schema dict"""
+        data = self.meta()
+        data['nodes'] = []
+        for node_offset, form_offset in self.index['entries']:
+            # Walk positions rather than ids so nodes sharing a saved id are all kept
+            node_data = _decode(self._read_record(node_offset, RECORD_NODE)[1])
+            node_data['form_data'] = self._read_form(form_offset)
+            data['nodes'].append(node_data)
+        data['edges'] = self.edges()
+        return data
+
+    def iter_items(self, with_forms=True):
+        """Yield ('meta', (key, value)), ('node', dict) and ('edge', dict) in file order.
+
+        With with_forms=False form_data is not decoded; each node dict carries
+        'form_index' instead, for form_data_at().
+        """
+        self._file.seek(_HEADER.size)
+        node_data = None
+        position = 0
+        while True:
+            record_type, payload = self._read_record()
+            self.bytes_read = self._file.tell()
+            if record_type == RECORD_META:
+                for key, value in _decode(payload).items():
+                    self.keys.append(key)
+                    yield 'meta', (key, value)
+            elif record_type == RECORD_NODE:
+                if 'nodes' not in self.keys:
+                    self.keys.append('nodes')
+                node_data = _decode(payload)
+            elif record_type == RECORD_FORM:
+                if with_forms:
+                    node_data['form_data'] = _decode(zlib.decompress(payload))
+                else:
+                    node_data['form_index'] = position
+                position += 1
+                yield 'node', node_data
+            elif record_type == RECORD_EDGES:
+                self.keys.append('edges')
+                if 'nodes' not in self.keys:
+                    self.keys.append('nodes')  # A project with no nodes still has the list
+                for edge_data in _decode(payload):
+                    yield 'edge', edge_data
+            else:
+                return
+
+
+def load_project(file_name):
+    """Read a binary project file into the JSON schema dict"""
+    with open(file_name, 'rb') as binary_file:
+        return ProjectBinaryReader(binary_file).to_dict()
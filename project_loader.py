@@ -0,0 +1,125 @@
+"""
+Project Loader for Visual Novel Node Editor
+Background thread that streams a project JSON file and hands node and edge
+batches to the GUI thread
+"""
+
+import json
+import logging
+
+from PySide6.QtCore import QThread, QSemaphore, Signal
+
+from graph_model import GraphModel
+from project_stream import ProjectStreamReader
+from project_binary import ProjectBinaryReader, is_binary_project
+from project_store import ProjectStore, is_store_project
+
+logger = logging.getLogger(__name__)
+
+# Items per batch handed to the GUI thread; small enough to keep the UI responsive
+LOAD_BATCH_SIZE = 100
+# Batches that may wait in the GUI event queue before the parser pauses
+MAX_PENDING_BATCHES = 2
+
+
+class ProjectLoadThread(QThread):
+    """Parse a project file (JSON, binary .vnproj or database .vndb) off the GUI thread.
+
+    Node entries are turned into NodeRecords here (they hold no Qt state) and
+    delivered as lists of (saved_id, record). Edge entries are delivered as the
+    raw dicts, since connecting them touches the GUI-owned GraphModel.
+    The receiver calls batch_done() after handling each batch so the parser
+    never runs more than MAX_PENDING_BATCHES ahead of the GUI.
+    Call requestInterruption() to cancel; no further batches are emitted.
+    With a form_source, binary projects are loaded without form data; the
+    records are bound to the source and page their forms in on demand.
+    """
+    nodes_loaded = Signal(list)      # [(saved_id, NodeRecord), ...]
+    edges_loaded = Signal(list)      # [edge dict, ...]
+    progress = Signal(int, int)      # bytes read, total bytes
+    loaded = Signal(dict)            # top-level metadata (version, created_at, ...)
+    failed = Signal(str)             # user-facing error message
+
+    def __init__(self, file_name, parent=None, batch_size=LOAD_BATCH_SIZE, form_source=None):
+        super().__init__(parent)
+        self.file_name = file_name
+        self.form_source = form_source
+        self.batch_size = batch_size
+        self._batch_slots = QSemaphore(MAX_PENDING_BATCHES)
+
+    def batch_done(self):
+        """Called by the GUI thread once a nodes/edges batch has been handled"""
+        self._batch_slots.release()
+
+    def _emit_batch(self, signal, batch):
+        """Emit a batch once the GUI has room for it; False if cancelled meanwhile"""
+        while not self._batch_slots.tryAcquire(1, 100):
+            if self.isInterruptionRequested():
+                return False
+        signal.emit(batch)
+        return True
+
+    def run(self):
+        try:
+            if is_store_project(self.file_name):
+                # SQLite connections are per thread, so the loader opens its own
+                with ProjectStore(self.file_name) as store:
+                    self._stream(store)
+            else:
+                with open(self.file_name, 'rb') as project_file:
+                    if is_binary_project(self.file_name):
+                        reader = ProjectBinaryReader(project_file)
+                        self._stream(reader, reader.iter_items(with_forms=self.form_source is None))
+                    else:
+                        self._stream(ProjectStreamReader(project_file))
+        except json.JSONDecodeError as e:
+            self.failed.emit(f"Invalid JSON file format:\n{str(e)}")
+        except Exception as e:
+            logger.warning("Failed to load %s: %s", self.file_name, e)
+            self.failed.emit(f"Failed to load node graph:\n{str(e)}")
+
+    def _stream(self, reader, items=None):
+        """Batch the (kind, value) items of a project reader to the GUI thread"""
+        meta = {}
+        nodes, edges = [], []
+
+        for kind, value in items if items is not None else reader.iter_items():
+            if self.isInterruptionRequested():
+                return
+
+            if kind == 'node':
+                record = GraphModel.record_from_dict(value)
+                if 'form_index' in value:
+                    record.bind_form(self.form_source, value['form_index'])
+                nodes.append((value['id'], record))
+            elif kind == 'edge':
+                # Nodes must reach the GUI before the edges that reference them
+                if nodes:
+                    if not self._emit_batch(self.nodes_loaded, nodes):
+                        return
+                    nodes = []
+                edges.append(value)
+            else:
+                key, meta_value = value
+                meta[key] = meta_value
+
+            if len(nodes) >= self.batch_size:
+                if not self._emit_batch(self.nodes_loaded, nodes):
+                    return
+                nodes = []
+            elif len(edges) >= self.batch_size:
+                if not self._emit_batch(self.edges_loaded, edges):
+                    return
+                edges = []
+            else:
+                continue
+            self.progress.emit(reader.bytes_read, reader.total_bytes)
+
+        if 'nodes' not in reader.keys:
+            self.failed.emit("Invalid file format: No 'nodes' data found.")
+            return
+        if nodes and not self._emit_batch(self.nodes_loaded, nodes):
+            return
+        if edges and not self._emit_batch(self.edges_loaded, edges):
+            return
+        self.loaded.emit(meta)
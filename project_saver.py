@@ -0,0 +1,49 @@
+"""
+Project Saver for Visual Novel Node Editor
+Background thread that serializes a project snapshot and writes it atomically
+"""
+
+import logging
+
+from PySide6.QtCore import QThread, Signal
+
+from project_writer import save_project, write_project_temp
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectSaveThread(QThread):
+    """Write a project dict snapshot to disk off the GUI thread.
+
+    The snapshot is taken with GraphModel.to_dict() on the GUI thread. It
+    shares the nodes' form_data dicts, which editors replace rather than
+    mutate, so serializing it here does not race with further edits. Forms
+    left in a binary project are read from form_file with this thread's own
+    file handle.
+
+    With commit=False the finished file is left as temp_name for the GUI
+    thread to move into place (project_writer.commit_temp), after it has
+    released any handle it holds on the target.
+    """
+    saved = Signal(str, int)   # file name, bytes written
+    failed = Signal(str)       # error message
+
+    def __init__(self, data, file_name, parent=None, form_file=None, commit=True):
+        super().__init__(parent)
+        self.data = data
+        self.file_name = file_name
+        self.form_file = form_file
+        self.commit = commit
+        self.temp_name = None
+
+    def run(self):
+        try:
+            if self.commit:
+                size = save_project(self.data, self.file_name, self.form_file)
+            else:
+                self.temp_name, size = write_project_temp(self.data, self.file_name, self.form_file)
+        except Exception as e:
+            logger.warning("Failed to save %s: %s", self.file_name, e)
+            self.failed.emit(str(e))
+            return
+        self.saved.emit(self.file_name, size)
@@ -0,0 +1,247 @@
+"""
+Project Store for Visual Novel Node Editor
+SQLite project backend: nodes, positions, dialog/action items and edges live in
+separate tables so a single edit is saved as a small transaction
+"""
+
+import json
+import sqlite3
+import time
+
+from graph_model import GraphModel, PROJECT_VERSION
+
+PROJECT_STORE_EXT = '.vndb'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    outputs INTEGER NOT NULL DEFAULT 1,
+    form TEXT NOT NULL DEFAULT '{}',      -- form_data without its items
+    has_items INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS positions (
+    node_id INTEGER PRIMARY KEY REFERENCES nodes(id) ON DELETE CASCADE,
+    x REAL NOT NULL,
+    y REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    node_id INTEGER NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT,
+    item TEXT NOT NULL,
+    PRIMARY KEY (node_id, position)
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source_id INTEGER NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    source_port INTEGER NOT NULL DEFAULT 0,
+    target_id INTEGER NOT NULL REFERENCES nodes(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS edges_by_source ON edges(source_id);
+"""
+
+
+def is_store_project(file_name):
+    """True when the file name uses the project database extension"""
+    return file_name.lower().endswith(PROJECT_STORE_EXT)
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class ProjectStore:
+    """SQLite project file with per-node incremental saves.
+
+    Records are bound to their row ids when saved or loaded; after that
+    save_node, save_position, save_edges and delete_node each write only the
+    rows of one node in their own transaction. A connection belongs to the
+    thread that opened it.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._conn = sqlite3.connect(file_name)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        # WAL keeps each small commit cheap and the file consistent after a crash
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._row_ids = {}  # NodeRecord -> nodes.id
+        # Loader progress protocol shared with ProjectStreamReader (counted in rows)
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.keys = []
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Binding records to rows
+
+    def bind(self, records):
+        """Bind loaded records to their rows; records maps saved row id -> NodeRecord"""
+        self._row_ids = {record: row_id for row_id, record in records.items()}
+
+    def row_id(self, record):
+        return self._row_ids.get(record)
+
+    # Incremental writes
+
+    def _write_node(self, record):
+        form = {key: value for key, value in record.data.items() if key != 'items'}
+        values = (record.name, record.kind, len(record.output_ports), _encode(form), int('items' in record.data))
+        row_id = self._row_ids.get(record)
+        if row_id is None:
+            # Rows take the node's own id, so ids survive a save and reload
+            row_id = self._conn.execute(
+                "INSERT INTO nodes (id, name, kind, outputs, form, has_items) VALUES (?, ?, ?, ?, ?, ?)",
+                (record.node_id,) + values).lastrowid
+            self._row_ids[record] = row_id
+        else:
+            self._conn.execute(
+                "UPDATE nodes SET name = ?, kind = ?, outputs = ?, form = ?, has_items = ? WHERE id = ?",
+                values + (row_id,))
+
+        self._conn.execute("DELETE FROM items WHERE node_id = ?", (row_id,))
+        self._conn.executemany(
+            "INSERT INTO items (node_id, position, type, item) VALUES (?, ?, ?, ?)",
+            [(row_id, position, item.get('type'), _encode(item))
+             for position, item in enumerate(record.data.get('items') or [])])
+        self._write_position(record)
+        return row_id
+
+    def _write_position(self, record):
+        self._conn.execute("INSERT OR REPLACE INTO positions (node_id, x, y) VALUES (?, ?, ?)",
+                           (self._row_ids[record], record.x, record.y))
+
+    def _write_edges(self, record):
+        row_id = self._row_ids[record]
+        self._conn.execute("DELETE FROM edges WHERE source_id = ?", (row_id,))
+        rows = []
+        for port in record.output_ports:
+            for edge in port.edges:
+                target = edge.target_node
+                target_id = self._row_ids.get(target)
+                if target_id is None:
+                    target_id = self._write_node(target)
+                rows.append((row_id, port.index, target_id))
+        self._conn.executemany("INSERT INTO edges (source_id, source_port, target_id) VALUES (?, ?, ?)", rows)
+
+    def save_node(self, record):
+        """Insert or update one node: heading, form items and position"""
+        with self._conn:
+            self._write_node(record)
+
+    def save_position(self, record):
+        """Store a moved node's position"""
+        with self._conn:
+            if record in self._row_ids:
+                self._write_position(record)
+            else:
+                self._write_node(record)
+
+    def save_edges(self, record):
+        """Rewrite the outgoing edges of one node"""
+        with self._conn:
+            if record not in self._row_ids:
+                self._write_node(record)
+            self._write_edges(record)
+
+    def delete_node(self, record):
+        """Remove a node; its position, items and edges go with it"""
+        row_id = self._row_ids.pop(record, None)
+        if row_id is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM nodes WHERE id = ?", (row_id,))
+
+    def save_graph(self, graph):
+        """Replace the stored project with the whole graph in one transaction"""
+        with self._conn:
+            for table in ('edges', 'items', 'positions', 'nodes', 'meta'):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._row_ids = {}
+            self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                   [('version', PROJECT_VERSION), ('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))])
+            for record in graph.nodes:
+                self._write_node(record)
+            for record in graph.nodes:
+                self._write_edges(record)
+
+    # Reading
+
+    def iter_items(self):
+        """Yield ('meta', (key, value)), ('node', dict) and ('edge', dict) like ProjectStreamReader.
+
+        Node dicts use the row id, which is the node id, as 'id' and edge dicts
+        refer to row ids, so the records built from them can be bound back with bind().
+        """
+        self.total_bytes = (self._conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+                            + self._conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0])
+        self.bytes_read = 0
+
+        for key, value in self._conn.execute("SELECT key, value FROM meta ORDER BY key DESC"):
+            self.keys.append(key)
+            yield 'meta', (key, value)
+
+        self.keys.append('nodes')
+        items = self._conn.execute("SELECT node_id, item FROM items ORDER BY node_id, position")
+        pending_item = next(items, None)
+        for row_id, name, kind, outputs, form, has_items, x, y in self._conn.execute(
+                "SELECT n.id, n.name, n.kind, n.outputs, n.form, n.has_items, p.x, p.y "
+                "FROM nodes n LEFT JOIN positions p ON p.node_id = n.id ORDER BY n.id"):
+            form_data = json.loads(form)
+            node_items = []
+            # Items come back in one ordered scan, merged with the node scan
+            while pending_item is not None and pending_item[0] <= row_id:
+                if pending_item[0] == row_id:
+                    node_items.append(json.loads(pending_item[1]))
+                pending_item = next(items, None)
+            if has_items:
+                form_data['items'] = node_items
+            self.bytes_read += 1
+            yield 'node', {
+                'id': row_id,
+                'name': name,
+                'x': x or 0.0,
+                'y': y or 0.0,
+                'type': kind,
+                'outputs': outputs,
+                'form_data': form_data
+            }
+
+        self.keys.append('edges')
+        for source_id, source_port, target_id in self._conn.execute(
+                "SELECT source_id, source_port, target_id FROM edges ORDER BY rowid"):
+            self.bytes_read += 1
+            yield 'edge', {'start_node': source_id, 'end_node': target_id, 'start_port': source_port}
+
+    def _read_graph(self):
+        graph = GraphModel()
+        records = {}
+        for kind, value in self.iter_items():
+            if kind == 'node':
+                records[value['id']] = graph.add_node(GraphModel.record_from_dict(value), value['id'])
+            elif kind == 'edge':
+                graph.connect_dict(records, value)
+        return graph, records
+
+    def load_graph(self):
+        """Build a GraphModel from the store, with its records bound for incremental saves"""
+        graph, records = self._read_graph()
+        self.bind(records)
+        return graph
+
+    def to_dict(self):
+        """The stored project in the project JSON schema"""
+        return self._read_graph()[0].to_dict()
@@ -0,0 +1,134 @@
+"""
+Project Stream for Visual Novel Node Editor
+Incremental reader for project JSON files that yields nodes and edges one at a
+time instead of parsing the whole document into memory first
+"""
+
+import codecs
+import json
+import os
+
+# Top-level keys whose array elements are yielded one by one
+STREAMED_KEYS = ('nodes', 'edges')
+READ_CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+
+class ProjectStreamReader:
+    """Pull parser for the top-level project object.
+
+    iter_items() yields (kind, value) tuples:
+      ('node', dict) / ('edge', dict) for every element of the nodes/edges arrays
+      ('meta', (key, value)) for any other top-level key such as version
+    bytes_read and total_bytes can be polled between items to report progress,
+    and keys lists the top-level keys seen so far.
+    """
+
+    def __init__(self, json_file, chunk_size=READ_CHUNK_SIZE):
+        self._file = json_file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+        self.keys = []
+        try:
+            self.total_bytes = os.fstat(json_file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            self.total_bytes = 0
+
+    def _read_more(self):
+        """Append the next chunk to the buffer, dropping the consumed prefix"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self.bytes_read += len(chunk)
+        if isinstance(chunk, bytes):
+            # Multi-byte characters split across chunks are held back by the decoder
+            chunk = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            # A number cut off by the chunk boundary (e.g. '1.' of '1.5') decodes as a
+            # shorter number, so retry with more input until something follows it
+            if (isinstance(value, (int, float)) and not self._eof
+                    and _NUMBER_CHARS.issuperset(self._buffer[end:]) and self._read_more()):
+                continue
+            self._pos = end
+            return value
+
+    def _array_items(self):
+        """Yield the elements of the array starting at the current position"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+
+    def iter_items(self):
+        """Yield nodes, edges and metadata in file order"""
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self.keys.append(key)
+            self._expect(':')
+            if key in STREAMED_KEYS and self._peek() == '[':
+                kind = key[:-1]  # 'nodes' -> 'node'
+                for item in self._array_items():
+                    yield kind, item
+            else:
+                yield 'meta', (key, self._value())
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+
+
+def iter_project(file_name, chunk_size=READ_CHUNK_SIZE):
+    """Yield (kind, value) items from a project JSON file, see ProjectStreamReader"""
+    with open(file_name, 'rb') as json_file:
+        yield from ProjectStreamReader(json_file, chunk_size).iter_items()
@@ -0,0 +1,102 @@
+"""
+Project Writer for Visual Novel Node Editor
+Serializes project dicts to JSON or binary files and replaces files atomically,
+so an interrupted save never leaves a half-written project behind
+"""
+
+import json
+import os
+import tempfile
+
+import project_binary
+
+AUTOSAVE_SUFFIX = '.autosave'
+
+
+def write_temp(file_name, write):
+    """Call write(out) on a temp file beside file_name; returns the temp file name.
+
+    The temp file is flushed to disk; pass it to commit_temp() to move it into
+    place or to discard_temp() to drop it.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    fd, temp_name = tempfile.mkstemp(prefix='.' + os.path.basename(file_name) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            write(temp_file)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+    except BaseException:
+        discard_temp(temp_name)
+        raise
+    return temp_name
+
+
+def commit_temp(temp_name, file_name):
+    """Rename a finished temp file over file_name (which must not be open on Windows)"""
+    try:
+        os.replace(temp_name, file_name)
+    except BaseException:
+        discard_temp(temp_name)
+        raise
+
+
+def discard_temp(temp_name):
+    if os.path.exists(temp_name):
+        os.remove(temp_name)
+
+
+def write_atomic(file_name, payload):
+    """Write bytes to a temp file beside file_name, then rename it into place"""
+    commit_temp(write_temp(file_name, lambda out: out.write(payload)), file_name)
+
+
+def write_project_temp(data, file_name, form_file=None):
+    """Write a project dict to a temp file in the format chosen by file_name's extension.
+
+    Nodes carrying 'form_index' instead of 'form_data' (see
+    GraphModel.to_dict(paged_forms=True)) take their form from the binary
+    project form_file: binary output copies the compressed record as is, JSON
+    output decodes it here, on the saving thread. Returns (temp file name, size
+    in bytes).
+    """
+    form_file_handle = open(form_file, 'rb') if form_file else None
+    try:
+        form_reader = project_binary.ProjectBinaryReader(form_file_handle) if form_file_handle else None
+        if project_binary.is_binary_project(file_name):
+            def write(out):
+                project_binary.write_project(data, out, form_reader)
+        else:
+            if form_reader is not None:
+                data = dict(data, nodes=[_with_form_data(node_data, form_reader) for node_data in data['nodes']])
+
+            def write(out):
+                out.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+        temp_name = write_temp(file_name, write)
+    finally:
+        # Closed before the caller replaces a file this may be reading from
+        if form_file_handle:
+            form_file_handle.close()
+    return temp_name, os.path.getsize(temp_name)
+
+
+def _with_form_data(node_data, form_reader):
+    """A node dict with its form_data read from form_reader in place of 'form_index'"""
+    if 'form_data' in node_data or 'form_index' not in node_data:
+        return node_data
+    node_data = dict(node_data)
+    node_data['form_data'] = form_reader.form_data_at(node_data.pop('form_index'))
+    return node_data
+
+
+def save_project(data, file_name, form_file=None):
+    """Serialize a project dict and write it atomically; returns the size in bytes"""
+    temp_name, size = write_project_temp(data, file_name, form_file)
+    commit_temp(temp_name, file_name)
+    return size
+
+
+def autosave_path(project_file):
+    """Autosave file beside a project: story.json -> story.autosave.json"""
+    root, ext = os.path.splitext(project_file)
+    return root + AUTOSAVE_SUFFIX + ext
@@ -0,0 +1,113 @@
+"""
+Story Routes for Visual Novel Node Editor
+Counts and enumerates the playthroughs of a branching story: every path from
+a start node through the branch outputs to an ending
+"""
+
+from story_traversal import successors
+
+# Routes written by a route export unless the user asks for another limit
+DEFAULT_ROUTE_LIMIT = 100
+
+
+class RouteAnalyzer:
+    """Route counts and route enumeration over the story graph.
+
+    One depth-first pass from the start nodes finds the edges that close a
+    cycle; those are recorded in `back_edges` and left out, which turns the
+    reachable graph into a DAG. Route counts are then memoized per node in
+    reverse topological order, so counting is O(V + E) however many routes
+    there are. A route ends at a node with no further outputs, or where its
+    only way on would loop back. Nodes reached through several outputs of
+    one branch count once, since the playthrough is the same.
+
+    With whole_graph the pass goes on from every node not yet visited, so
+    `back_edges` covers cycles the start nodes cannot reach as well.
+    """
+
+    def __init__(self, graph, starts=None, whole_graph=False):
+        self.starts = graph.start_nodes() if starts is None else list(starts)
+        self.back_edges = []        # [(source, target), ...] edges that close a cycle
+        self._parent = {}           # record -> the node it was first reached from (None for a root)
+        self._next = {}             # record -> successors with cycle-closing edges removed
+        self._order = []            # visited records, each after all of its successors
+        self._find_cycles(self.starts)
+        if whole_graph:
+            self._find_cycles(graph.nodes)
+
+        self.route_counts = {}      # record -> routes from this node to an ending
+        for record in self._order:
+            following = self._next[record]
+            self.route_counts[record] = sum(self.route_counts[target] for target in following) if following else 1
+
+    def _find_cycles(self, roots):
+        on_path = set()
+        path = []
+        for root in roots:
+            if root in self._next:
+                continue
+            self._next[root] = []
+            self._parent[root] = None
+            on_path.add(root)
+            path.append(root)
+            stack = [iter(successors(root))]
+            while stack:
+                record = path[-1]
+                target = next(stack[-1], None)
+                if target is None:
+                    # All successors done: record comes after them in the order
+                    stack.pop()
+                    path.pop()
+                    on_path.discard(record)
+                    self._order.append(record)
+                elif target in on_path:
+                    self.back_edges.append((record, target))
+                elif target in self._next:
+                    self._next[record].append(target)
+                else:
+                    self._next[record].append(target)
+                    self._next[target] = []
+                    self._parent[target] = record
+                    on_path.add(target)
+                    path.append(target)
+                    stack.append(iter(successors(target)))
+
+    def cycle(self, back_edge):
+        """Records of the cycle a back edge closes, from its target round to its source.
+
+        Walks the search tree back from the source, so it costs the cycle's
+        length; call it for the cycles actually being shown.
+        """
+        source, target = back_edge
+        records = [source]
+        while records[-1] is not target:
+            records.append(self._parent[records[-1]])
+        records.reverse()
+        return records
+
+    @property
+    def route_count(self):
+        """Number of distinct routes from all start nodes"""
+        return sum(self.route_counts[start] for start in dict.fromkeys(self.starts))
+
+    def iter_routes(self, limit=None):
+        """Yield routes one at a time as lists of records, at most `limit` of them"""
+        produced = 0
+        if limit is not None and limit <= 0:
+            return
+        for start in dict.fromkeys(self.starts):
+            path = [start]
+            stack = [iter(self._next[start])]
+            while stack:
+                if not self._next[path[-1]]:
+                    yield list(path)
+                    produced += 1
+                    if limit is not None and produced >= limit:
+                        return
+                target = next(stack[-1], None)
+                if target is None:
+                    stack.pop()
+                    path.pop()
+                else:
+                    path.append(target)
+                    stack.append(iter(self._next[target]))
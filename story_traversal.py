@@ -0,0 +1,121 @@
+"""
+Story Traversal for Visual Novel Node Editor
+Walks the story graph from its start nodes along the port adjacency lists,
+through branch fan-out, converging routes and cycles, in O(V + E)
+"""
+
+from collections import deque
+
+DEPTH_FIRST = 'dfs'
+BREADTH_FIRST = 'bfs'
+TOPOLOGICAL = 'topological'
+
+
+def successors(record):
+    """Distinct nodes reached from a node's outputs, in output port order"""
+    nodes = []
+    seen = set()
+    for port in record.output_ports:
+        for edge in port.edges:
+            target = edge.other_node(port)
+            if target not in seen:
+                seen.add(target)
+                nodes.append(target)
+    return nodes
+
+
+def iter_story(graph, order=DEPTH_FIRST, starts=None):
+    """Yield every node reachable from the start nodes exactly once.
+
+    Depth-first order reads one branch output to its end before the next, so
+    a linear story comes out in reading order; breadth-first yields nodes by
+    distance from the start. In both, nodes where routes converge are yielded
+    the first time they are reached and cycles are cut there. Topological
+    order reads like depth-first but holds a converging node back until every
+    route into it has been yielded (see _iter_topological). starts defaults
+    to graph.start_nodes(). Nodes are produced lazily, so a caller may stop
+    early.
+    """
+    if starts is None:
+        starts = graph.start_nodes()
+    if order == TOPOLOGICAL:
+        yield from _iter_topological(starts)
+        return
+    visited = set()
+
+    if order == BREADTH_FIRST:
+        queue = deque()
+        for start in starts:
+            if start not in visited:
+                visited.add(start)
+                queue.append(start)
+        while queue:
+            record = queue.popleft()
+            yield record
+            for target in successors(record):
+                if target not in visited:
+                    visited.add(target)
+                    queue.append(target)
+
+    elif order == DEPTH_FIRST:
+        stack = list(reversed(starts))
+        while stack:
+            record = stack.pop()
+            if record in visited:
+                continue
+            visited.add(record)
+            yield record
+            # Reversed so the first output port is explored first
+            stack.extend(target for target in reversed(successors(record)) if target not in visited)
+
+    else:
+        raise ValueError(f"Unknown traversal order: {order}")
+
+
+def _iter_topological(starts):
+    """Kahn's algorithm over the nodes reachable from starts.
+
+    Ready nodes are taken last-in first-out, with the first output port on
+    top, so each branch still reads through to where it joins another. When
+    only nodes on a cycle are left, the first of them in depth-first order is
+    released to cut the cycle there.
+    """
+    # Depth-first discovery also gives the in-degree within the reachable part
+    discovered = []
+    in_degree = {}
+    stack = list(reversed(starts))
+    while stack:
+        record = stack.pop()
+        if record in in_degree:
+            continue
+        in_degree[record] = 0
+        discovered.append(record)
+        stack.extend(target for target in reversed(successors(record)) if target not in in_degree)
+    for record in discovered:
+        for target in successors(record):
+            in_degree[target] += 1
+
+    emitted = set()
+    ready = [record for record in reversed(discovered) if in_degree[record] == 0]
+    next_unemitted = 0
+    while len(emitted) < len(discovered):
+        if not ready:
+            # Everything left waits on a cycle: release its earliest node
+            while discovered[next_unemitted] in emitted:
+                next_unemitted += 1
+            ready.append(discovered[next_unemitted])
+        record = ready.pop()
+        if record in emitted:
+            continue
+        emitted.add(record)
+        yield record
+        for target in reversed(successors(record)):
+            if target not in emitted:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+
+def reachable(graph, starts=None):
+    """Set of nodes reachable from the start nodes"""
+    return set(iter_story(graph, BREADTH_FIRST, starts))
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the Visual Novel Node Editor tests
+"""
+
+import pytest
+
+from graph_model import GraphModel, NodeRecord
+
+
+def build_graph(kinds, edges, ids=None):
+    """GraphModel with nodes {name: kind} and edges [(source, output index, target)].
+
+    ids optionally maps names to the node ids to add them with.
+    """
+    graph = GraphModel()
+    records = {}
+    for name, kind in kinds.items():
+        outputs = 1 + max([port for source, port, _ in edges if source == name], default=0)
+        record = NodeRecord(kind, name, data={'name': name, 'items': [{'type': 'action', 'text': f"{name} happens"}]},
+                            outputs=outputs)
+        records[name] = graph.add_node(record, (ids or {}).get(name))
+    for source, port, target in edges:
+        graph.connect(records[source].output_ports[port], records[target].input_port)
+    return graph
+
+
+@pytest.fixture
+def graph_builder():
+    return build_graph
+
+
+def graph_shape(graph):
+    """Comparable summary of a graph: nodes by id and edges by (source id, port, target id)"""
+    nodes = {record.node_id: (record.name, record.kind, len(record.output_ports), record.data)
+             for record in graph.nodes}
+    edges = sorted((edge.source_node.node_id, edge.source.index, edge.target_node.node_id)
+                   for edge in graph.edges())
+    return nodes, edges
+
+
+@pytest.fixture
+def shape():
+    return graph_shape
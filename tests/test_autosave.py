@@ -0,0 +1,81 @@
+"""
+Autosave tests for Visual Novel Node Editor
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PySide6.QtWidgets')
+
+from PySide6.QtCore import QStandardPaths  # noqa: E402
+
+import main_window  # noqa: E402
+from graph_model import GraphModel  # noqa: E402
+from project_writer import autosave_path  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def qapp():
+    QStandardPaths.setTestModeEnabled(True)
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(main_window.QMessageBox, 'question',
+                        staticmethod(lambda *args, **kwargs: main_window.QMessageBox.No))
+    window = main_window.MainWindow()
+    window.project_file = str(tmp_path / 'story.json')
+    window.reset_change_tracking()
+    yield window
+    window.close()
+    window.deleteLater()
+    qapp.processEvents()
+
+
+def finish_autosave(qapp, window):
+    """Let a started autosave write its file and report back"""
+    thread = window._autosave_thread
+    assert thread is not None, "autosave did not start"
+    thread.wait()
+    while window._autosave_thread is not None:
+        qapp.processEvents()
+
+
+def test_autosave_does_nothing_without_changes(window):
+    window.autosave()
+    assert window._autosave_thread is None
+    assert not os.path.exists(autosave_path(window.project_file))
+
+
+def test_autosave_writes_after_each_change(qapp, window):
+    autosave_file = autosave_path(window.project_file)
+    window.mark_dirty()
+    window.autosave()
+    finish_autosave(qapp, window)
+    assert [record.name for record in GraphModel.load(autosave_file).nodes] == ['Start']
+    assert window._autosaved_change_count == window._change_count
+
+    # Nothing changed since: no second write
+    os.remove(autosave_file)
+    window.autosave()
+    assert window._autosave_thread is None
+    assert not os.path.exists(autosave_file)
+
+    window.graph.rename_node(next(iter(window.graph.nodes)), 'Opening')
+    window.mark_dirty()
+    window.autosave()
+    finish_autosave(qapp, window)
+    assert [record.name for record in GraphModel.load(autosave_file).nodes] == ['Opening']
+    assert not [name for name in os.listdir(os.path.dirname(autosave_file)) if name.endswith('.tmp')]
+
+
+def test_autosave_after_a_save_is_discarded(qapp, window):
+    window.mark_dirty()
+    window.autosave()
+    # A manual save lands while the autosave is being written
+    window.reset_change_tracking()
+    finish_autosave(qapp, window)
+    assert not os.path.exists(autosave_path(window.project_file))
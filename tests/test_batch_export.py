@@ -0,0 +1,45 @@
+"""
+Batch export tests for Visual Novel Node Editor
+"""
+
+import batch_export
+
+KINDS = {'Start': 'start', 'Scene': 'normal'}
+EDGES = [('Start', 0, 'Scene')]
+
+
+def test_projects_with_the_same_output_files_are_not_exported(graph_builder, tmp_path, capsys):
+    graph = graph_builder(KINDS, EDGES)
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    first, second, other = str(tmp_path / 'a' / 'story.json'), str(tmp_path / 'b' / 'story.json'), \
+        str(tmp_path / 'a' / 'other.vnproj')
+    for project_file in (first, second, other):
+        graph.save(project_file)
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+
+    failures = batch_export.run_batch([first, second, other], ['text', 'json'], str(out_dir), jobs=2)
+
+    assert failures == 2
+    assert sorted(path.name for path in out_dir.iterdir()) == ['other.sequence.json', 'other.txt']
+    errors = capsys.readouterr().err
+    assert f"{first}: export failed: its output files would overwrite those of {second}" in errors
+    assert f"{second}: export failed: its output files would overwrite those of {first}" in errors
+
+
+def test_project_and_its_binary_copy_collide_beside_each_other(graph_builder, tmp_path):
+    graph = graph_builder(KINDS, EDGES)
+    json_file, binary_file = str(tmp_path / 'story.json'), str(tmp_path / 'story.vnproj')
+    assert batch_export.find_collisions([json_file, binary_file], ['text']) == \
+        {json_file: {binary_file}, binary_file: {json_file}}
+    assert batch_export.find_collisions([json_file, str(tmp_path / 'other.json')], ['text']) == {}
+
+
+def test_the_same_project_named_twice_is_exported_once(graph_builder, tmp_path, capsys, monkeypatch):
+    graph_builder(KINDS, EDGES).save(str(tmp_path / 'story.json'))
+    monkeypatch.chdir(tmp_path)
+
+    assert batch_export.run_batch(['story.json', str(tmp_path / 'story.json')], ['text']) == 0
+    assert capsys.readouterr().out.count("-> ") == 1
+    assert (tmp_path / 'story.txt').read_text(encoding='utf-8').count('Scene happens') == 1
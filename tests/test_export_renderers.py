@@ -0,0 +1,76 @@
+"""
+Export renderer golden-output tests for Visual Novel Node Editor
+
+The files in tests/golden/ were written by the export_as_text/json/csv
+methods as they were before formatting moved into export_renderers; the
+renderers must keep producing them byte for byte.
+"""
+
+import io
+import os
+import time
+
+import pytest
+
+import export_renderers
+from graph_model import GraphModel
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden')
+GOLDEN_FILES = {
+    'text': 'screenplay.txt',
+    'json': 'sequence.json',
+    'csv': 'sequence.csv',
+}
+GENERATED_AT = time.struct_time((2026, 1, 2, 3, 4, 5, 4, 2, 0))
+_strftime = time.strftime
+
+
+def read_golden(name):
+    with open(os.path.join(GOLDEN_DIR, name), encoding='utf-8', newline='') as golden_file:
+        return golden_file.read()
+
+
+@pytest.fixture
+def sequence(monkeypatch):
+    monkeypatch.setattr(export_renderers.time, 'strftime', lambda fmt, t=None: _strftime(fmt, GENERATED_AT))
+    graph = GraphModel.load(os.path.join(GOLDEN_DIR, 'project.json'))
+    return export_renderers.story_sequence(graph)
+
+
+@pytest.mark.parametrize('export_format', sorted(GOLDEN_FILES))
+def test_render_matches_the_golden_export(sequence, export_format):
+    out = io.StringIO(newline='')
+    export_renderers.render(export_format, sequence, out)
+    assert out.getvalue() == read_golden(GOLDEN_FILES[export_format])
+
+
+@pytest.mark.parametrize('export_format', sorted(GOLDEN_FILES))
+def test_snapshots_render_like_the_records(sequence, export_format):
+    records, snapshots = io.StringIO(newline=''), io.StringIO(newline='')
+    export_renderers.render(export_format, sequence, records)
+    export_renderers.render(export_format, export_renderers.snapshot_sequence(sequence), snapshots)
+    assert snapshots.getvalue() == records.getvalue()
+
+
+@pytest.mark.parametrize('export_format', sorted(GOLDEN_FILES))
+def test_export_files_match_the_golden_export(sequence, export_format, tmp_path):
+    file_name = str(tmp_path / GOLDEN_FILES[export_format])
+    with export_renderers.open_export(file_name, export_format) as out:
+        export_renderers.render(export_format, sequence, out)
+    with open(file_name, encoding='utf-8', newline='') as export_file:
+        written = export_file.read()
+    # Text and JSON files use the platform's line endings, CSV rows always end in CRLF
+    expected = read_golden(GOLDEN_FILES[export_format])
+    if export_format != 'csv':
+        expected = expected.replace('\n', os.linesep)
+    assert written == expected
+
+
+def test_csv_rows_and_columns(sequence):
+    out = io.StringIO(newline='')
+    export_renderers.render_csv(sequence, out)
+    lines = out.getvalue().split('\r\n')
+    assert lines[0].split(',')[:4] == ['Sequence', 'Node Name', 'Type', 'Scene Type']
+    assert len(lines[0].split(',')) == 16
+    assert lines[-1] == ''  # every row, the last included, ends in CRLF
+    assert [line.split(',', 2)[1] for line in lines[1:-1]] == ['Start', 'Market', 'Market', 'Market', 'Temple', 'Empty']
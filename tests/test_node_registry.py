@@ -0,0 +1,108 @@
+"""
+Node registry tests for Visual Novel Node Editor
+"""
+
+from graph_model import NodeRecord
+from node_registry import NodeRegistry
+
+
+def record(name):
+    return NodeRecord('normal', name)
+
+
+def test_add_assigns_ids_and_indexes_names():
+    registry = NodeRegistry()
+    first, second = record('Intro'), record('Outro')
+    registry.add(first)
+    registry.add(second)
+
+    assert (first.node_id, second.node_id) == (1, 2)
+    assert registry.get(1) is first and registry.get(2) is second
+    assert registry.get_by_name('Outro') is second
+    assert registry.nodes() == [first, second] and list(registry) == [first, second]
+    assert len(registry) == 2 and first in registry
+    assert registry.get(3) is None and registry.get_by_name('Missing') is None
+
+
+def test_saved_ids_are_kept_when_free():
+    registry = NodeRegistry()
+    saved, clash, legacy = record('Saved'), record('Clash'), record('Legacy')
+    registry.add(saved, 10)
+    registry.add(clash, 10)       # taken
+    registry.add(legacy, 'Legacy')  # 1.0 projects keyed nodes by name
+
+    assert saved.node_id == 10
+    assert (clash.node_id, legacy.node_id) == (11, 12)
+    assert registry.get(10) is saved
+
+
+def test_rename_moves_the_node_and_empties_the_old_name():
+    registry = NodeRegistry()
+    node = record('Draft')
+    registry.add(node)
+
+    node.name = 'Final'
+    registry.rename(node, 'Draft')
+
+    assert registry.get_by_name('Final') is node
+    assert registry.get_by_name('Draft') is None
+    assert registry.named('Draft') == []
+    assert 'Draft' not in registry._by_name
+    assert registry.get(node.node_id) is node
+
+
+def test_duplicate_names_are_all_indexed():
+    registry = NodeRegistry()
+    first, second, other = record('Scene'), record('Scene'), record('Other')
+    for node in (first, second, other):
+        registry.add(node)
+
+    assert registry.named('Scene') == [first, second]
+    assert registry.get_by_name('Scene') is first
+
+    # Renaming one of them leaves the other under the shared name
+    first.name = 'Other'
+    registry.rename(first, 'Scene')
+    assert registry.named('Scene') == [second]
+    assert registry.named('Other') == [other, first]
+
+
+def test_remove_forgets_the_node_and_never_reuses_its_id():
+    registry = NodeRegistry()
+    first, second = record('Scene'), record('Scene')
+    registry.add(first)
+    registry.add(second)
+
+    registry.remove(first)
+    assert first not in registry and registry.get(first.node_id) is None
+    assert registry.named('Scene') == [second]
+    registry.remove(first)  # unknown nodes are ignored
+    registry.remove(record('Never added'))
+
+    registry.remove(second)
+    assert len(registry) == 0 and registry.get_by_name('Scene') is None
+    assert 'Scene' not in registry._by_name
+
+    later = record('Later')
+    registry.add(later)
+    assert later.node_id == 3
+
+
+def test_clear_keeps_counting_ids():
+    registry = NodeRegistry()
+    registry.add(record('A'), 5)
+    registry.clear()
+    assert len(registry) == 0 and registry.named('A') == []
+
+    node = record('B')
+    registry.add(node)
+    assert node.node_id == 6
+
+
+def test_rename_of_an_unregistered_node_is_ignored():
+    registry = NodeRegistry()
+    node = record('Loose')
+    node.node_id = 4
+    node.name = 'Renamed'
+    registry.rename(node, 'Loose')
+    assert registry.named('Renamed') == [] and len(registry) == 0
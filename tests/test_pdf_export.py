@@ -0,0 +1,83 @@
+"""
+Parallel PDF export tests for Visual Novel Node Editor
+"""
+
+import io
+import re
+
+import pytest
+
+import export_renderers
+from export_renderers import ExportNode
+
+pytest.importorskip('reportlab')
+pypdf = pytest.importorskip('pypdf')
+
+
+def scenes(count):
+    return [ExportNode(f"Scene {i}", 'normal', {
+        'name': f"ฉาก {i} {chr(0x0E2E - i)}",  # each chunk meets new characters first
+        'scene_type': 'INT.',
+        'items': [{'type': 'dialog', 'character': 'สมชาย', 'text': 'สวัสดีครับ ' * (1 + i % 5)},
+                  {'type': 'action', 'text': f"Door {i} opens."}] * (1 + i % 3),
+    }) for i in range(count)]
+
+
+def font_streams(reader):
+    """Distinct embedded font files of a PDF"""
+    streams = set()
+    for page in reader.pages:
+        for font in page['/Resources']['/Font'].values():
+            descriptor = font.get_object().get('/FontDescriptor')
+            if descriptor is not None:
+                streams.add(descriptor.get_object().raw_get('/FontFile2').idnum)
+    return streams
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(export_renderers, 'PARALLEL_PDF_MIN_SCENES', 2)
+
+
+def test_split_scenes_keeps_order_and_balances_items():
+    sequence = scenes(10)
+    runs = export_renderers.split_scenes(sequence, 3)
+    assert len(runs) == 3
+    assert [node for run in runs for node in run] == sequence
+    weights = [sum(export_renderers._scene_weight(node) for node in run) for run in runs]
+    assert max(weights) - min(weights) <= max(export_renderers._scene_weight(node) for node in sequence)
+
+
+def test_chunks_merge_into_one_numbered_screenplay(parallel):
+    sequence = scenes(12)
+    single, merged = io.BytesIO(), io.BytesIO()
+    export_renderers.render_pdf(sequence, single, 'Story')
+    progress = []
+    export_renderers.render_pdf_parallel(sequence, merged, 'Story', jobs=3,
+                                         progress=lambda done, total: progress.append((done, total)))
+
+    reader = pypdf.PdfReader(io.BytesIO(merged.getvalue()))
+    text = "\n".join(page.extract_text() for page in reader.pages)
+    assert [int(number) for number in re.findall(r"\((\d+)\) INT\.", text)] == list(range(1, 13))
+    assert text.count("STORY") == 1 and text.count("THE END") == 1
+    assert progress[-1] == (12, 12)
+
+    # Every chunk embeds the same font subsets, which are stored once
+    single_reader = pypdf.PdfReader(io.BytesIO(single.getvalue()))
+    assert len(font_streams(reader)) == len(font_streams(single_reader))
+
+
+def test_short_screenplays_stay_in_one_process(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no pool for a short screenplay")
+    monkeypatch.setattr(export_renderers, 'ProcessPoolExecutor', fail)
+    out = io.BytesIO()
+    export_renderers.render_pdf_parallel(scenes(3), out, 'Story', jobs=4)
+    assert out.getvalue().startswith(b'%PDF')
+
+
+def test_cancel_stops_the_chunks(parallel):
+    def cancel(done, total):
+        raise export_renderers.ExportCancelled()
+    with pytest.raises(export_renderers.ExportCancelled):
+        export_renderers.render_pdf_parallel(scenes(40), io.BytesIO(), 'Story', jobs=2, progress=cancel)
@@ -0,0 +1,112 @@
+"""
+Project file round-trip tests for Visual Novel Node Editor
+"""
+
+import json
+
+import pytest
+
+import project_binary
+import project_writer
+from form_cache import BinaryFormSource
+from graph_model import GraphModel, NodeRecord
+from project_store import ProjectStore
+
+KINDS = {'Start': 'start', 'Choice': 'branch', 'Left': 'normal', 'Right': 'normal', 'End': 'normal'}
+EDGES = [('Start', 0, 'Choice'), ('Choice', 0, 'Left'), ('Choice', 2, 'Right'),
+         ('Left', 0, 'End'), ('Right', 0, 'End')]
+# Saved ids that are neither the creation order nor contiguous
+IDS = {'Start': 7, 'Choice': 3, 'Left': 42, 'Right': 12, 'End': 5}
+
+
+@pytest.fixture
+def graph(graph_builder):
+    return graph_builder(KINDS, EDGES, IDS)
+
+
+@pytest.mark.parametrize('file_name', ['story.json', 'story.vnproj'])
+def test_file_round_trip_keeps_ids_and_branch_ports(graph, shape, tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    graph.save(path)
+
+    loaded = GraphModel.load(path)
+    assert shape(loaded) == shape(graph)
+    choice = loaded.nodes.get(IDS['Choice'])
+    assert choice.kind == 'branch'
+    assert [len(port.edges) for port in choice.output_ports] == [1, 0, 1]
+
+
+def test_store_round_trip_keeps_ids_and_branch_ports(graph, shape, tmp_path):
+    path = str(tmp_path / 'story.vndb')
+    with ProjectStore(path) as store:
+        store.save_graph(graph)
+    with ProjectStore(path) as store:
+        loaded = store.load_graph()
+    assert shape(loaded) == shape(graph)
+
+
+def test_new_nodes_after_load_get_unused_ids(graph, tmp_path):
+    path = str(tmp_path / 'story.json')
+    graph.save(path)
+    loaded = GraphModel.load(path)
+    added = loaded.add_node(NodeRecord('normal', 'Added'))
+    assert added.node_id == max(IDS.values()) + 1
+
+
+def test_legacy_project_with_name_ids_loads(tmp_path):
+    legacy = {
+        'version': '1.0',
+        'nodes': [
+            {'id': 'Start Node', 'name': 'Start Node', 'x': 0, 'y': 0, 'form_data': {}},
+            {'id': 'Scene 1', 'name': 'Scene 1', 'x': 100, 'y': 0, 'form_data': {'items': []}},
+            {'id': 'Scene 2', 'name': 'Scene 2', 'x': 200, 'y': 0, 'form_data': {}},
+        ],
+        'edges': [
+            {'id': 'edge_1', 'start_node': 'Start Node', 'end_node': 'Scene 1',
+             'start_point': 'output', 'end_point': 'input'},
+            {'id': 'edge_2', 'start_node': 'Scene 1', 'end_node': 'Scene 2',
+             'start_point': 'output', 'end_point': 'input'},
+        ]
+    }
+    path = tmp_path / 'legacy.json'
+    path.write_text(json.dumps(legacy), encoding='utf-8')
+
+    graph = GraphModel.load(str(path))
+    assert [(record.node_id, record.name) for record in graph.nodes] == \
+        [(1, 'Start Node'), (2, 'Scene 1'), (3, 'Scene 2')]
+    # Without a 'type' every node loads as a normal node, connected from its first output
+    assert {record.kind for record in graph.nodes} == {'normal'}
+    assert [(edge.source_node.name, edge.source.index, edge.target_node.name) for edge in graph.edges()] == \
+        [('Start Node', 0, 'Scene 1'), ('Scene 1', 0, 'Scene 2')]
+
+
+def test_edge_from_missing_output_port_is_skipped(graph):
+    records = {record.node_id: record for record in graph.nodes}
+    edge_data = {'start_node': IDS['Left'], 'end_node': IDS['End'], 'start_port': 3}
+    assert graph.connect_dict(records, edge_data) is None
+
+
+@pytest.mark.parametrize('file_name', ['copy.json', 'copy.vnproj'])
+def test_paged_forms_are_copied_from_the_source_file(graph, shape, tmp_path, file_name):
+    source_path = str(tmp_path / 'story.vnproj')
+    graph.save(source_path)
+
+    # Load the way the editor opens large projects: forms stay in the file
+    source = BinaryFormSource(source_path)
+    loaded = GraphModel()
+    records = {}
+    with open(source_path, 'rb') as binary_file:
+        for kind, value in project_binary.ProjectBinaryReader(binary_file).iter_items(with_forms=False):
+            if kind == 'node':
+                records[value['id']] = loaded.add_node(GraphModel.record_from_dict(value), value['id'])
+                records[value['id']].bind_form(source, value['form_index'])
+            elif kind == 'edge':
+                loaded.connect_dict(records, value)
+    try:
+        copy_path = str(tmp_path / file_name)
+        project_writer.save_project(loaded.to_dict(paged_forms=True), copy_path, source_path)
+        assert source.misses == 0
+    finally:
+        source.close()
+
+    assert shape(GraphModel.load(copy_path)) == shape(graph)
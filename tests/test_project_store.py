@@ -0,0 +1,129 @@
+"""
+Project database incremental save tests for Visual Novel Node Editor
+"""
+
+import sqlite3
+
+import pytest
+
+from graph_model import GraphModel, PROJECT_VERSION
+from project_store import ProjectStore
+
+KINDS = {'Start': 'start', 'Choice': 'branch', 'Left': 'normal', 'Right': 'normal', 'End': 'normal'}
+EDGES = [('Start', 0, 'Choice'), ('Choice', 0, 'Left'), ('Choice', 1, 'Right'),
+         ('Left', 0, 'End'), ('Right', 0, 'End')]
+
+
+@pytest.fixture
+def store_file(graph_builder, tmp_path):
+    path = str(tmp_path / 'story.vndb')
+    with ProjectStore(path) as store:
+        store.save_graph(graph_builder(KINDS, EDGES))
+    return path
+
+
+@pytest.fixture
+def opened(store_file):
+    """(store, graph) for the saved project, loaded the way the editor keeps it open"""
+    store = ProjectStore(store_file)
+    yield store, store.load_graph()
+    store.close()
+
+
+def reopen(store_file):
+    with ProjectStore(store_file) as store:
+        return store.load_graph()
+
+
+def node(graph, name):
+    return graph.nodes.get_by_name(name)
+
+
+def edge_names(graph):
+    return sorted((edge.source_node.name, edge.source.index, edge.target_node.name) for edge in graph.edges())
+
+
+def test_save_graph_writes_the_project_version(store_file):
+    with sqlite3.connect(store_file) as conn:
+        assert conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() == (PROJECT_VERSION,)
+    with ProjectStore(store_file) as store:
+        assert store.to_dict()['version'] == PROJECT_VERSION
+
+
+def test_save_node_writes_only_that_node(opened, store_file, shape):
+    store, graph = opened
+    before = shape(reopen(store_file))
+    left, right = node(graph, 'Left'), node(graph, 'Right')
+    left.data = {'name': 'Left', 'items': [{'type': 'dialog', 'character': 'A', 'text': 'Hi'}]}
+    graph.rename_node(left, 'Left Door')
+    right.data = {'name': 'Right', 'items': []}  # edited but never saved
+
+    store.save_node(left)
+
+    nodes, edges = shape(reopen(store_file))
+    expected_nodes = dict(before[0])
+    expected_nodes[left.node_id] = ('Left Door', 'normal', 1, left.data)
+    assert nodes == expected_nodes
+    assert edges == before[1]
+
+
+def test_save_position_writes_only_the_move(opened, store_file, shape):
+    store, graph = opened
+    before = shape(reopen(store_file))
+    end, start = node(graph, 'End'), node(graph, 'Start')
+    end.x, end.y = 420.0, -35.5
+    start.x = 999.0  # moved but never saved
+    end.data = {'name': 'End', 'items': []}  # form edit not part of the move
+
+    store.save_position(end)
+
+    loaded = reopen(store_file)
+    assert {record.name: (record.x, record.y) for record in loaded.nodes} == \
+        {'Start': (0.0, 0.0), 'Choice': (0.0, 0.0), 'Left': (0.0, 0.0), 'Right': (0.0, 0.0), 'End': (420.0, -35.5)}
+    assert shape(loaded) == before
+
+
+def test_save_edges_rewires_one_node(opened, store_file):
+    store, graph = opened
+    choice, left, end = node(graph, 'Choice'), node(graph, 'Left'), node(graph, 'End')
+    graph.disconnect(choice.output_ports[0].edges[0])
+    graph.connect(choice.output_ports[0], end.input_port)
+    graph.disconnect(left.output_ports[0].edges[0])  # never saved
+
+    store.save_edges(choice)
+
+    assert edge_names(reopen(store_file)) == sorted([
+        ('Start', 0, 'Choice'), ('Choice', 0, 'End'), ('Choice', 1, 'Right'),
+        ('Left', 0, 'End'), ('Right', 0, 'End')])
+
+
+def test_delete_node_drops_its_rows_and_edges_into_it(opened, store_file, shape):
+    store, graph = opened
+    before_nodes, _ = shape(reopen(store_file))
+    right = node(graph, 'Right')
+    graph.remove_node(right)
+
+    store.delete_node(right)
+
+    loaded = reopen(store_file)
+    expected_nodes = {node_id: value for node_id, value in before_nodes.items() if node_id != right.node_id}
+    assert shape(loaded)[0] == expected_nodes
+    assert edge_names(loaded) == sorted([('Start', 0, 'Choice'), ('Choice', 0, 'Left'), ('Left', 0, 'End')])
+    with sqlite3.connect(store_file) as conn:
+        for table, column in (('positions', 'node_id'), ('items', 'node_id'),
+                              ('edges', 'source_id'), ('edges', 'target_id')):
+            assert conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = ?",
+                                (right.node_id,)).fetchone() == (0,)
+
+
+def test_new_node_is_inserted_with_its_id(opened, store_file):
+    store, graph = opened
+    left = node(graph, 'Left')
+    extra = graph.add_node(GraphModel.record_from_dict({'name': 'Extra', 'x': 5, 'y': 6, 'form_data': {}}))
+    graph.connect(left.output_ports[0], extra.input_port)
+
+    store.save_edges(left)
+
+    loaded = reopen(store_file)
+    assert node(loaded, 'Extra').node_id == extra.node_id
+    assert ('Left', 0, 'Extra') in edge_names(loaded)
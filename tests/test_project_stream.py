@@ -0,0 +1,74 @@
+"""
+Streamed project loading tests for Visual Novel Node Editor
+"""
+
+import json
+
+import pytest
+
+from graph_model import GraphModel
+from project_stream import iter_project
+
+KINDS = {'Start': 'start', 'Choice': 'branch', 'Left': 'normal', 'Right': 'normal'}
+EDGES = [('Start', 0, 'Choice'), ('Choice', 0, 'Left'), ('Choice', 1, 'Right')]
+IDS = {'Start': 4, 'Choice': 9, 'Left': 2, 'Right': 30}
+
+
+def load_streamed(items):
+    """Build a graph from streamed items, holding back edges until their nodes arrive (as MainWindow does)"""
+    graph = GraphModel()
+    records = {}
+    meta = {}
+    pending = []
+    for kind, value in items:
+        if kind == 'node':
+            records[value['id']] = graph.add_node(GraphModel.record_from_dict(value), value['id'])
+        elif kind == 'edge':
+            if graph.connect_dict(records, value) is None:
+                pending.append(value)
+        else:
+            meta[value[0]] = value[1]
+    for edge_data in pending:
+        graph.connect_dict(records, edge_data)
+    return graph, meta
+
+
+@pytest.fixture
+def project(graph_builder):
+    graph = graph_builder(KINDS, EDGES, IDS)
+    # Thai text and escapes spread multi-byte characters across chunk boundaries
+    graph.nodes.get(IDS['Left']).data = {'items': [{'type': 'dialog', 'text': 'สวัสดี "ครับ"\n\\ ok'}]}
+    return graph
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64])
+def test_small_chunks_read_the_same_items(project, shape, tmp_path, chunk_size):
+    path = tmp_path / 'story.json'
+    data = project.to_dict()
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    items = list(iter_project(str(path), chunk_size))
+    assert [value for kind, value in items if kind == 'node'] == data['nodes']
+    assert [value for kind, value in items if kind == 'edge'] == data['edges']
+    assert shape(load_streamed(items)[0]) == shape(project)
+
+
+@pytest.mark.parametrize('chunk_size', [3, 7])
+def test_edges_listed_before_nodes(project, shape, tmp_path, chunk_size):
+    data = project.to_dict()
+    reordered = {'edges': data['edges'], 'version': data['version'], 'nodes': data['nodes']}
+    path = tmp_path / 'story.json'
+    path.write_text(json.dumps(reordered), encoding='utf-8')
+
+    items = list(iter_project(str(path), chunk_size))
+    assert items[0][0] == 'edge'
+    graph, meta = load_streamed(items)
+    assert meta == {'version': data['version']}
+    assert shape(graph) == shape(project)
+
+
+def test_truncated_file_raises(project, tmp_path):
+    path = tmp_path / 'story.json'
+    path.write_text(json.dumps(project.to_dict())[:-20], encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_project(str(path), 7))
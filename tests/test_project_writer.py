@@ -0,0 +1,70 @@
+"""
+Atomic project write tests for Visual Novel Node Editor
+"""
+
+import os
+
+import pytest
+
+import project_writer
+
+OLD_CONTENT = b'{"version": "1.2", "nodes": []}'
+
+
+@pytest.fixture
+def project_file(tmp_path):
+    path = tmp_path / 'story.json'
+    path.write_bytes(OLD_CONTENT)
+    return path
+
+
+def test_write_atomic_replaces_the_file(project_file, tmp_path):
+    project_writer.write_atomic(str(project_file), b'new')
+    assert project_file.read_bytes() == b'new'
+    assert os.listdir(tmp_path) == ['story.json']
+
+
+def test_failed_serialisation_keeps_the_old_file(project_file, tmp_path):
+    data = {'version': '1.2', 'nodes': [{'id': 1, 'form_data': {'items': {object()}}}], 'edges': []}
+    with pytest.raises(TypeError):
+        project_writer.save_project(data, str(project_file))
+    assert project_file.read_bytes() == OLD_CONTENT
+    assert os.listdir(tmp_path) == ['story.json']
+
+
+def test_write_failing_halfway_leaves_no_temp_file(project_file, tmp_path):
+    def write(out):
+        out.write(b'{"version": "1.2", "nod')
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        project_writer.write_temp(str(project_file), write)
+    assert project_file.read_bytes() == OLD_CONTENT
+    assert os.listdir(tmp_path) == ['story.json']
+
+
+def test_failed_replace_discards_the_temp_file(project_file, tmp_path, monkeypatch):
+    def refuse(source, target):
+        raise PermissionError("file is open in another program")
+    monkeypatch.setattr(project_writer.os, 'replace', refuse)
+
+    with pytest.raises(PermissionError):
+        project_writer.write_atomic(str(project_file), b'new')
+    assert project_file.read_bytes() == OLD_CONTENT
+    assert os.listdir(tmp_path) == ['story.json']
+
+
+def test_temp_file_is_committed_only_on_request(project_file, tmp_path):
+    temp_name, size = project_writer.write_project_temp({'version': '1.2', 'nodes': [], 'edges': []},
+                                                        str(project_file))
+    assert project_file.read_bytes() == OLD_CONTENT
+    assert os.path.dirname(temp_name) == str(tmp_path) and os.path.getsize(temp_name) == size
+
+    project_writer.commit_temp(temp_name, str(project_file))
+    assert os.listdir(tmp_path) == ['story.json']
+    assert project_file.stat().st_size == size
+
+
+def test_autosave_path_sits_beside_the_project():
+    assert project_writer.autosave_path(os.path.join('stories', 'story.vnproj')) == \
+        os.path.join('stories', 'story.autosave.vnproj')
@@ -0,0 +1,70 @@
+"""
+Route export tests for Visual Novel Node Editor
+"""
+
+import io
+import json
+import os
+import re
+
+import pytest
+
+import export_renderers
+from story_routes import RouteAnalyzer
+
+KINDS = {'Start': 'start', 'B1': 'branch', 'A': 'normal', 'B': 'normal', 'B2': 'branch', 'C': 'normal', 'D': 'normal'}
+EDGES = [('Start', 0, 'B1'), ('B1', 0, 'A'), ('B1', 1, 'B'), ('A', 0, 'B2'), ('B', 0, 'B2'),
+         ('B2', 0, 'C'), ('B2', 1, 'D')]
+
+
+@pytest.fixture
+def analyzer(graph_builder):
+    return RouteAnalyzer(graph_builder(KINDS, EDGES))
+
+
+def expected_routes(analyzer, limit):
+    return [[record.name for record in route] for route in analyzer.iter_routes(limit)]
+
+
+def test_each_text_route_file_holds_exactly_its_scenes(analyzer, tmp_path):
+    written = export_renderers.write_routes(analyzer.iter_routes(3), str(tmp_path), 'text')
+
+    assert [os.path.basename(path) for path in written] == ['route_001.txt', 'route_002.txt', 'route_003.txt']
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['route_001.txt', 'route_002.txt', 'route_003.txt']
+    for file_name, route in zip(written, expected_routes(analyzer, 3)):
+        with open(file_name, encoding='utf-8') as route_file:
+            text = route_file.read()
+        assert re.findall(r"^\d+\. INT\. (.+)$", text, re.MULTILINE) == route
+        assert [int(number) for number in re.findall(r"^(\d+)\. INT\.", text, re.MULTILINE)] == \
+            list(range(1, len(route) + 1))
+
+
+def test_each_json_route_file_holds_exactly_its_scenes(analyzer, tmp_path):
+    written = export_renderers.write_routes(analyzer.iter_routes(10), str(tmp_path), 'json')
+
+    routes = expected_routes(analyzer, 10)
+    assert len(written) == len(routes) == analyzer.route_count == 4
+    for file_name, route in zip(written, routes):
+        with open(file_name, encoding='utf-8') as route_file:
+            data = json.load(route_file)
+        assert [scene['name'] for scene in data['sequence']] == route
+        assert data['metadata']['total_nodes'] == len(route)
+
+
+def test_render_takes_one_route_at_a_time(analyzer):
+    for route, names in zip(analyzer.iter_routes(2), expected_routes(analyzer, 2)):
+        out = io.StringIO()
+        export_renderers.render('csv', route, out)
+        rows = out.getvalue().splitlines()[1:]
+        assert [row.split(',')[1] for row in rows] == names
+
+
+def test_each_pdf_route_file_holds_exactly_its_scenes(analyzer, tmp_path):
+    pytest.importorskip('reportlab')
+    pypdf = pytest.importorskip('pypdf')
+    written = export_renderers.write_routes(analyzer.iter_routes(2), str(tmp_path), 'pdf')
+
+    for index, (file_name, route) in enumerate(zip(written, expected_routes(analyzer, 2)), 1):
+        text = "\n".join(page.extract_text() for page in pypdf.PdfReader(file_name).pages)
+        assert f"ROUTE {index}" in text
+        assert re.findall(r"\(\d+\) INT\. (\S+)", text) == [name.upper() for name in route]
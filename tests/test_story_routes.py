@@ -0,0 +1,101 @@
+"""
+Route counting and validation tests for Visual Novel Node Editor
+"""
+
+from graph_validator import (GraphValidator, CYCLE, DUPLICATE_NAME, MULTIPLE_STARTS, NO_START,
+                             OPEN_BRANCH_OUTPUT, UNREACHABLE)
+from story_routes import RouteAnalyzer
+
+
+def names(records):
+    return [record.name for record in records]
+
+
+def codes(issues):
+    return sorted(issue.code for issue in issues)
+
+
+def test_diamond_has_two_routes(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal', 'B': 'normal', 'End': 'normal'},
+                          [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 1, 'B'),
+                           ('A', 0, 'End'), ('B', 0, 'End')])
+    analyzer = RouteAnalyzer(graph)
+    assert analyzer.route_count == 2
+    assert [names(route) for route in analyzer.iter_routes()] == \
+        [['Start', 'Branch', 'A', 'End'], ['Start', 'Branch', 'B', 'End']]
+    assert analyzer.back_edges == []
+
+
+def test_nested_branches_multiply_and_limit_stops_early(graph_builder):
+    graph = graph_builder({'Start': 'start', 'B1': 'branch', 'A': 'normal', 'B': 'normal',
+                           'B2': 'branch', 'C': 'normal', 'D': 'normal'},
+                          [('Start', 0, 'B1'), ('B1', 0, 'A'), ('B1', 1, 'B'), ('A', 0, 'B2'), ('B', 0, 'B2'),
+                           ('B2', 0, 'C'), ('B2', 1, 'D')])
+    analyzer = RouteAnalyzer(graph)
+    assert analyzer.route_count == 4
+    assert len(list(analyzer.iter_routes())) == 4
+    assert [names(route) for route in analyzer.iter_routes(limit=1)] == [['Start', 'B1', 'A', 'B2', 'C']]
+    assert list(analyzer.iter_routes(limit=0)) == []
+
+
+def test_branch_outputs_to_one_node_count_once(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal'},
+                          [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 1, 'A')])
+    assert RouteAnalyzer(graph).route_count == 1
+
+
+def test_loop_is_cut_at_its_back_edge(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'Again': 'normal', 'End': 'normal'},
+                          [('Start', 0, 'Branch'), ('Branch', 0, 'Again'), ('Branch', 1, 'End'),
+                           ('Again', 0, 'Branch')])
+    analyzer = RouteAnalyzer(graph)
+    assert [(source.name, target.name) for source, target in analyzer.back_edges] == [('Again', 'Branch')]
+    assert names(analyzer.cycle(analyzer.back_edges[0])) == ['Branch', 'Again']
+    assert analyzer.route_count == 2
+    assert [names(route) for route in analyzer.iter_routes()] == \
+        [['Start', 'Branch', 'Again'], ['Start', 'Branch', 'End']]
+
+
+def test_valid_graph_has_no_issues(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal', 'B': 'normal'},
+                          [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 1, 'B')])
+    assert GraphValidator(graph).validate() == []
+
+
+def test_validator_reports_each_problem(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal', 'Island': 'normal',
+                           'Loop 1': 'normal', 'Loop 2': 'normal'},
+                          [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 2, 'A'),
+                           ('Loop 1', 0, 'Loop 2'), ('Loop 2', 0, 'Loop 1')])
+    issues = GraphValidator(graph).validate()
+    assert codes(issues) == [CYCLE, OPEN_BRANCH_OUTPUT, UNREACHABLE, UNREACHABLE, UNREACHABLE]
+    open_output = next(issue for issue in issues if issue.code == OPEN_BRANCH_OUTPUT)
+    assert open_output.message == "Branch output 2 of 'Branch' has no target"
+    assert {names(issue.records)[0] for issue in issues if issue.code == UNREACHABLE} == \
+        {'Island', 'Loop 1', 'Loop 2'}
+    # The cycle is found although no start node leads to it
+    cycle = next(issue for issue in issues if issue.code == CYCLE)
+    assert sorted(names(cycle.records)) == ['Loop 1', 'Loop 2']
+
+
+def test_start_node_count_is_checked(graph_builder):
+    assert codes(GraphValidator(graph_builder({'A': 'normal'}, [])).validate()) == [NO_START]
+    graph = graph_builder({'S1': 'start', 'S2': 'start', 'A': 'normal'}, [('S1', 0, 'A'), ('S2', 0, 'A')])
+    issues = GraphValidator(graph).validate()
+    assert codes(issues) == [MULTIPLE_STARTS]
+    assert names(issues[0].records) == ['S1', 'S2']
+
+
+def test_duplicate_names_follow_renames(graph_builder):
+    graph = graph_builder({'Start': 'start', 'A': 'normal', 'B': 'normal'}, [('Start', 0, 'A'), ('A', 0, 'B')])
+    validator = GraphValidator(graph)
+    assert validator.validate() == []
+
+    record = graph.nodes.get_by_name('B')
+    graph.rename_node(record, 'A')
+    validator.node_changed(record)
+    assert codes(validator.refresh()) == [DUPLICATE_NAME, DUPLICATE_NAME]
+
+    graph.rename_node(record, 'C')
+    validator.node_changed(record)
+    assert validator.refresh() == []
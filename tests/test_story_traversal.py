@@ -0,0 +1,46 @@
+"""
+Story traversal tests for Visual Novel Node Editor
+"""
+
+from export_renderers import story_sequence
+from story_traversal import iter_story, reachable, BREADTH_FIRST, DEPTH_FIRST
+
+
+def names(records):
+    return [record.name for record in records]
+
+
+def test_converging_branches_export_shared_scene_last(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal', 'B': 'normal', 'C': 'normal'},
+                        [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 1, 'B'),
+                         ('A', 0, 'C'), ('B', 0, 'C')])
+    assert names(story_sequence(graph)) == ['Start', 'Branch', 'A', 'B', 'C']
+
+
+def test_branches_read_through_before_the_next_output(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A1': 'normal', 'A2': 'normal',
+                         'B1': 'normal', 'End': 'normal'},
+                        [('Start', 0, 'Branch'), ('Branch', 0, 'A1'), ('Branch', 1, 'B1'),
+                         ('A1', 0, 'A2'), ('A2', 0, 'End'), ('B1', 0, 'End')])
+    assert names(story_sequence(graph)) == ['Start', 'Branch', 'A1', 'A2', 'B1', 'End']
+
+
+def test_cycle_is_cut_and_every_node_exported_once(graph_builder):
+    graph = graph_builder({'Start': 'start', 'A': 'normal', 'B': 'normal', 'C': 'normal'},
+                        [('Start', 0, 'A'), ('A', 0, 'B'), ('B', 0, 'A'), ('B', 0, 'C')])
+    sequence = names(story_sequence(graph))
+    assert sorted(sequence) == ['A', 'B', 'C', 'Start']
+    assert sequence.index('A') < sequence.index('B') < sequence.index('C')
+
+
+def test_depth_and_breadth_first_orders(graph_builder):
+    graph = graph_builder({'Start': 'start', 'Branch': 'branch', 'A': 'normal', 'A2': 'normal', 'B': 'normal'},
+                        [('Start', 0, 'Branch'), ('Branch', 0, 'A'), ('Branch', 1, 'B'), ('A', 0, 'A2')])
+    assert names(iter_story(graph, DEPTH_FIRST)) == ['Start', 'Branch', 'A', 'A2', 'B']
+    assert names(iter_story(graph, BREADTH_FIRST)) == ['Start', 'Branch', 'A', 'B', 'A2']
+
+
+def test_unreachable_nodes_are_left_out(graph_builder):
+    graph = graph_builder({'Start': 'start', 'A': 'normal', 'Orphan': 'normal'}, [('Start', 0, 'A')])
+    assert names(story_sequence(graph)) == ['Start', 'A']
+    assert set(names(reachable(graph))) == {'Start', 'A'}
@@ -1,14 +1,101 @@
 """
 Custom Views for Visual Novel Node Editor
-Contains NodeGraphicsView with zoom, keyboard handling, visual enhancements, and context menu
+Contains NodeGraphicsView with zoom, keyboard handling and context menu,
+plus GraphScene which coalesces edge geometry updates
 """
 
-from PySide6.QtWidgets import QGraphicsView, QMenu
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QColor
+import logging
+from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QMenu
+from PySide6.QtCore import Qt, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class GraphScene(QGraphicsScene):
+    """Scene that rebuilds dirty edge paths at most once per frame and counts connected edges.
+
+    Between begin_bulk_load() and end_bulk_load() the BSP index and view repaints
+    are suspended and dirty edges are only rebuilt once, when the load ends.
+    """
+    FRAME_INTERVAL_MS = 16  # ~60 fps
+    edge_count_changed = Signal(int)
+    node_changed = Signal(object, str)   # node item, 'data' | 'position' | 'ports'
+    edges_changed = Signal(object)       # NodeRecord whose outgoing edges changed
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.edge_count = 0  # Edges attached between circles (drag previews excluded)
+        self._dirty_edges = set()
+        self._edge_timer = QTimer()
+        self._edge_timer.setSingleShot(True)
+        self._edge_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._edge_timer.timeout.connect(self.flush_dirty_edges)
+        self.bulk_loading = False
+
+    def begin_bulk_load(self):
+        """Stop indexing and repainting while many items are added at once"""
+        if self.bulk_loading:
+            return
+        self.bulk_loading = True
+        self._edge_timer.stop()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        for view in self.views():
+            view.setUpdatesEnabled(False)
+
+    def end_bulk_load(self):
+        """Build every queued edge path in one pass, then rebuild the index once"""
+        if not self.bulk_loading:
+            return
+        self.bulk_loading = False
+        self.flush_dirty_edges()
+        self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        for view in self.views():
+            view.setUpdatesEnabled(True)
+            view.viewport().update()
+
+    def mark_edges_dirty(self, edges):
+        """Queue edges whose end points moved; their paths are rebuilt on the next frame"""
+        self._dirty_edges.update(edges)
+        if self._dirty_edges and not self.bulk_loading and not self._edge_timer.isActive():
+            self._edge_timer.start()
+
+    def flush_dirty_edges(self):
+        """Rebuild the path of every queued edge once"""
+        edges, self._dirty_edges = self._dirty_edges, set()
+        for edge in edges:
+            if edge.scene() is self:
+                edge.updateFromNodes()
+
+    def edge_attached(self, source_record=None):
+        """Called by an edge once it connects two circles"""
+        self.edge_count += 1
+        self.edge_count_changed.emit(self.edge_count)
+        if source_record is not None:
+            self.edges_changed.emit(source_record)
+
+    def edge_detached(self, source_record=None):
+        """Called by an edge when it is removed from its circles"""
+        self.edge_count -= 1
+        self.edge_count_changed.emit(self.edge_count)
+        if source_record is not None:
+            self.edges_changed.emit(source_record)
+
+    def node_modified(self, node, aspect):
+        """Called by a node after its form data, position or outputs changed"""
+        self.node_changed.emit(node, aspect)
+
+    def clear(self):
+        # Queued edges are about to be deleted along with every other item
+        self._edge_timer.stop()
+        self._dirty_edges.clear()
+        super().clear()
+        self.edge_count = 0
+        self.edge_count_changed.emit(self.edge_count)
 
 
 class NodeGraphicsView(QGraphicsView):
+    zoom_changed = Signal(float)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._zoom = 1.0
@@ -24,6 +111,7 @@ class NodeGraphicsView(QGraphicsView):
         if self._zoom_min <= new_zoom <= self._zoom_max:
             self._zoom = new_zoom
             self.scale(factor, factor)
+            self.zoom_changed.emit(self._zoom)
         event.accept()
 
     def keyPressEvent(self, event):
@@ -108,16 +196,16 @@ class NodeGraphicsView(QGraphicsView):
 
     def create_start_node(self, scene_pos):
         """Create a new start node at the specified position"""
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = self.window()
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Import here to avoid circular import
             from graphics_items import StartNode
             
             # Create start node at clicked position
             start_node = StartNode(scene_pos.x() - 60, scene_pos.y() - 30)
             self.scene().addItem(start_node)
-            main_window.node_items.append(start_node)
+            main_window.register_node(start_node)
             
             # Update scene rect to include new node
             self.update_scene_rect_for_node(start_node)
@@ -126,20 +214,20 @@ class NodeGraphicsView(QGraphicsView):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Created start node '{start_node.name}'", 3000)
             
-            print(f"Created start node '{start_node.name}' at position ({scene_pos.x()}, {scene_pos.y()})")
+            logger.debug("Created start node '%s' at position (%s, %s)", start_node.name, scene_pos.x(), scene_pos.y())
 
     def create_scene_node(self, scene_pos):
         """Create a new scene node at the specified position"""
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = self.window()
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Import here to avoid circular import
             from graphics_items import NodeScene
             
             # Create scene node at clicked position
             scene_node = NodeScene(scene_pos.x() - 60, scene_pos.y() - 30)
             self.scene().addItem(scene_node)
-            main_window.node_items.append(scene_node)
+            main_window.register_node(scene_node)
             
             # Update scene rect to include new node
             self.update_scene_rect_for_node(scene_node)
@@ -148,20 +236,20 @@ class NodeGraphicsView(QGraphicsView):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Created scene node '{scene_node.name}'", 3000)
             
-            print(f"Created scene node '{scene_node.name}' at position ({scene_pos.x()}, {scene_pos.y()})")
+            logger.debug("Created scene node '%s' at position (%s, %s)", scene_node.name, scene_pos.x(), scene_pos.y())
 
     def create_branch_node(self, scene_pos):
         """Create a new branch node at the specified position"""
-        # Get main window for access to node_items list
+        # Get main window for access to node registry
         main_window = self.window()
-        if main_window and hasattr(main_window, 'node_items'):
+        if main_window and hasattr(main_window, 'register_node'):
             # Import here to avoid circular import
             from graphics_items import BranchNode
             
             # Create branch node at clicked position
             branch_node = BranchNode(scene_pos.x() - 60, scene_pos.y() - 30)
             self.scene().addItem(branch_node)
-            main_window.node_items.append(branch_node)
+            main_window.register_node(branch_node)
             
             # Update scene rect to include new node
             self.update_scene_rect_for_node(branch_node)
@@ -170,7 +258,7 @@ class NodeGraphicsView(QGraphicsView):
             if hasattr(main_window, 'status_bar'):
                 main_window.status_bar.showMessage(f"Created branch node '{branch_node.name}'", 3000)
             
-            print(f"Created branch node '{branch_node.name}' at position ({scene_pos.x()}, {scene_pos.y()})")
+            logger.debug("Created branch node '%s' at position (%s, %s)", branch_node.name, scene_pos.x(), scene_pos.y())
 
     def update_scene_rect_for_node(self, node):
         """Update scene rectangle to include the new node"""
@@ -182,32 +270,3 @@ class NodeGraphicsView(QGraphicsView):
             node_rect = node_rect.adjusted(-offset, -offset, offset, offset)
             new_rect = scene_rect.united(node_rect)
             scene.setSceneRect(new_rect)
-
-    def drawForeground(self, painter, rect):
-        """Draw node names on top of everything"""
-        # Set font for node names
-        font = QFont("Arial", 10)
-        painter.setFont(font)
-        painter.setPen(QColor(0, 0, 0))
-        
-        # Draw names for all nodes
-        for item in self.scene().items():
-            # Import here to avoid circular import
-            from graphics_items import NodeScene, StartNode, BranchNode
-            if isinstance(item, (NodeScene, StartNode, BranchNode)):
-                # Calculate text position (center of node)
-                node_rect = item.sceneBoundingRect()
-                text_rect = node_rect.adjusted(5, 5, -5, -5)
-                
-                # Use different color for different node types
-                if isinstance(item, StartNode):
-                    painter.setPen(QColor(0, 100, 0))    # Dark green for start node
-                elif isinstance(item, BranchNode):
-                    painter.setPen(QColor(100, 0, 100))  # Purple for branch node
-                else:
-                    painter.setPen(QColor(0, 0, 0))      # Black for regular nodes
-                
-                # Draw node name
-                painter.drawText(text_rect, Qt.AlignCenter, item.name)
-        
-        super().drawForeground(painter, rect)